@@ -0,0 +1,585 @@
+"""
+날짜별 파티션에 News 를 컬럼 단위로 저장하는 압축 아카이브
+
+파티션 디렉토리(date=YYYYMMDD)의 구성
+- meta.json: 기사 수, 컬럼, 본문 압축 방식
+- {column}.dict.json / {column}.codes: 값의 종류가 적은 컬럼(분류, 언론사)의 정렬된 값 사전과
+  행별 사전 번호(uint32)
+- {column}.blob / {column}.idx: 그 밖의 컬럼(aid, 제목, URL, 시각 등)의 UTF-8 문자열과 각 값의
+  시작 위치(uint64), 값이 None 인 행이 있으면 {column}.nulls 에 행별 표시(uint8)
+- content.blob / content.idx: 기사별로 압축한 본문과 각 본문의 시작 위치(uint64)
+- authors.json: 파티션의 기자 정보
+
+행은 (oid, aid) 순으로 정렬되어 있어 한 기사를 aid 컬럼의 이진 탐색으로 찾습니다. 읽을 때는 파일을
+memory-map 하여 필요한 컬럼과 본문만 읽습니다.
+
+사용법: python -m src.archive export NEWS_JSONL AUTHORS_JSONL ARCHIVE_PATH
+"""
+
+import argparse
+import json
+import mmap
+import os
+import shutil
+import zlib
+from array import array
+from dataclasses import fields
+from typing import Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+from src.items import News, Author
+from src.pipelines import ItemSink, NEWS_COLUMNS
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+ARCHIVE_VERSION: int = 2
+# content 를 제외한 컬럼 (content 는 별도로 압축하여 저장합니다)
+SCALAR_COLUMNS: List[str] = [
+    column for column in NEWS_COLUMNS if column != "content"
+] + ["author_ids"]
+# 사전 인코딩하는 컬럼, 나머지는 행마다 값이 거의 다르므로 문자열 그대로 저장합니다.
+DICTIONARY_COLUMNS: List[str] = ["oid", "sid1", "sid2", "sid3", "press"]
+STRING_COLUMNS: List[str] = [
+    column for column in SCALAR_COLUMNS if column not in DICTIONARY_COLUMNS
+]
+# upload_time 이 없는 기사를 모아 두는 파티션
+UNKNOWN_DATE: str = "00000000"
+
+
+def get_partition_date(row: Dict) -> str:
+    # "2021-01-01 21:25:01" -> "20210101"
+    upload_time: Optional[str] = row.get("upload_time")
+    if not upload_time:
+        return UNKNOWN_DATE
+    return upload_time[:10].replace("-", "").replace(".", "")
+
+
+def get_partition_path(root: str, date: str) -> str:
+    return os.path.join(root, f"date={date}")
+
+
+def sort_key(value: Optional[str]) -> Tuple[bool, str]:
+    # None 을 가장 앞에 두고 나머지는 문자열 순서로 정렬합니다.
+    return value is not None, value or ""
+
+
+def is_in_range(
+    value: Optional[str], since: Optional[str], until: Optional[str]
+) -> bool:
+    # since <= value < until, None 은 어떤 시각보다도 앞선 것으로 봅니다.
+    if since and sort_key(value) < sort_key(since):
+        return False
+    return not until or sort_key(value) < sort_key(until)
+
+
+def write_strings(path: str, column: str, values: List[Optional[str]]) -> None:
+    offsets: array = array("Q", [0])
+    with open(os.path.join(path, f"{column}.blob"), "wb") as f:
+        for value in values:
+            if value is not None:
+                f.write(value.encode("utf-8"))
+            offsets.append(f.tell())
+    with open(os.path.join(path, f"{column}.idx"), "wb") as f:
+        offsets.tofile(f)
+    if None in values:
+        # 빈 문자열과 구분하기 위해 None 인 행을 따로 표시합니다.
+        with open(os.path.join(path, f"{column}.nulls"), "wb") as f:
+            array("B", (value is None for value in values)).tofile(f)
+
+
+class Codec:
+    """
+    본문 압축 방식: zstandard 가 설치되어 있으면 zstd, 아니면 zlib
+    """
+
+    def __init__(self, name: Optional[str] = None, level: int = 3):
+        if name is None:
+            name = "zstd" if zstandard is not None else "zlib"
+        if name == "zstd" and zstandard is None:
+            raise ImportError("zstandard is required to read zstd archives")
+        if name not in ("zstd", "zlib"):
+            raise ValueError(f"Unknown codec: {name}")
+        self.name: str = name
+        self.level: int = level
+        if name == "zstd":
+            self.compressor = zstandard.ZstdCompressor(level=level)
+            self.decompressor = zstandard.ZstdDecompressor()
+
+    def compress(self, data: bytes) -> bytes:
+        if self.name == "zstd":
+            return self.compressor.compress(data)
+        return zlib.compress(data, self.level)
+
+    def decompress(self, data: bytes) -> bytes:
+        if self.name == "zstd":
+            return self.decompressor.decompress(data)
+        return zlib.decompress(data)
+
+
+def write_partition(
+    path: str,
+    rows: Iterable[Dict],
+    authors: Iterable[Dict] = (),
+    codec: Optional[Codec] = None,
+) -> int:
+    """
+    rows (news_to_row 형식) 를 path 파티션으로 기록합니다. 같은 (oid, aid) 는 마지막 행을 사용하며,
+    기존 파티션은 새로 기록한 파티션으로 교체됩니다.
+    """
+    codec = codec or Codec()
+    unique_rows: Dict[Tuple[str, str], Dict] = {}
+    for row in rows:
+        unique_rows[(row["oid"], row["aid"])] = row
+    sorted_rows: List[Dict] = [unique_rows[key] for key in sorted(unique_rows)]
+    if not sorted_rows:
+        return 0
+
+    tmp_path: str = path + ".tmp"
+    shutil.rmtree(tmp_path, ignore_errors=True)
+    os.makedirs(tmp_path)
+    for column in SCALAR_COLUMNS:
+        values: List[Optional[str]] = [
+            ",".join(row[column]) if column == "author_ids" else row.get(column)
+            for row in sorted_rows
+        ]
+        if column in STRING_COLUMNS:
+            write_strings(tmp_path, column, values)
+            continue
+        dictionary: List[Optional[str]] = sorted(set(values), key=sort_key)
+        code_map: Dict[Optional[str], int] = {
+            value: code for code, value in enumerate(dictionary)
+        }
+        with open(
+            os.path.join(tmp_path, f"{column}.dict.json"), "w", encoding="utf-8"
+        ) as f:
+            json.dump(dictionary, f, ensure_ascii=False)
+        with open(os.path.join(tmp_path, f"{column}.codes"), "wb") as f:
+            array("I", (code_map[value] for value in values)).tofile(f)
+
+    offsets: array = array("Q", [0])
+    with open(os.path.join(tmp_path, "content.blob"), "wb") as f:
+        for row in sorted_rows:
+            content: Optional[str] = row.get("content")
+            # 본문이 없는 기사(NEAR_DUPLICATE_STORE_BODY_ONCE)는 길이 0 으로 기록합니다.
+            if content is not None:
+                f.write(codec.compress(content.encode("utf-8")))
+            offsets.append(f.tell())
+    with open(os.path.join(tmp_path, "content.idx"), "wb") as f:
+        offsets.tofile(f)
+
+    with open(os.path.join(tmp_path, "authors.json"), "w", encoding="utf-8") as f:
+        json.dump(
+            {f"{author['oid']}_{author['id']}": author for author in authors},
+            f,
+            ensure_ascii=False,
+        )
+    with open(os.path.join(tmp_path, "meta.json"), "w", encoding="utf-8") as f:
+        json.dump(
+            {
+                "version": ARCHIVE_VERSION,
+                "count": len(sorted_rows),
+                "dictionary_columns": DICTIONARY_COLUMNS,
+                "string_columns": STRING_COLUMNS,
+                "codec": codec.name,
+            },
+            f,
+        )
+
+    if os.path.exists(path):
+        old_path: str = path + ".old"
+        shutil.rmtree(old_path, ignore_errors=True)
+        os.replace(path, old_path)
+        os.replace(tmp_path, path)
+        shutil.rmtree(old_path)
+    else:
+        os.replace(tmp_path, path)
+    return len(sorted_rows)
+
+
+class ArchivePartition:
+    """
+    memory-map 한 파티션 하나를 읽습니다. 컬럼과 사전은 처음 사용할 때 읽습니다.
+    """
+
+    def __init__(self, path: str):
+        self.path: str = path
+        with open(os.path.join(path, "meta.json"), encoding="utf-8") as f:
+            self.meta: Dict = json.load(f)
+        if self.meta["version"] != ARCHIVE_VERSION:
+            raise ValueError(f"Unsupported archive version: {self.meta['version']}")
+        self.count: int = self.meta["count"]
+        self.codec: Codec = Codec(self.meta["codec"])
+        self.maps: List[mmap.mmap] = []
+        # mmap 을 닫기 전에 해제해야 하는 memoryview
+        self.views: List[memoryview] = []
+        self.codes: Dict[str, memoryview] = {}
+        self.dictionaries: Dict[str, List[Optional[str]]] = {}
+        self.code_maps: Dict[str, Dict[Optional[str], int]] = {}
+        # 문자열 컬럼의 (blob, offsets, nulls)
+        self.strings: Dict[str, Tuple[memoryview, memoryview, Optional[memoryview]]] = (
+            {}
+        )
+        self.blob: memoryview = self.map_file("content.blob")
+        self.offsets: memoryview = self.map_file("content.idx", "Q")
+        self.authors: Optional[Dict[str, Author]] = None
+
+    def __len__(self) -> int:
+        return self.count
+
+    def __enter__(self) -> "ArchivePartition":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def map_file(self, name: str, fmt: str = "B") -> memoryview:
+        with open(os.path.join(self.path, name), "rb") as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                return memoryview(b"").cast(fmt)
+            mapped: mmap.mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self.maps.append(mapped)
+        view: memoryview = memoryview(mapped)
+        self.views.append(view)
+        if fmt != "B":
+            view = view.cast(fmt)
+            self.views.append(view)
+        return view
+
+    def get_codes(self, column: str) -> memoryview:
+        if column not in self.codes:
+            self.codes[column] = self.map_file(f"{column}.codes", "I")
+        return self.codes[column]
+
+    def get_dictionary(self, column: str) -> List[Optional[str]]:
+        if column not in self.dictionaries:
+            with open(
+                os.path.join(self.path, f"{column}.dict.json"), encoding="utf-8"
+            ) as f:
+                self.dictionaries[column] = json.load(f)
+        return self.dictionaries[column]
+
+    def get_code(self, column: str, value: Optional[str]) -> Optional[int]:
+        if column not in self.code_maps:
+            self.code_maps[column] = {
+                value: code for code, value in enumerate(self.get_dictionary(column))
+            }
+        return self.code_maps[column].get(value)
+
+    def get_strings(
+        self, column: str
+    ) -> Tuple[memoryview, memoryview, Optional[memoryview]]:
+        if column not in self.strings:
+            nulls: Optional[memoryview] = None
+            if os.path.exists(os.path.join(self.path, f"{column}.nulls")):
+                nulls = self.map_file(f"{column}.nulls")
+            self.strings[column] = (
+                self.map_file(f"{column}.blob"),
+                self.map_file(f"{column}.idx", "Q"),
+                nulls,
+            )
+        return self.strings[column]
+
+    def get_string(self, column: str, index: int) -> Optional[str]:
+        blob, offsets, nulls = self.get_strings(column)
+        if nulls is not None and nulls[index]:
+            return None
+        return bytes(blob[offsets[index] : offsets[index + 1]]).decode("utf-8")
+
+    def get_value(self, column: str, index: int) -> Optional[str]:
+        if column in STRING_COLUMNS:
+            return self.get_string(column, index)
+        return self.get_dictionary(column)[self.get_codes(column)[index]]
+
+    def get_content(self, index: int) -> Optional[str]:
+        start, end = self.offsets[index], self.offsets[index + 1]
+        if start == end:
+            return None
+        return self.codec.decompress(bytes(self.blob[start:end])).decode("utf-8")
+
+    def find(self, oid: str, aid: str) -> Optional[int]:
+        oid_code: Optional[int] = self.get_code("oid", oid)
+        if oid_code is None:
+            return None
+        oid_codes: memoryview = self.get_codes("oid")
+        blob, offsets, _ = self.get_strings("aid")
+        # 행이 (oid, aid) 순으로 정렬되어 있고 oid 사전도 정렬되어 있으므로 oid 사전 번호와
+        # aid 의 UTF-8 바이트로 이진 탐색합니다.
+        target: Tuple[int, bytes] = (oid_code, aid.encode("utf-8"))
+        low, high = 0, self.count
+        while low < high:
+            middle: int = (low + high) // 2
+            key: Tuple[int, bytes] = (
+                oid_codes[middle],
+                bytes(blob[offsets[middle] : offsets[middle + 1]]),
+            )
+            if key < target:
+                low = middle + 1
+            else:
+                high = middle
+        if (
+            low < self.count
+            and oid_codes[low] == oid_code
+            and blob[offsets[low] : offsets[low + 1]] == target[1]
+        ):
+            return low
+        return None
+
+    def scan(
+        self,
+        sid1: Optional[str] = None,
+        sid2: Optional[str] = None,
+        oid: Optional[str] = None,
+        press: Optional[str] = None,
+        since: Optional[str] = None,
+        until: Optional[str] = None,
+    ) -> List[int]:
+        """
+        조건에 맞는 행 번호를 돌려줍니다. since <= upload_time < until
+        ("%Y-%m-%d %H:%M:%S" 형식, 앞부분만 입력해도 됩니다)
+        """
+        conditions: List[Tuple[memoryview, int, int]] = []
+        for column, value in (
+            ("sid1", sid1),
+            ("sid2", sid2),
+            ("oid", oid),
+            ("press", press),
+        ):
+            if value is None:
+                continue
+            code: Optional[int] = self.get_code(column, value)
+            if code is None:
+                return []
+            conditions.append((self.get_codes(column), code, code + 1))
+        indexes: List[int] = [
+            index
+            for index in range(self.count)
+            if all(low <= codes[index] < high for codes, low, high in conditions)
+        ]
+        if since is not None or until is not None:
+            indexes = [
+                index
+                for index in indexes
+                if is_in_range(self.get_string("upload_time", index), since, until)
+            ]
+        return indexes
+
+    def get_row(self, index: int, with_content: bool = True) -> Dict:
+        row: Dict = {column: self.get_value(column, index) for column in SCALAR_COLUMNS}
+        row["author_ids"] = row["author_ids"].split(",") if row["author_ids"] else []
+        row["content"] = self.get_content(index) if with_content else None
+        return row
+
+    def load_authors(self) -> Dict[str, Author]:
+        if self.authors is None:
+            with open(os.path.join(self.path, "authors.json"), encoding="utf-8") as f:
+                self.authors = {
+                    key: Author(**author) for key, author in json.load(f).items()
+                }
+        return self.authors
+
+    def get_author(self, oid: str, author_id: str) -> Author:
+        author: Optional[Author] = self.load_authors().get(f"{oid}_{author_id}")
+        if author is None:
+            # 기자 정보가 다른 파티션에만 있는 경우 id 만 채웁니다.
+            author = Author(id=author_id, name="", oid=oid, url="")
+        return author
+
+    def get_news(self, index: int, with_content: bool = True) -> News:
+        row: Dict = self.get_row(index, with_content)
+        author_ids: List[str] = row.pop("author_ids")
+        row["authors"] = [
+            self.get_author(row["oid"], author_id) for author_id in author_ids
+        ]
+        return News(**row)
+
+    def iter_rows(self, with_content: bool = True) -> Iterator[Dict]:
+        for index in range(self.count):
+            yield self.get_row(index, with_content)
+
+    def iter_authors(self) -> Iterator[Dict]:
+        for author in self.load_authors().values():
+            yield {field.name: getattr(author, field.name) for field in fields(author)}
+
+    def close(self) -> None:
+        self.codes.clear()
+        self.strings.clear()
+        self.blob = self.offsets = memoryview(b"")
+        for view in reversed(self.views):
+            view.release()
+        for mapped in self.maps:
+            mapped.close()
+        self.views = []
+        self.maps = []
+
+
+class Archive:
+    """
+    아카이브 루트 디렉토리의 날짜별 파티션을 읽습니다.
+    """
+
+    def __init__(self, path: str):
+        self.path: str = path
+        self.partitions: Dict[str, ArchivePartition] = {}
+
+    def __enter__(self) -> "Archive":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def dates(self) -> List[str]:
+        if not os.path.isdir(self.path):
+            return []
+        return sorted(
+            name[len("date=") :]
+            for name in os.listdir(self.path)
+            if name.startswith("date=")
+            and os.path.exists(os.path.join(self.path, name, "meta.json"))
+        )
+
+    def partition(self, date: str) -> ArchivePartition:
+        if date not in self.partitions:
+            self.partitions[date] = ArchivePartition(
+                get_partition_path(self.path, date)
+            )
+        return self.partitions[date]
+
+    def scan(
+        self,
+        start_date: Optional[str] = None,
+        end_date: Optional[str] = None,
+        with_content: bool = False,
+        **conditions,
+    ) -> Iterator[News]:
+        """
+        start_date ~ end_date (%Y%m%d, 포함) 파티션에서 조건(ArchivePartition.scan)에 맞는 기사를
+        돌려줍니다. with_content 가 거짓이면 본문은 읽지 않습니다. (content=None)
+        """
+        for date in self.dates():
+            if (start_date and date < start_date) or (end_date and date > end_date):
+                continue
+            partition: ArchivePartition = self.partition(date)
+            for index in partition.scan(**conditions):
+                yield partition.get_news(index, with_content)
+
+    def get(self, oid: str, aid: str, date: Optional[str] = None) -> Optional[News]:
+        for partition_date in [date] if date else reversed(self.dates()):
+            partition: ArchivePartition = self.partition(partition_date)
+            index: Optional[int] = partition.find(oid, aid)
+            if index is not None:
+                return partition.get_news(index)
+        return None
+
+    def close(self) -> None:
+        for partition in self.partitions.values():
+            partition.close()
+        self.partitions = {}
+
+
+def merge_partition(path: str, rows: List[Dict], authors: List[Dict]) -> int:
+    # 이미 있는 파티션에 새 행을 더하여 다시 기록합니다.
+    if os.path.exists(os.path.join(path, "meta.json")):
+        with ArchivePartition(path) as partition:
+            rows = list(partition.iter_rows()) + rows
+            authors = list(partition.iter_authors()) + authors
+    return write_partition(path, rows, authors)
+
+
+class ArchiveSink(ItemSink):
+    """
+    ITEM_SINK=archive: 받은 행을 날짜별 임시 파일에 모아 두었다가 종료 시 파티션으로 기록합니다.
+    """
+
+    def __init__(self, path: str):
+        super().__init__(path)
+        self.spool_path: str = os.path.join(path, ".spool")
+        os.makedirs(self.spool_path, exist_ok=True)
+        self.spool_files: Dict[str, object] = {}
+        self.author_file = open(
+            os.path.join(self.spool_path, "authors.jsonl"), "a", encoding="utf-8"
+        )
+
+    def write_news(self, rows: List[Dict]) -> None:
+        for row in rows:
+            date: str = get_partition_date(row)
+            if date not in self.spool_files:
+                self.spool_files[date] = open(
+                    os.path.join(self.spool_path, f"{date}.jsonl"),
+                    "a",
+                    encoding="utf-8",
+                )
+            self.spool_files[date].write(json.dumps(row, ensure_ascii=False) + "\n")
+
+    def write_authors(self, rows: List[Dict]) -> None:
+        self.author_file.write(
+            "".join(json.dumps(row, ensure_ascii=False) + "\n" for row in rows)
+        )
+
+    def close(self) -> None:
+        for file in self.spool_files.values():
+            file.close()
+        self.author_file.close()
+        export_spool(self.spool_path, self.path)
+
+
+def read_jsonl(path: str) -> List[Dict]:
+    if not os.path.exists(path):
+        return []
+    with open(path, encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def export_rows(
+    rows: Iterable[Dict], authors: List[Dict], archive_path: str
+) -> Dict[str, int]:
+    by_date: Dict[str, List[Dict]] = {}
+    for row in rows:
+        by_date.setdefault(get_partition_date(row), []).append(row)
+    counts: Dict[str, int] = {}
+    for date, date_rows in sorted(by_date.items()):
+        used: Set[str] = {row["oid"] for row in date_rows}
+        counts[date] = merge_partition(
+            get_partition_path(archive_path, date),
+            date_rows,
+            [author for author in authors if author["oid"] in used],
+        )
+    return counts
+
+
+def export_spool(spool_path: str, archive_path: str) -> Dict[str, int]:
+    authors: List[Dict] = read_jsonl(os.path.join(spool_path, "authors.jsonl"))
+    counts: Dict[str, int] = {}
+    for name in sorted(os.listdir(spool_path)):
+        if name == "authors.jsonl" or not name.endswith(".jsonl"):
+            continue
+        counts.update(
+            export_rows(
+                read_jsonl(os.path.join(spool_path, name)), authors, archive_path
+            )
+        )
+    shutil.rmtree(spool_path)
+    return counts
+
+
+def main() -> None:
+    parser: argparse.ArgumentParser = argparse.ArgumentParser(
+        description="Export JSON lines output into a day-partitioned archive"
+    )
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    export_parser: argparse.ArgumentParser = subparsers.add_parser("export")
+    export_parser.add_argument("news_jsonl")
+    export_parser.add_argument("authors_jsonl")
+    export_parser.add_argument("archive_path")
+    args: argparse.Namespace = parser.parse_args()
+
+    counts: Dict[str, int] = export_rows(
+        read_jsonl(args.news_jsonl), read_jsonl(args.authors_jsonl), args.archive_path
+    )
+    for date, count in counts.items():
+        print(f"{date}\t{count}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+"""
+Cassette 에 저장된 응답으로 파싱 성능을 측정합니다.
+
+사용법: python -m src.benchmark CASSETTE_PATH [--spider LSDSpider] [--extractor fast]
+"""
+
+import argparse
+import time
+from typing import Callable, Dict, List, Type
+
+from scrapy.http import Response, TextResponse
+
+from src.cassette import Cassette, record_to_response
+from src.spiders import NewsSpider, LSDSpider, EntSpider, SportSpider
+
+SPIDERS: Dict[str, Type[NewsSpider]] = {
+    spider_cls.name: spider_cls
+    for spider_cls in (NewsSpider, LSDSpider, EntSpider, SportSpider)
+}
+
+
+def percentile(sorted_values: List[float], ratio: float) -> float:
+    if not sorted_values:
+        return 0.0
+    index: int = min(len(sorted_values) - 1, int(len(sorted_values) * ratio))
+    return sorted_values[index]
+
+
+def summarize(latencies: List[float]) -> Dict[str, float]:
+    sorted_latencies: List[float] = sorted(latencies)
+    total: float = sum(sorted_latencies)
+    return {
+        "count": len(sorted_latencies),
+        "per_sec": len(sorted_latencies) / total if total else 0.0,
+        "p50_ms": percentile(sorted_latencies, 0.5) * 1000,
+        "p99_ms": percentile(sorted_latencies, 0.99) * 1000,
+    }
+
+
+def measure(func: Callable, response: Response, latencies: List[float]) -> None:
+    start: float = time.perf_counter()
+    func(response)
+    latencies.append(time.perf_counter() - start)
+
+
+def run_benchmark(
+    cassette_path: str, spider: NewsSpider, repeat: int = 1
+) -> Dict[str, Dict[str, float]]:
+    latencies: Dict[str, List[float]] = {
+        "extract_article_item": [],
+        "extract_author_item": [],
+        "extract_article_links": [],
+    }
+    # 리다이렉트 전 URL 로도 저장된 같은 응답은 한 번만 측정합니다.
+    records: Dict[str, Dict] = {
+        record["url"]: record
+        for record in Cassette(cassette_path)
+        if record["status"] == 200
+    }
+    responses: List[Response] = [
+        record_to_response(record) for record in records.values()
+    ]
+    for _ in range(repeat):
+        for response in responses:
+            if not isinstance(response, TextResponse):
+                continue
+            # 매번 새 응답을 만들어 Selector 캐시가 측정에 영향을 주지 않도록 합니다.
+            response = response.replace()
+            if "/article/" in response.url:
+                measure(
+                    spider.extract_article_item,
+                    response,
+                    latencies["extract_article_item"],
+                )
+                measure(
+                    spider.extract_author_item,
+                    response.replace(),
+                    latencies["extract_author_item"],
+                )
+            elif "list.naver" in response.url:
+                measure(
+                    spider.extract_article_links,
+                    response,
+                    latencies["extract_article_links"],
+                )
+    return {name: summarize(values) for name, values in latencies.items()}
+
+
+def main() -> None:
+    parser: argparse.ArgumentParser = argparse.ArgumentParser(
+        description="Benchmark parsing over a recorded cassette"
+    )
+    parser.add_argument("cassette_path")
+    parser.add_argument("--spider", default=NewsSpider.name, choices=sorted(SPIDERS))
+    parser.add_argument("--extractor", default="selector", choices=["selector", "fast"])
+    parser.add_argument("--repeat", type=int, default=1)
+    args: argparse.Namespace = parser.parse_args()
+
+    spider: NewsSpider = SPIDERS[args.spider](extractor=args.extractor)
+    result: Dict[str, Dict[str, float]] = run_benchmark(
+        args.cassette_path, spider, args.repeat
+    )
+    print(f"{'stage':<24}{'count':>8}{'per sec':>12}{'p50 ms':>10}{'p99 ms':>10}")
+    for name, summary in result.items():
+        print(
+            f"{name:<24}{summary['count']:>8}{summary['per_sec']:>12.1f}"
+            f"{summary['p50_ms']:>10.2f}{summary['p99_ms']:>10.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
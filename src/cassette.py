@@ -0,0 +1,158 @@
+import gzip
+import hashlib
+import json
+import os
+from typing import Dict, Iterator, List, Optional
+
+from scrapy import Request, Spider
+from scrapy.crawler import Crawler
+from scrapy.exceptions import IgnoreRequest, NotConfigured
+from scrapy.http import Response, Headers
+from scrapy.responsetypes import responsetypes
+from twisted.internet import defer
+from w3lib.url import canonicalize_url
+
+
+class Cassette:
+    """
+    HTTP 응답을 URL 별 gzip 파일로 저장하고 다시 읽는 오프라인 저장소
+
+    각 파일은 첫 줄에 JSON 메타 정보(url, status, headers), 그 뒤에 원본 body 를 담습니다.
+    """
+
+    def __init__(self, path: str):
+        os.makedirs(path, exist_ok=True)
+        self.path: str = path
+
+    @staticmethod
+    def get_key(url: str) -> str:
+        return hashlib.sha1(canonicalize_url(url).encode("utf-8")).hexdigest()
+
+    def get_file_path(self, url: str) -> str:
+        key: str = self.get_key(url)
+        return os.path.join(self.path, key[:2], key + ".gz")
+
+    def __contains__(self, url: str) -> bool:
+        return os.path.exists(self.get_file_path(url))
+
+    def save(
+        self,
+        url: str,
+        status: int,
+        headers: Dict[str, List[str]],
+        body: bytes,
+        response_url: Optional[str] = None,
+    ) -> None:
+        # response_url 은 리다이렉트된 경우의 최종 URL 입니다.
+        file_path: str = self.get_file_path(url)
+        os.makedirs(os.path.dirname(file_path), exist_ok=True)
+        meta: bytes = json.dumps(
+            {"url": response_url or url, "status": status, "headers": headers},
+            ensure_ascii=False,
+        ).encode("utf-8")
+        # 기록 중 중단되어도 깨진 파일이 남지 않도록 임시 파일에 쓴 뒤 교체합니다.
+        with gzip.open(file_path + ".tmp", "wb") as f:
+            f.write(meta + b"\n" + body)
+        os.replace(file_path + ".tmp", file_path)
+
+    @staticmethod
+    def read_file(file_path: str) -> Dict:
+        with gzip.open(file_path, "rb") as f:
+            meta, body = f.read().split(b"\n", 1)
+        record: Dict = json.loads(meta)
+        record["body"] = body
+        return record
+
+    def load(self, url: str) -> Optional[Dict]:
+        file_path: str = self.get_file_path(url)
+        if not os.path.exists(file_path):
+            return None
+        return self.read_file(file_path)
+
+    def __iter__(self) -> Iterator[Dict]:
+        for dir_path, _, file_names in sorted(os.walk(self.path)):
+            for file_name in sorted(file_names):
+                if file_name.endswith(".gz"):
+                    yield self.read_file(os.path.join(dir_path, file_name))
+
+
+def response_to_record(response: Response) -> Dict:
+    return {
+        "url": response.url,
+        "status": response.status,
+        "headers": {
+            key.decode("latin-1"): [value.decode("latin-1") for value in values]
+            for key, values in response.headers.items()
+        },
+        "body": response.body,
+    }
+
+
+def record_to_response(record: Dict, **kwargs) -> Response:
+    headers: Headers = Headers(record["headers"])
+    url: str = record["url"]
+    response_cls = responsetypes.from_args(
+        headers=headers, url=url, body=record["body"]
+    )
+    return response_cls(
+        url=url,
+        status=record["status"],
+        headers=headers,
+        body=record["body"],
+        **kwargs,
+    )
+
+
+class CassetteRecorderMiddleware:
+    """
+    CASSETTE_RECORD 가 참이면 받은 응답을 CASSETTE_PATH 에 저장하는 Downloader Middleware
+
+    압축 해제(HttpCompressionMiddleware)와 리다이렉트 처리가 끝난 최종 응답을 저장하며,
+    리다이렉트 전의 URL 로도 같은 응답을 찾을 수 있도록 함께 저장합니다.
+    """
+
+    def __init__(self, cassette: Cassette):
+        self.cassette: Cassette = cassette
+
+    @classmethod
+    def from_crawler(cls, crawler: Crawler) -> "CassetteRecorderMiddleware":
+        if not crawler.settings.getbool("CASSETTE_RECORD"):
+            raise NotConfigured
+        return cls(Cassette(crawler.settings.get("CASSETTE_PATH", "cassette")))
+
+    def process_response(
+        self, request: Request, response: Response, spider: Spider
+    ) -> Response:
+        record: Dict = response_to_record(response)
+        record["headers"].pop("Content-Encoding", None)
+        for url in [*request.meta.get("redirect_urls", []), request.url]:
+            self.cassette.save(
+                url, record["status"], record["headers"], record["body"], record["url"]
+            )
+        return response
+
+
+class CassetteDownloadHandler:
+    """
+    네트워크 대신 CASSETTE_PATH 에 저장된 응답을 돌려주는 Download Handler
+
+    DOWNLOAD_HANDLERS 의 http / https 에 등록하여 사용하며, 저장되지 않은 URL 은 무시됩니다.
+    """
+
+    lazy: bool = False
+
+    def __init__(self, cassette: Cassette):
+        self.cassette: Cassette = cassette
+
+    @classmethod
+    def from_crawler(cls, crawler: Crawler) -> "CassetteDownloadHandler":
+        return cls(Cassette(crawler.settings.get("CASSETTE_PATH", "cassette")))
+
+    def download_request(self, request: Request, spider: Spider) -> defer.Deferred:
+        record: Optional[Dict] = self.cassette.load(request.url)
+        if record is None:
+            return defer.fail(IgnoreRequest(f"Not in cassette: {request.url}"))
+        return defer.succeed(record_to_response(record, request=request))
+
+    def close(self) -> None:
+        pass
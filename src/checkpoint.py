@@ -0,0 +1,197 @@
+import os
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from scrapy import Spider, signals
+from scrapy.crawler import Crawler
+from scrapy.exceptions import NotConfigured
+from scrapy.http import Response
+from twisted.internet.task import LoopingCall
+from twisted.python.failure import Failure
+
+from src.frontier import UnitKey
+from src.items import News
+
+Oaid = Tuple[str, str]
+PageKey = Tuple[UnitKey, int]
+
+# 파일에 기록하는 sid 가 없는 단위(NewsSpider)의 sid
+NO_SID: str = "-"
+
+
+class CheckpointStore:
+    """
+    목록 페이지와 기사의 수집 완료 여부를 append-only 파일에 기록하는 체크포인트
+
+    한 줄에 하나의 기록을 탭으로 구분하여 남깁니다.
+    L sid date last_page: 해당 날짜 / sid 목록의 마지막 페이지
+    P sid date page: 목록 페이지와 그 페이지의 모든 기사 처리 완료
+    A oid aid: 기사 수집 완료
+
+    기록은 버퍼에 모아 두었다가 sync() 가 호출될 때 fsync 하며, 중간에 종료되어 잘린 마지막 줄은
+    다시 열 때 무시합니다.
+    """
+
+    def __init__(self, path: str):
+        self.path: str = path
+        self.last_pages: Dict[UnitKey, int] = {}
+        self.pages: Dict[UnitKey, Set[int]] = {}
+        self.articles: Set[Oaid] = set()
+        # 기사 처리를 기다리는 목록 페이지와, 기사별로 기다리는 페이지
+        self.pending_pages: Dict[PageKey, Set[Oaid]] = {}
+        self.article_pages: Dict[Oaid, List[PageKey]] = {}
+        if os.path.exists(path):
+            self.load()
+        directory: str = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.file = open(path, "a", encoding="utf-8")
+
+    def load(self) -> None:
+        with open(self.path, "r", encoding="utf-8") as f:
+            for line in f:
+                if not line.endswith("\n"):
+                    break
+                record: List[str] = line[:-1].split("\t")
+                kind: str = record[0]
+                if kind == "A" and len(record) == 3:
+                    self.articles.add((record[1], record[2]))
+                elif kind in ("P", "L") and len(record) == 4 and record[3].isdigit():
+                    key: UnitKey = (
+                        record[2],
+                        None if record[1] == NO_SID else record[1],
+                    )
+                    if kind == "P":
+                        self.pages.setdefault(key, set()).add(int(record[3]))
+                    else:
+                        self.last_pages[key] = int(record[3])
+
+    def write(self, *record: str) -> None:
+        self.file.write("\t".join(record) + "\n")
+
+    def sync(self) -> None:
+        self.file.flush()
+        os.fsync(self.file.fileno())
+
+    def close(self) -> None:
+        self.sync()
+        self.file.close()
+
+    def get_last_page(self, key: UnitKey) -> Optional[int]:
+        return self.last_pages.get(key)
+
+    def set_last_page(self, key: UnitKey, last_page: int) -> None:
+        if self.last_pages.get(key) == last_page:
+            return
+        self.last_pages[key] = last_page
+        date, sid = key
+        self.write("L", sid or NO_SID, date, str(last_page))
+
+    def is_page_done(self, key: UnitKey, page: int) -> bool:
+        return page in self.pages.get(key, ())
+
+    def is_unit_done(self, key: UnitKey) -> bool:
+        last_page: Optional[int] = self.last_pages.get(key)
+        return last_page is not None and len(self.pages.get(key, ())) >= last_page
+
+    def has_article(self, oaid: Optional[Oaid]) -> bool:
+        return oaid in self.articles
+
+    def add_page(self, key: UnitKey, page: int, oaids: Iterable[Oaid]) -> None:
+        """
+        목록 페이지의 기사 요청을 모두 만든 뒤 호출합니다. 페이지는 oaids 의 기사가 모두
+        처리(finish_article)된 뒤에 완료로 기록됩니다.
+        """
+        page_key: PageKey = (key, page)
+        pending: Set[Oaid] = {oaid for oaid in oaids if oaid not in self.articles}
+        if not pending:
+            self.finish_page(page_key)
+            return
+        self.pending_pages[page_key] = pending
+        for oaid in pending:
+            self.article_pages.setdefault(oaid, []).append(page_key)
+
+    def finish_article(self, oaid: Optional[Oaid], emitted: bool) -> None:
+        # 같은 기사가 여러 페이지에 있으면 중복 요청은 걸러지므로, 먼저 요청한 기사가 처리될 때
+        # 해당 기사를 기다리는 모든 페이지를 함께 갱신합니다.
+        if oaid is None:
+            return
+        if emitted and oaid not in self.articles:
+            self.articles.add(oaid)
+            self.write("A", *oaid)
+        for page_key in self.article_pages.pop(oaid, []):
+            pending: Optional[Set[Oaid]] = self.pending_pages.get(page_key)
+            if pending is None:
+                continue
+            pending.discard(oaid)
+            if not pending:
+                del self.pending_pages[page_key]
+                self.finish_page(page_key)
+
+    def finish_page(self, page_key: PageKey) -> None:
+        (date, sid), page = page_key
+        pages: Set[int] = self.pages.setdefault((date, sid), set())
+        if page not in pages:
+            pages.add(page)
+            self.write("P", sid or NO_SID, date, str(page))
+
+
+class CheckpointExtension:
+    """
+    spider 에 CheckpointStore 를 연결하고, 기사 처리 결과를 체크포인트에 반영하는 Extension
+
+    같은 인자로 다시 실행하면 spider 는 완료된 목록 페이지와 기사를 요청하지 않습니다.
+    """
+
+    def __init__(self, crawler: Crawler, path: str, sync_interval: float = 5.0):
+        self.crawler: Crawler = crawler
+        self.path: str = path
+        self.sync_interval: float = sync_interval
+        self.store: Optional[CheckpointStore] = None
+        self.sync_loop: Optional[LoopingCall] = None
+
+    @classmethod
+    def from_crawler(cls, crawler: Crawler) -> "CheckpointExtension":
+        if not crawler.settings.getbool("CHECKPOINT_ENABLED"):
+            raise NotConfigured
+        ext: CheckpointExtension = cls(
+            crawler,
+            crawler.settings.get("CHECKPOINT_PATH", "checkpoints"),
+            crawler.settings.getfloat("CHECKPOINT_SYNC_INTERVAL", 5.0),
+        )
+        crawler.signals.connect(ext.spider_opened, signal=signals.spider_opened)
+        crawler.signals.connect(ext.spider_closed, signal=signals.spider_closed)
+        crawler.signals.connect(ext.item_scraped, signal=signals.item_scraped)
+        crawler.signals.connect(ext.item_not_scraped, signal=signals.item_dropped)
+        crawler.signals.connect(ext.item_not_scraped, signal=signals.item_error)
+        crawler.signals.connect(ext.spider_error, signal=signals.spider_error)
+        return ext
+
+    def spider_opened(self, spider: Spider) -> None:
+        self.store = CheckpointStore(
+            os.path.join(self.path, f"{spider.name}.checkpoint")
+        )
+        spider.checkpoint = self.store
+        if self.sync_interval > 0:
+            self.sync_loop = LoopingCall(self.store.sync)
+            self.sync_loop.start(self.sync_interval, now=False)
+        spider.logger.info(
+            f"Resuming from checkpoint: {len(self.store.articles)} articles, "
+            f"{sum(map(len, self.store.pages.values()))} list pages"
+        )
+
+    def spider_closed(self, spider: Spider) -> None:
+        if self.sync_loop is not None and self.sync_loop.running:
+            self.sync_loop.stop()
+        self.store.close()
+
+    def item_scraped(self, item, response: Response, spider: Spider) -> None:
+        if isinstance(item, News):
+            self.store.finish_article((item.oid, item.aid), emitted=True)
+
+    def item_not_scraped(self, item, response: Response, spider: Spider, **kwargs):
+        if isinstance(item, News):
+            self.store.finish_article((item.oid, item.aid), emitted=False)
+
+    def spider_error(self, failure: Failure, response: Response, spider: Spider):
+        # 기사 콜백에서 예외가 발생한 경우
+        self.store.finish_article(response.meta.get("oaid"), emitted=False)
@@ -0,0 +1,123 @@
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
+from typing import Dict, Iterable, Iterator, List, Optional
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from scrapy.http import HtmlResponse
+
+from src.settings import (
+    USER_AGENT,
+    RETRY_HTTP_CODES,
+    CONCURRENT_REQUESTS,
+    CONCURRENT_REQUESTS_PER_DOMAIN,
+)
+from src.middlewares import parse_retry_after
+from src.utils import convert_requests_res_to_scrapy
+
+# 429 는 대기 시간(지수 증가, Retry-After)을 늘려 가며 재시도합니다.
+CLIENT_RETRY_HTTP_CODES: List[int] = [*RETRY_HTTP_CODES, 429]
+
+
+class NewsClient:
+    """
+    Scrapy 밖에서 여러 URL 을 동시에 받아오기 위한 keep-alive 클라이언트
+
+    host 별 동시 요청 수와 재시도 대상 상태 코드는 settings 의 값을 따르며, 429 는 점점 길게
+    기다리면서 재시도합니다.
+    """
+
+    def __init__(
+        self,
+        max_workers: int = CONCURRENT_REQUESTS,
+        per_host_concurrency: int = CONCURRENT_REQUESTS_PER_DOMAIN,
+        retry_times: int = 2,
+        retry_http_codes: Iterable[int] = CLIENT_RETRY_HTTP_CODES,
+        retry_backoff: float = 1.0,
+        timeout: float = 30.0,
+        user_agent: str = USER_AGENT,
+        max_hosts: int = 10,
+    ):
+        self.per_host_concurrency: int = per_host_concurrency
+        self.retry_times: int = retry_times
+        self.retry_http_codes: frozenset = frozenset(retry_http_codes)
+        self.retry_backoff: float = retry_backoff
+        self.timeout: float = timeout
+
+        self.session: requests.Session = requests.Session()
+        self.session.headers["User-Agent"] = user_agent
+        # pool_connections 는 연결 풀을 유지할 host 수, pool_maxsize 는 host 별 연결 수입니다.
+        adapter: HTTPAdapter = HTTPAdapter(
+            pool_connections=max_hosts, pool_maxsize=per_host_concurrency
+        )
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self.executor: ThreadPoolExecutor = ThreadPoolExecutor(max_workers=max_workers)
+        self.host_semaphores: Dict[str, threading.BoundedSemaphore] = {}
+        self.lock: threading.Lock = threading.Lock()
+
+    def __enter__(self) -> "NewsClient":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self.executor.shutdown(wait=True)
+        self.session.close()
+
+    def get_host_semaphore(self, url: str) -> threading.BoundedSemaphore:
+        host: str = urlsplit(url).hostname or ""
+        with self.lock:
+            if host not in self.host_semaphores:
+                self.host_semaphores[host] = threading.BoundedSemaphore(
+                    self.per_host_concurrency
+                )
+            return self.host_semaphores[host]
+
+    def fetch(self, url: str, **kwargs) -> HtmlResponse:
+        kwargs.setdefault("timeout", self.timeout)
+        semaphore: threading.BoundedSemaphore = self.get_host_semaphore(url)
+        attempt: int = 0
+        while True:
+            with semaphore:
+                try:
+                    res: Optional[requests.Response] = self.session.get(url, **kwargs)
+                except (requests.ConnectionError, requests.Timeout):
+                    if attempt >= self.retry_times:
+                        raise
+                    res = None
+            if res is not None and (
+                res.status_code not in self.retry_http_codes
+                or attempt >= self.retry_times
+            ):
+                return convert_requests_res_to_scrapy(res)
+            # 재시도 전에는 host 의 동시 요청 자리를 비워 두고 기다립니다.
+            retry_after: Optional[float] = (
+                parse_retry_after(res.headers.get("Retry-After", "").encode("latin-1"))
+                if res is not None
+                else None
+            )
+            time.sleep(max(self.retry_backoff * 2**attempt, retry_after or 0))
+            attempt += 1
+
+    def fetch_many(self, urls: Iterable[str], **kwargs) -> Iterator[HtmlResponse]:
+        """
+        urls 를 동시에 요청하고, 완료된 순서대로 응답을 돌려줍니다.
+        """
+        futures: List[Future] = [
+            self.executor.submit(self.fetch, url, **kwargs) for url in urls
+        ]
+        try:
+            for future in as_completed(futures):
+                yield future.result()
+        finally:
+            for future in futures:
+                future.cancel()
+
+
+def fetch_many(urls: Iterable[str], **kwargs) -> Iterator[HtmlResponse]:
+    with NewsClient() as client:
+        yield from client.fetch_many(urls, **kwargs)
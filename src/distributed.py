@@ -0,0 +1,594 @@
+"""
+여러 작업 노드가 하나의 공유 frontier 로 목록 페이지와 기사를 나누어 수집하는 분산 모드
+
+작업 단위(WorkUnit)의 키를 consistent hash 로 노드에 나누어, 각 노드는 자신이 맡은 범위의
+작업을 먼저 가져갑니다(claim). lease 가 만료된 작업과 lease 시간 동안 아무도 가져가지 않은 작업은
+범위와 관계없이 어느 노드든 가져가므로, 종료되거나 시작하지 않은 노드의 작업도 끝까지 수집됩니다.
+중복 제거와 완료 여부는 frontier 에서 전역으로 관리합니다.
+
+사용법: python -m src.distributed serve frontier.sqlite3 [--host 0.0.0.0] [--port 8650]
+"""
+
+import argparse
+import bisect
+import json
+import sqlite3
+import threading
+import time
+import zlib
+from abc import ABCMeta, abstractmethod
+from dataclasses import asdict, dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+import requests
+from scrapy import Spider, signals
+from scrapy.crawler import Crawler
+from scrapy.exceptions import DontCloseSpider, NotConfigured
+from scrapy.http import Response
+from twisted.internet import defer, threads
+from twisted.internet.task import LoopingCall
+from twisted.python.failure import Failure
+from twisted.python.threadpool import ThreadPool
+
+from src.items import News
+
+# 작업 상태
+PENDING: int = 0
+CLAIMED: int = 1
+DONE: int = 2
+FAILED: int = 3
+
+HASH_SPACE: int = 2**32
+
+
+def hash_key(key: str) -> int:
+    return zlib.crc32(key.encode("utf-8"))
+
+
+@dataclass
+class WorkUnit:
+    """
+    하나의 목록 페이지 또는 기사 요청
+
+    kind: "probe" (마지막 페이지 확인), "list", "follow" (페이지 링크를 따라가는 목록), "article"
+    """
+
+    key: str
+    kind: str
+    url: str
+    date: Optional[str] = None
+    sid: Optional[str] = None
+
+
+class HashRing:
+    """
+    노드마다 replicas 개의 가상 노드를 두는 consistent hash ring
+
+    노드가 추가 / 제거되어도 전체 키 중 약 1/N 만 다른 노드로 옮겨집니다.
+    """
+
+    def __init__(self, nodes: Iterable[str], replicas: int = 64):
+        self.nodes: List[str] = sorted(set(nodes))
+        if not self.nodes:
+            raise ValueError("HashRing requires at least one node")
+        self.replicas: int = replicas
+        points: List[Tuple[int, str]] = sorted(
+            (hash_key(f"{node}#{i}"), node)
+            for node in self.nodes
+            for i in range(replicas)
+        )
+        self.points: List[int] = [point for point, _ in points]
+        self.owners: List[str] = [node for _, node in points]
+
+    def get_node(self, key: str) -> str:
+        index: int = bisect.bisect_left(self.points, hash_key(key))
+        return self.owners[index % len(self.owners)]
+
+    def get_ranges(self, node: str) -> List[Tuple[int, int]]:
+        """
+        node 가 맡은 hash 범위 목록 [(start, end)] 을 돌려줍니다. start < hash <= end
+        """
+        ranges: List[Tuple[int, int]] = []
+        for index, owner in enumerate(self.owners):
+            if owner != node:
+                continue
+            start: int = self.points[index - 1] if index else -1
+            if index == 0:
+                # 첫 지점은 마지막 지점 이후 ~ 끝, 처음 ~ 첫 지점을 함께 맡습니다.
+                ranges.append((self.points[-1], HASH_SPACE))
+            ranges.append((start, self.points[index]))
+        return ranges
+
+
+class SharedFrontier(metaclass=ABCMeta):
+    """
+    작업 노드들이 공유하는 frontier 의 인터페이스
+
+    push 는 같은 키의 작업을 한 번만 추가하고, claim 은 worker 가 맡은 범위의 대기 작업을 먼저 가져가되
+    lease 가 만료된 작업과 lease 이상 대기한 작업은 범위와 관계없이 가져가며, complete 는 작업을
+    완료 / 실패로 기록합니다.
+    """
+
+    @abstractmethod
+    def push(self, units: List[WorkUnit]) -> int:
+        raise NotImplementedError
+
+    @abstractmethod
+    def claim(
+        self, worker: str, workers: List[str], limit: int, lease: float
+    ) -> List[WorkUnit]:
+        raise NotImplementedError
+
+    @abstractmethod
+    def complete(self, keys: List[str], failed: bool = False) -> None:
+        raise NotImplementedError
+
+    @abstractmethod
+    def finished(self) -> bool:
+        raise NotImplementedError
+
+    def close(self) -> None:
+        pass
+
+
+class SqliteFrontier(SharedFrontier):
+    """
+    같은 장비(또는 공유 파일 시스템)의 프로세스들이 SQLite 파일 잠금으로 공유하는 frontier
+    """
+
+    def __init__(self, path: str, timeout: float = 30.0):
+        self.path: str = path
+        self.lock: threading.Lock = threading.Lock()
+        self.conn: sqlite3.Connection = sqlite3.connect(
+            path, timeout=timeout, isolation_level=None, check_same_thread=False
+        )
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS work_unit ("
+            "key TEXT PRIMARY KEY, "
+            "kind TEXT NOT NULL, "
+            "url TEXT NOT NULL, "
+            "date TEXT, "
+            "sid TEXT, "
+            "hash INTEGER NOT NULL, "
+            "priority INTEGER NOT NULL, "
+            "status INTEGER NOT NULL, "
+            "worker TEXT, "
+            "lease_until REAL, "
+            "pushed_at REAL"
+            ")"
+        )
+        # 이전 버전에서 만든 frontier 에는 pushed_at 이 없습니다.
+        columns: List[str] = [
+            row[1] for row in self.conn.execute("PRAGMA table_info(work_unit)")
+        ]
+        if "pushed_at" not in columns:
+            self.conn.execute("ALTER TABLE work_unit ADD COLUMN pushed_at REAL")
+        self.conn.execute(
+            "CREATE INDEX IF NOT EXISTS work_unit_status_hash "
+            "ON work_unit (status, hash)"
+        )
+
+    def push(self, units: List[WorkUnit]) -> int:
+        if not units:
+            return 0
+        now: float = time.time()
+        with self.lock:
+            before: int = self.conn.total_changes
+            self.conn.execute("BEGIN IMMEDIATE")
+            try:
+                self.conn.executemany(
+                    "INSERT OR IGNORE INTO work_unit "
+                    "(key, kind, url, date, sid, hash, priority, status, pushed_at) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    [
+                        (
+                            unit.key,
+                            unit.kind,
+                            unit.url,
+                            unit.date,
+                            unit.sid,
+                            hash_key(unit.key),
+                            # 기사를 먼저 가져가 대기 중인 요청이 쌓이지 않도록 합니다.
+                            1 if unit.kind == "article" else 0,
+                            PENDING,
+                            now,
+                        )
+                        for unit in units
+                    ],
+                )
+                self.conn.execute("COMMIT")
+            except BaseException:
+                self.conn.execute("ROLLBACK")
+                raise
+            return self.conn.total_changes - before
+
+    def claim(
+        self, worker: str, workers: List[str], limit: int, lease: float = 300.0
+    ) -> List[WorkUnit]:
+        ranges: List[Tuple[int, int]] = HashRing(workers).get_ranges(worker)
+        range_sql: str = (
+            " OR ".join(["(hash > ? AND hash <= ?)"] * len(ranges)) if ranges else "0"
+        )
+        range_args: List[int] = [bound for range_ in ranges for bound in range_]
+        now: float = time.time()
+        with self.lock:
+            self.conn.execute("BEGIN IMMEDIATE")
+            try:
+                # 자신의 범위의 대기 작업, 범위와 관계없이 lease 가 만료된 작업과 lease 이상 아무도
+                # 가져가지 않은 작업(노드가 종료되었거나 시작하지 않은 경우) 순서로 가져갑니다.
+                rows: List[tuple] = self.conn.execute(
+                    "SELECT key, kind, url, date, sid FROM work_unit "
+                    f"WHERE (status = ? AND ({range_sql})) "
+                    "OR (status = ? AND lease_until < ?) "
+                    "OR (status = ? AND COALESCE(pushed_at, 0) < ?) "
+                    f"ORDER BY ({range_sql}) DESC, priority DESC, rowid LIMIT ?",
+                    (
+                        PENDING,
+                        *range_args,
+                        CLAIMED,
+                        now,
+                        PENDING,
+                        now - lease,
+                        *range_args,
+                        limit,
+                    ),
+                ).fetchall()
+                self.conn.executemany(
+                    "UPDATE work_unit SET status = ?, worker = ?, lease_until = ? "
+                    "WHERE key = ?",
+                    [(CLAIMED, worker, now + lease, row[0]) for row in rows],
+                )
+                self.conn.execute("COMMIT")
+            except BaseException:
+                self.conn.execute("ROLLBACK")
+                raise
+        return [WorkUnit(*row) for row in rows]
+
+    def complete(self, keys: List[str], failed: bool = False) -> None:
+        if not keys:
+            return
+        with self.lock:
+            self.conn.executemany(
+                "UPDATE work_unit SET status = ?, lease_until = NULL WHERE key = ?",
+                [(FAILED if failed else DONE, key) for key in keys],
+            )
+
+    def finished(self) -> bool:
+        with self.lock:
+            row: Optional[tuple] = self.conn.execute(
+                "SELECT 1 FROM work_unit WHERE status IN (?, ?) LIMIT 1",
+                (PENDING, CLAIMED),
+            ).fetchone()
+        return row is None
+
+    def count(self, status: int) -> int:
+        with self.lock:
+            return self.conn.execute(
+                "SELECT COUNT(*) FROM work_unit WHERE status = ?", (status,)
+            ).fetchone()[0]
+
+    def close(self) -> None:
+        self.conn.close()
+
+
+class RemoteFrontier(SharedFrontier):
+    """
+    serve() 로 실행한 frontier 서버(또는 같은 JSON API 를 제공하는 다른 구현)를 사용하는 클라이언트
+
+    POST /push {"units": [...]} -> {"added": n}
+    POST /claim {"worker", "workers", "limit", "lease"} -> {"units": [...]}
+    POST /complete {"keys": [...], "failed": bool}
+    GET /finished -> {"finished": bool}
+    """
+
+    def __init__(self, base_url: str, timeout: float = 30.0):
+        self.base_url: str = base_url.rstrip("/")
+        self.timeout: float = timeout
+        self.session: requests.Session = requests.Session()
+
+    def request(self, method: str, path: str, payload: Optional[Dict] = None) -> Dict:
+        res: requests.Response = self.session.request(
+            method, self.base_url + path, json=payload, timeout=self.timeout
+        )
+        res.raise_for_status()
+        return res.json()
+
+    def push(self, units: List[WorkUnit]) -> int:
+        if not units:
+            return 0
+        return self.request("POST", "/push", {"units": list(map(asdict, units))})[
+            "added"
+        ]
+
+    def claim(
+        self, worker: str, workers: List[str], limit: int, lease: float = 300.0
+    ) -> List[WorkUnit]:
+        payload: Dict = {
+            "worker": worker,
+            "workers": workers,
+            "limit": limit,
+            "lease": lease,
+        }
+        return [
+            WorkUnit(**unit)
+            for unit in self.request("POST", "/claim", payload)["units"]
+        ]
+
+    def complete(self, keys: List[str], failed: bool = False) -> None:
+        if keys:
+            self.request("POST", "/complete", {"keys": keys, "failed": failed})
+
+    def finished(self) -> bool:
+        return self.request("GET", "/finished")["finished"]
+
+    def close(self) -> None:
+        self.session.close()
+
+
+def open_frontier(uri: str) -> SharedFrontier:
+    # "http://host:port" 는 RemoteFrontier, 그 외에는 SQLite 파일 경로로 취급합니다.
+    if uri.startswith(("http://", "https://")):
+        return RemoteFrontier(uri)
+    return SqliteFrontier(
+        uri[len("sqlite://") :] if uri.startswith("sqlite://") else uri
+    )
+
+
+def make_frontier_handler(frontier: SharedFrontier) -> type:
+    class FrontierHandler(BaseHTTPRequestHandler):
+        def send_json(self, payload: Dict) -> None:
+            body: bytes = json.dumps(payload).encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def do_GET(self) -> None:
+            if self.path != "/finished":
+                self.send_error(404)
+                return
+            self.send_json({"finished": frontier.finished()})
+
+        def do_POST(self) -> None:
+            length: int = int(self.headers.get("Content-Length", 0))
+            payload: Dict = json.loads(self.rfile.read(length) or b"{}")
+            if self.path == "/push":
+                units: List[WorkUnit] = [WorkUnit(**unit) for unit in payload["units"]]
+                self.send_json({"added": frontier.push(units)})
+            elif self.path == "/claim":
+                claimed: List[WorkUnit] = frontier.claim(
+                    payload["worker"],
+                    payload["workers"],
+                    payload["limit"],
+                    payload.get("lease", 300.0),
+                )
+                self.send_json({"units": list(map(asdict, claimed))})
+            elif self.path == "/complete":
+                frontier.complete(payload["keys"], payload.get("failed", False))
+                self.send_json({})
+            else:
+                self.send_error(404)
+
+        def log_message(self, fmt: str, *args) -> None:
+            pass
+
+    return FrontierHandler
+
+
+def serve(frontier: SharedFrontier, host: str = "127.0.0.1", port: int = 8650):
+    return ThreadingHTTPServer((host, port), make_frontier_handler(frontier))
+
+
+class DistributedFrontierExtension:
+    """
+    spider 에 공유 frontier 를 연결하고, 작업 처리 결과를 frontier 에 반영하는 Extension
+
+    spider 가 idle 상태가 되면 자신이 맡은 작업을 더 가져오며, 다른 노드의 작업이 남아 있는 동안에는
+    종료하지 않고 기다립니다. (spider_idle 신호마다 확인)
+
+    수집 중의 frontier 호출(SQLite 트랜잭션, HTTP 요청)은 reactor 를 멈추지 않도록 전용 스레드 하나에서
+    순서대로 수행합니다. 발견한 작업과 완료한 작업은 batch_size 개 또는 flush_interval 초마다 모아서
+    기록하며, 같은 스레드에서 순서대로 기록하므로 작업의 완료는 그 작업에서 발견한 작업보다 먼저
+    기록되지 않습니다.
+    """
+
+    def __init__(
+        self,
+        crawler: Crawler,
+        uri: str,
+        worker: str,
+        workers: List[str],
+        batch_size: int = 100,
+        lease: float = 300.0,
+        flush_interval: float = 1.0,
+    ):
+        if worker not in workers:
+            raise NotConfigured(f"DISTRIBUTED_WORKER_ID {worker} not in workers")
+        self.crawler: Crawler = crawler
+        self.uri: str = uri
+        self.worker: str = worker
+        self.workers: List[str] = workers
+        self.batch_size: int = batch_size
+        self.lease: float = lease
+        self.flush_interval: float = flush_interval
+        self.frontier: Optional[SharedFrontier] = None
+        # 발견한 작업과 완료 / 실패한 작업의 키를 모아서 한 번에 기록합니다.
+        self.push_buffer: List[WorkUnit] = []
+        self.done_buffer: List[str] = []
+        self.failed_buffer: List[str] = []
+        self.pool: Optional[ThreadPool] = None
+        self.flush_loop: Optional[LoopingCall] = None
+        # 진행 중인 작업 가져오기와, 마지막으로 확인한 전체 수집 완료 여부
+        self.claiming: Optional[defer.Deferred] = None
+        self.frontier_finished: bool = False
+
+    @classmethod
+    def from_crawler(cls, crawler: Crawler) -> "DistributedFrontierExtension":
+        uri: Optional[str] = crawler.settings.get("DISTRIBUTED_FRONTIER")
+        if not uri:
+            raise NotConfigured
+        worker: str = str(crawler.settings.get("DISTRIBUTED_WORKER_ID", "0"))
+        workers: List[str] = [
+            str(worker_id)
+            for worker_id in crawler.settings.getlist("DISTRIBUTED_WORKERS", [worker])
+        ]
+        ext: DistributedFrontierExtension = cls(
+            crawler,
+            uri,
+            worker,
+            workers,
+            crawler.settings.getint("DISTRIBUTED_CLAIM_BATCH_SIZE", 100),
+            crawler.settings.getfloat("DISTRIBUTED_LEASE", 300.0),
+            crawler.settings.getfloat("DISTRIBUTED_FLUSH_INTERVAL", 1.0),
+        )
+        crawler.signals.connect(ext.spider_opened, signal=signals.spider_opened)
+        crawler.signals.connect(ext.spider_closed, signal=signals.spider_closed)
+        crawler.signals.connect(ext.spider_idle, signal=signals.spider_idle)
+        crawler.signals.connect(ext.item_scraped, signal=signals.item_scraped)
+        crawler.signals.connect(ext.item_not_scraped, signal=signals.item_dropped)
+        crawler.signals.connect(ext.item_not_scraped, signal=signals.item_error)
+        crawler.signals.connect(ext.spider_error, signal=signals.spider_error)
+        return ext
+
+    def spider_opened(self, spider: Spider) -> None:
+        self.frontier = open_frontier(self.uri)
+        # 한 스레드에서만 호출하여 기록 순서를 유지합니다.
+        self.pool = ThreadPool(1, 1, name="distributed-frontier")
+        self.pool.start()
+        if self.flush_interval > 0:
+            self.flush_loop = LoopingCall(self.flush)
+            self.flush_loop.start(self.flush_interval, now=False)
+        spider.distributed = self
+        spider.logger.info(
+            f"Distributed worker {self.worker} of {len(self.workers)} using {self.uri}"
+        )
+
+    def spider_closed(self, spider: Spider) -> defer.Deferred:
+        if self.flush_loop is not None and self.flush_loop.running:
+            self.flush_loop.stop()
+        d: defer.Deferred = self.flush()
+        d.addBoth(lambda _: self.call(self.frontier.close))
+        d.addBoth(lambda _: self.pool.stop())
+        return d
+
+    def call(self, func: Callable, *args) -> defer.Deferred:
+        from twisted.internet import reactor
+
+        return threads.deferToThreadPool(reactor, self.pool, func, *args)
+
+    def write(self, units: List[WorkUnit], done: List[str], failed: List[str]) -> int:
+        # 발견한 작업을 먼저 추가해야 다른 노드가 전체 수집이 끝났다고 판단하지 않습니다.
+        added: int = self.frontier.push(units)
+        self.frontier.complete(done)
+        self.frontier.complete(failed, failed=True)
+        return added
+
+    def flush(self) -> defer.Deferred:
+        if not (self.push_buffer or self.done_buffer or self.failed_buffer):
+            return defer.succeed(None)
+        d: defer.Deferred = self.call(
+            self.write, self.push_buffer, self.done_buffer, self.failed_buffer
+        )
+        self.push_buffer, self.done_buffer, self.failed_buffer = [], [], []
+        d.addCallback(
+            lambda added: self.crawler.stats.inc_value("distributed/pushed", added)
+        )
+        d.addErrback(self.log_failure, "write")
+        return d
+
+    def log_failure(self, failure: Failure, action: str) -> None:
+        self.crawler.stats.inc_value("distributed/errors")
+        self.crawler.spider.logger.error(
+            f"Distributed frontier {action} failed: {failure.getErrorMessage()}"
+        )
+
+    def push(self, unit: WorkUnit) -> None:
+        self.push_buffer.append(unit)
+        if len(self.push_buffer) >= self.batch_size:
+            self.flush()
+
+    def claim(self) -> List[WorkUnit]:
+        """
+        spider 를 시작할 때 한 번 작업을 가져옵니다. 이후에는 spider_idle 에서 다른 스레드로 가져옵니다.
+        """
+        self.write(self.push_buffer, self.done_buffer, self.failed_buffer)
+        self.push_buffer, self.done_buffer, self.failed_buffer = [], [], []
+        units: List[WorkUnit] = self.frontier.claim(
+            self.worker, self.workers, self.batch_size, self.lease
+        )
+        self.crawler.stats.inc_value("distributed/claimed", len(units))
+        return units
+
+    def complete(self, key: Optional[str], failed: bool = False) -> None:
+        if key is None:
+            return
+        (self.failed_buffer if failed else self.done_buffer).append(key)
+        self.crawler.stats.inc_value(
+            "distributed/failed" if failed else "distributed/completed"
+        )
+        if len(self.done_buffer) + len(self.failed_buffer) >= self.batch_size:
+            self.flush()
+
+    def claim_or_check(self) -> Tuple[List[WorkUnit], bool]:
+        units: List[WorkUnit] = self.frontier.claim(
+            self.worker, self.workers, self.batch_size, self.lease
+        )
+        return units, not units and self.frontier.finished()
+
+    def claimed(self, result: Tuple[List[WorkUnit], bool], spider: Spider) -> None:
+        units, self.frontier_finished = result
+        self.crawler.stats.inc_value("distributed/claimed", len(units))
+        for request in spider.claim_requests(units):
+            self.crawler.engine.crawl(request)
+
+    def spider_idle(self, spider: Spider) -> None:
+        # 가져온 작업이 없고 다른 노드의 작업도 모두 끝난 것을 확인한 뒤에만 종료합니다.
+        if self.claiming is None:
+            if self.frontier_finished:
+                return
+            self.flush()
+            self.claiming = self.call(self.claim_or_check)
+            self.claiming.addCallback(self.claimed, spider)
+            self.claiming.addErrback(self.log_failure, "claim")
+            self.claiming.addBoth(self.finish_claiming)
+        raise DontCloseSpider
+
+    def finish_claiming(self, _) -> None:
+        self.claiming = None
+
+    def item_scraped(self, item, response: Response, spider: Spider) -> None:
+        if isinstance(item, News):
+            self.complete(response.meta.get("work_key"))
+
+    def item_not_scraped(self, item, response: Response, spider: Spider, **kwargs):
+        if isinstance(item, News):
+            self.complete(response.meta.get("work_key"), failed=True)
+
+    def spider_error(self, failure: Failure, response: Response, spider: Spider):
+        self.complete(response.meta.get("work_key"), failed=True)
+
+
+def main() -> None:
+    parser: argparse.ArgumentParser = argparse.ArgumentParser(
+        description="Serve a shared SQLite frontier over HTTP"
+    )
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    serve_parser: argparse.ArgumentParser = subparsers.add_parser("serve")
+    serve_parser.add_argument("path")
+    serve_parser.add_argument("--host", default="127.0.0.1")
+    serve_parser.add_argument("--port", type=int, default=8650)
+    args: argparse.Namespace = parser.parse_args()
+
+    server: ThreadingHTTPServer = serve(SqliteFrontier(args.path), args.host, args.port)
+    print(f"Serving frontier {args.path} on http://{args.host}:{args.port}")
+    try:
+        server.serve_forever()
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
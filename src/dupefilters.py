@@ -0,0 +1,74 @@
+import os
+from typing import IO, Optional, Set, Tuple, Union
+
+from scrapy import Request
+from scrapy.dupefilters import RFPDupeFilter
+
+from src.utils import ArticleKey, parse_article_link
+
+# oid 는 3 자리, aid 는 10 자리 숫자이므로 aid 를 34 bit 에 담고 그 위에 oid 를 붙입니다.
+AID_BITS: int = 34
+
+
+def pack_oaid(oid: str, aid: str) -> Union[int, Tuple[str, str]]:
+    if oid.isdigit() and aid.isdigit() and int(aid) < 1 << AID_BITS:
+        return int(oid) << AID_BITS | int(aid)
+    return oid, aid
+
+
+class ArticleDupeFilter(RFPDupeFilter):
+    """
+    기사 요청을 URL 지문 대신 (oid, aid) 로 중복 확인하는 DUPEFILTER_CLASS
+
+    같은 기사가 목록의 read.naver 링크, mnews/entertain/sports 링크처럼 여러 주소로 나타나도
+    한 번만 요청합니다. 키는 meta["oaid"] 또는 파싱한 기사 링크에서 얻고, 하나의 정수로 묶어
+    저장하므로 URL 정규화와 sha1 지문 계산을 거치지 않습니다. 기사 요청이 아니면 기존 지문을
+    사용하며, 리다이렉트된 요청도 기사 키로 다시 걸러지지 않도록 URL 지문으로 확인합니다.
+
+    JOBDIR 을 사용하면 기사 키는 articles.seen 에 한 줄씩 기록되어 재시작 후에도 유지됩니다.
+    """
+
+    def __init__(self, path: Optional[str] = None, debug: bool = False, **kwargs):
+        super().__init__(path, debug, **kwargs)
+        self.article_keys: Set[Union[int, Tuple[str, str]]] = set()
+        self.article_file: Optional[IO[str]] = None
+        if path:
+            self.article_file = open(
+                os.path.join(path, "articles.seen"), "a+", encoding="utf-8"
+            )
+            self.article_file.seek(0)
+            for line in self.article_file:
+                oid, _, aid = line.rstrip("\n").partition(" ")
+                if aid:
+                    self.article_keys.add(pack_oaid(oid, aid))
+
+    @staticmethod
+    def get_article_key(request: Request) -> Optional[Tuple[str, str]]:
+        # 리다이렉트된 요청(mnews → entertain / sports 등)은 원래 요청의 meta["oaid"] 를 그대로
+        # 가지므로, 기사 키 대신 URL 지문으로 확인합니다.
+        if "redirect_times" in request.meta or "redirect_urls" in request.meta:
+            return None
+        oaid: Optional[Tuple[str, str]] = request.meta.get("oaid")
+        if oaid:
+            return oaid[0], oaid[1]
+        if request.method != "GET":
+            return None
+        key: Optional[ArticleKey] = parse_article_link(request.url)
+        return (key.oid, key.aid) if key is not None else None
+
+    def request_seen(self, request: Request) -> bool:
+        oaid: Optional[Tuple[str, str]] = self.get_article_key(request)
+        if oaid is None:
+            return super().request_seen(request)
+        packed: Union[int, Tuple[str, str]] = pack_oaid(*oaid)
+        if packed in self.article_keys:
+            return True
+        self.article_keys.add(packed)
+        if self.article_file:
+            self.article_file.write(f"{oaid[0]} {oaid[1]}\n")
+        return False
+
+    def close(self, reason: str) -> None:
+        if self.article_file:
+            self.article_file.close()
+        super().close(reason)
@@ -0,0 +1,121 @@
+from typing import Optional
+
+from scrapy import Request, Spider, signals
+from scrapy.crawler import Crawler
+from scrapy.exceptions import NotConfigured
+from scrapy.http import Response
+from twisted.internet.interfaces import IListeningPort
+from twisted.web.resource import Resource
+from twisted.web.server import Request as WebRequest, Site
+
+from src.metrics import StageMetrics, StageProfiler
+
+
+class MetricsResource(Resource):
+    """
+    StageMetrics 를 Prometheus text 형식으로 돌려주는 /metrics 리소스
+    """
+
+    isLeaf: bool = True
+
+    def __init__(self, metrics: StageMetrics):
+        super().__init__()
+        self.metrics: StageMetrics = metrics
+
+    def render_GET(self, request: WebRequest) -> bytes:
+        request.setHeader(b"Content-Type", b"text/plain; version=0.0.4")
+        return self.metrics.to_prometheus().encode("utf-8")
+
+
+class StageMetricsExtension:
+    """
+    목록 / 기사 다운로드, 링크 / 기사 / 기자 추출, 저장소 기록 단계의 소요 시간을 기록하는 Extension
+
+    다운로드 시간은 response_received 신호의 download_latency 로, 추출 / 기록 시간은
+    spider.metrics 와 spider.profiler 를 통해 spider 와 pipeline 에서 직접 기록합니다.
+    결과는 STAGE_METRICS_PORT 의 /metrics 와 종료 시 수집 통계의 stage_metrics/* 항목에 남습니다.
+    """
+
+    def __init__(
+        self,
+        crawler: Crawler,
+        metrics: Optional[StageMetrics],
+        profiler: Optional[StageProfiler] = None,
+        host: str = "127.0.0.1",
+        port: int = 0,
+    ):
+        self.crawler: Crawler = crawler
+        self.metrics: Optional[StageMetrics] = metrics
+        self.profiler: Optional[StageProfiler] = profiler
+        self.host: str = host
+        self.port: int = port
+        self.listening_port: Optional[IListeningPort] = None
+
+    @classmethod
+    def from_crawler(cls, crawler: Crawler) -> "StageMetricsExtension":
+        enabled: bool = crawler.settings.getbool("STAGE_METRICS_ENABLED")
+        profiler_mode: Optional[str] = crawler.settings.get("STAGE_PROFILER")
+        if not enabled and not profiler_mode:
+            raise NotConfigured
+        profiler: Optional[StageProfiler] = None
+        if profiler_mode:
+            profiler = StageProfiler(
+                profiler_mode,
+                crawler.settings.get("STAGE_PROFILER_PATH", "profile"),
+                crawler.settings.getint("STAGE_PROFILER_EVERY", 100),
+            )
+        ext: StageMetricsExtension = cls(
+            crawler,
+            StageMetrics() if enabled else None,
+            profiler,
+            crawler.settings.get("STAGE_METRICS_HOST", "127.0.0.1"),
+            crawler.settings.getint("STAGE_METRICS_PORT", 0),
+        )
+        crawler.signals.connect(ext.spider_opened, signal=signals.spider_opened)
+        crawler.signals.connect(ext.spider_closed, signal=signals.spider_closed)
+        if enabled:
+            crawler.signals.connect(
+                ext.response_received, signal=signals.response_received
+            )
+        return ext
+
+    def spider_opened(self, spider: Spider) -> None:
+        spider.metrics = self.metrics
+        spider.profiler = self.profiler
+        if self.profiler is not None:
+            self.profiler.start()
+        if self.metrics is not None and self.port:
+            from twisted.internet import reactor
+
+            self.listening_port = reactor.listenTCP(
+                self.port, Site(MetricsResource(self.metrics)), interface=self.host
+            )
+            spider.logger.info(
+                f"Stage metrics available at http://{self.host}:{self.port}/metrics"
+            )
+
+    def response_received(
+        self, response: Response, request: Request, spider: Spider
+    ) -> None:
+        latency: Optional[float] = request.meta.get("download_latency")
+        if latency is None:
+            return
+        # 목록 요청에는 meta["unit"] 이, 기자 페이지 요청에는 meta["author"] 가 있습니다.
+        stage: str = "article_download"
+        if "unit" in request.meta:
+            stage = "list_download"
+        elif "author" in request.meta:
+            stage = "profile_download"
+        self.metrics.observe(stage, spider.name, request.meta.get("sid"), latency)
+
+    def spider_closed(self, spider: Spider) -> None:
+        if self.listening_port is not None:
+            self.listening_port.stopListening()
+            self.listening_port = None
+        if self.metrics is not None:
+            for key, value in self.metrics.to_stats().items():
+                self.crawler.stats.set_value(key, value)
+        if self.profiler is not None:
+            path: Optional[str] = self.profiler.stop(spider.name)
+            if path:
+                spider.logger.info(f"Article callback profile written to {path}")
@@ -0,0 +1,199 @@
+import re
+import zlib
+from html import unescape
+from typing import Dict, Iterator, List, Optional, Set, Tuple
+
+re_title_ptrn: re.Pattern = re.compile(r"<title\b[^>]*>([^<]*)</title>", re.I)
+re_attr_ptrn: re.Pattern = re.compile(
+    r"""([^\s=/>]+)(?:\s*=\s*(?:"([^"]*)"|'([^']*)'|([^\s>]+)))?"""
+)
+re_tag_ptrn: re.Pattern = re.compile(
+    r"<!--.*?-->|<(/?)([a-zA-Z][\w:-]*)((?:[^>\"']|\"[^\"]*\"|'[^']*')*)>", re.S
+)
+re_span_ptrn: re.Pattern = re.compile(r"<span\b([^>]*_ARTICLE_[^>]*)>", re.I)
+re_button_ptrn: re.Pattern = re.compile(
+    r"<button\b([^>]*media_end_head_journalist_btn_subscribe[^>]*)>", re.I
+)
+re_dic_area_ptrn: re.Pattern = re.compile(
+    r"<div\b[^>]*\bid\s*=\s*[\"']?dic_area[\"'\s>][^>]*>", re.I
+)
+# 스트리밍 응답에서 찾는 div 태그와 div#dic_area 의 id 속성
+re_div_tag_bytes_ptrn: re.Pattern = re.compile(rb"<(/?)div\b([^>]*)>", re.I)
+re_dic_area_id_bytes_ptrn: re.Pattern = re.compile(
+    rb"\bid\s*=\s*[\"']?dic_area[\"'\s]", re.I
+)
+# build_article_item 이 사용하는 스크립트
+ARTICLE_STREAM_MARKERS: Tuple[bytes, ...] = (b"var article", b"var office")
+
+VOID_TAGS: frozenset = frozenset(
+    [
+        "area",
+        "base",
+        "br",
+        "col",
+        "embed",
+        "hr",
+        "img",
+        "input",
+        "link",
+        "meta",
+        "source",
+        "track",
+        "wbr",
+    ]
+)
+
+
+def parse_attrs(attr_str: str) -> Dict[str, str]:
+    attrs: Dict[str, str] = {}
+    for match in re_attr_ptrn.finditer(attr_str):
+        name, double_quoted, single_quoted, bare = match.groups()
+        name = name.lower()
+        if name not in attrs:
+            attrs[name] = unescape(double_quoted or single_quoted or bare or "")
+    return attrs
+
+
+def has_classes(attrs: Dict[str, str], *class_names: str) -> bool:
+    classes: List[str] = attrs.get("class", "").split()
+    return all(class_name in classes for class_name in class_names)
+
+
+def extract_title(text: str) -> Optional[str]:
+    match: Optional[re.Match] = re_title_ptrn.search(text)
+    return unescape(match.group(1)) if match else None
+
+
+def iter_article_date_attrs(text: str) -> Iterator[Dict[str, str]]:
+    for match in re_span_ptrn.finditer(text):
+        yield parse_attrs(match.group(1))
+
+
+def extract_journalists(text: str) -> List[Tuple[str, str]]:
+    # button.media_end_head_journalist_btn_subscribe._UNSUBSCRIBE 의 (id, 이름)
+    journalists: List[Tuple[str, str]] = []
+    for match in re_button_ptrn.finditer(text):
+        attrs: Dict[str, str] = parse_attrs(match.group(1))
+        if not has_classes(
+            attrs, "media_end_head_journalist_btn_subscribe", "_UNSUBSCRIBE"
+        ):
+            continue
+        journalists.append(
+            (attrs["data-channelkey"].split("_")[1], attrs.get("data-messagevalue"))
+        )
+    return journalists
+
+
+def extract_direct_texts(text: str, start: int) -> Optional[Tuple[List[str], int]]:
+    """
+    text[start:] 에서 시작하는 요소의 직계 텍스트 노드(div#dic_area::text 와 동일)와
+    요소가 닫힌 위치를 반환합니다. 요소가 닫히지 않으면 None 을 반환합니다.
+    """
+    texts: List[str] = []
+    depth: int = 0
+    pos: int = start
+    for match in re_tag_ptrn.finditer(text, start):
+        if depth == 0:
+            texts.append(unescape(text[pos : match.start()]))
+        pos = match.end()
+        closing, tag_name = match.group(1), match.group(2)
+        if tag_name is None:  # 주석
+            continue
+        tag_name = tag_name.lower()
+        if closing:
+            if depth == 0:
+                return texts, match.end()
+            depth -= 1
+        elif tag_name not in VOID_TAGS and not match.group(3).endswith("/"):
+            depth += 1
+    return None
+
+
+def fast_extract_article_fields(text: str) -> Optional[Dict]:
+    """
+    DOM 을 만들지 않고 정규식만으로 기사 제목, 날짜, 기자, 본문을 추출합니다.
+    필수 값을 찾지 못하면 None 을 반환합니다.
+    """
+    title: Optional[str] = extract_title(text)
+    upload_time: Optional[str] = None
+    edited_time: Optional[str] = None
+    for attrs in iter_article_date_attrs(text):
+        if upload_time is None and has_classes(attrs, "_ARTICLE_DATE_TIME"):
+            upload_time = attrs.get("data-date-time")
+        elif edited_time is None and has_classes(attrs, "_ARTICLE_MODIFY_DATE_TIME"):
+            edited_time = attrs.get("data-modify-date-time")
+    dic_area: Optional[re.Match] = re_dic_area_ptrn.search(text)
+    if title is None or upload_time is None or dic_area is None:
+        return None
+    direct_texts: Optional[Tuple[List[str], int]] = extract_direct_texts(
+        text, dic_area.end()
+    )
+    if direct_texts is None:
+        return None
+    try:
+        journalists: List[Tuple[str, str]] = extract_journalists(text)
+    except (KeyError, IndexError):
+        return None
+    return {
+        "title": title,
+        "upload_time": upload_time,
+        "edited_time": edited_time,
+        "journalists": journalists,
+        "content": direct_texts[0],
+    }
+
+
+class ArticleStreamScanner:
+    """
+    받는 중인 기사 페이지에 extract_article_item 이 사용하는 부분이 모두 도착했는지 확인합니다.
+
+    ARTICLE_STREAM_MARKERS 의 스크립트가 모두 나오고 div#dic_area 가 닫히면 완료입니다.
+    받은 내용은 보관하지 않으며, gzip 응답은 받은 만큼 풀어서 확인합니다.
+    """
+
+    def __init__(self, gzipped: bool = False):
+        self.decompressor: Optional["zlib._Decompress"] = (
+            zlib.decompressobj(16 + zlib.MAX_WBITS) if gzipped else None
+        )
+        self.missing: Set[bytes] = set(ARTICLE_STREAM_MARKERS)
+        # 조각 경계에 걸친 marker 를 찾기 위해 남겨 둔 앞 조각의 끝부분
+        self.tail: bytes = b""
+        # 아직 닫히지 않은 태그
+        self.pending: bytes = b""
+        # div#dic_area 안의 div 깊이 (시작 전에는 None)
+        self.depth: Optional[int] = None
+        self.closed: bool = False
+
+    @property
+    def complete(self) -> bool:
+        return self.closed and not self.missing
+
+    def feed(self, data: bytes) -> bool:
+        if self.decompressor is not None:
+            data = self.decompressor.decompress(data)
+        if self.missing:
+            window: bytes = self.tail + data
+            self.missing = {marker for marker in self.missing if marker not in window}
+            self.tail = window[-max(map(len, ARTICLE_STREAM_MARKERS)) :]
+        if not self.closed:
+            self.scan_tags(data)
+        return self.complete
+
+    def scan_tags(self, data: bytes) -> None:
+        text: bytes = self.pending + data
+        last_open: int = text.rfind(b"<")
+        if last_open != -1 and text.find(b">", last_open) == -1:
+            self.pending = text[last_open:]
+            text = text[:last_open]
+        else:
+            self.pending = b""
+        for match in re_div_tag_bytes_ptrn.finditer(text):
+            closing, attrs = match.groups()
+            if self.depth is None:
+                if not closing and re_dic_area_id_bytes_ptrn.search(attrs + b" "):
+                    self.depth = 1
+                continue
+            self.depth += -1 if closing else 1
+            if self.depth == 0:
+                self.closed = True
+                return
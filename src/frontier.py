@@ -0,0 +1,117 @@
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+from w3lib.url import canonicalize_url
+
+UnitKey = Tuple[str, Optional[str]]
+
+
+@dataclass
+class ListUnit:
+    """
+    하나의 (date, sid) 목록 수집 단위
+    """
+
+    date: str
+    sid: Optional[str]
+    pending: Set[str] = field(default_factory=set)  # 응답 대기 중인 목록 페이지
+    seen: Set[str] = field(default_factory=set)  # 이미 요청한 목록 페이지
+    articles: Set[str] = field(default_factory=set)  # 처리 대기 중인 기사 요청
+
+    @property
+    def key(self) -> UnitKey:
+        return self.date, self.sid
+
+
+class ListFrontier:
+    """
+    (date, sid) 단위의 목록 수집을 동시에 최대 max_active 개까지만 진행시키는 스케줄러
+
+    한 단위의 모든 목록 페이지와 그 목록에서 나온 기사 요청이 처리되면 다음 단위를 꺼내어,
+    긴 기간을 수집할 때도 하루가 끝나는 시점에 요청이 비지 않도록 하면서 대기 중인 기사
+    요청이 max_active 개 단위의 분량을 넘지 않도록 합니다.
+    """
+
+    def __init__(
+        self,
+        dates: Iterable[str],
+        sids: Iterable[Optional[str]],
+        max_active: int = 4,
+    ):
+        if max_active < 1:
+            raise ValueError(f"max_active must be positive, got {max_active}")
+        sids: List[Optional[str]] = list(sids)
+        self._units: Iterator[ListUnit] = (
+            ListUnit(date=date, sid=sid) for date in dates for sid in sids
+        )
+        self.max_active: int = max_active
+        self.active: Dict[UnitKey, ListUnit] = {}
+        self.exhausted: bool = False
+
+    def fill(self) -> List[ListUnit]:
+        started: List[ListUnit] = []
+        while not self.exhausted and len(self.active) < self.max_active:
+            unit: Optional[ListUnit] = next(self._units, None)
+            if unit is None:
+                self.exhausted = True
+                break
+            self.active[unit.key] = unit
+            started.append(unit)
+        return started
+
+    def add_page(self, key: UnitKey, url: str) -> bool:
+        unit: Optional[ListUnit] = self.active.get(key)
+        if unit is None:
+            return False
+        url = canonicalize_url(url)
+        if url in unit.seen:
+            return False
+        unit.seen.add(url)
+        unit.pending.add(url)
+        return True
+
+    def finish_page(self, key: UnitKey, url: str) -> bool:
+        unit: Optional[ListUnit] = self.active.get(key)
+        if unit is None:
+            return False
+        unit.pending.discard(canonicalize_url(url))
+        return self.finish_if_drained(unit)
+
+    def add_article(self, key: UnitKey, url: str) -> bool:
+        unit: Optional[ListUnit] = self.active.get(key)
+        if unit is None:
+            return False
+        unit.articles.add(canonicalize_url(url))
+        return True
+
+    def finish_article(self, key: UnitKey, url: str) -> bool:
+        unit: Optional[ListUnit] = self.active.get(key)
+        if unit is None:
+            return False
+        unit.articles.discard(canonicalize_url(url))
+        return self.finish_if_drained(unit)
+
+    def finish_if_drained(self, unit: ListUnit) -> bool:
+        if unit.pending or unit.articles:
+            return False
+        del self.active[unit.key]
+        return True
+
+    def release_articles(self) -> List[ListUnit]:
+        # 콜백 없이 사라진 기사 요청(spider 미들웨어에서 걸러진 경우 등)을 기다리지 않고, 목록
+        # 페이지가 모두 처리된 단위를 끝냅니다.
+        released: List[ListUnit] = []
+        for unit in list(self.active.values()):
+            if unit.articles and not unit.pending:
+                unit.articles.clear()
+                del self.active[unit.key]
+                released.append(unit)
+        return released
+
+    def finish_unit(self, key: UnitKey) -> bool:
+        # 요청할 목록 페이지가 없는 단위(체크포인트로 모두 완료된 경우 등)를 바로 끝냅니다.
+        return self.active.pop(key, None) is not None
+
+    @property
+    def done(self) -> bool:
+        return self.exhausted and not self.active
@@ -1,15 +1,50 @@
-from dataclasses import dataclass
-from typing import List
+import sys
+from dataclasses import dataclass, fields
+from typing import Dict, List, Optional, Tuple
 
 
-@dataclass
+def slotted(cls: type) -> type:
+    """
+    dataclass 를 __dict__ 없이 __slots__ 만 사용하는 클래스로 다시 만듭니다.
+    (Python 3.10 의 dataclass(slots=True) 와 같은 역할)
+    """
+    field_names: Tuple[str, ...] = tuple(field.name for field in fields(cls))
+    cls_dict: Dict = dict(cls.__dict__)
+    cls_dict["__slots__"] = field_names
+    for name in field_names:
+        # 기본값은 __init__ 에 이미 반영되어 있으므로 클래스 속성에서 제거합니다.
+        cls_dict.pop(name, None)
+    cls_dict.pop("__dict__", None)
+    cls_dict.pop("__weakref__", None)
+
+    def __getstate__(self) -> Tuple:
+        return tuple(getattr(self, name) for name in field_names)
+
+    def __setstate__(self, state: Tuple) -> None:
+        # frozen dataclass 도 복원할 수 있도록 object.__setattr__ 를 사용합니다.
+        for name, value in zip(field_names, state):
+            object.__setattr__(self, name, value)
+
+    cls_dict["__getstate__"] = __getstate__
+    cls_dict["__setstate__"] = __setstate__
+    new_cls: type = type(cls)(cls.__name__, cls.__bases__, cls_dict)
+    new_cls.__qualname__ = cls.__qualname__
+    return new_cls
+
+
+@slotted
+@dataclass(frozen=True)
 class Author:
     id: str
     name: str
     oid: str
     url: str
+    # 기자 페이지(url)에서 가져온 정보 (JOURNALIST_PROFILE_ENABLED)
+    description: Optional[str] = None
+    image_url: Optional[str] = None
 
 
+@slotted
 @dataclass
 class News:
     """
@@ -28,3 +63,67 @@ class News:
     edited_time: str  # 뉴스 수정 날짜 (미 수정 시 upload_date 와 동일)
     press: str  # 언론사
     authors: List[Author]  # 기자
+    # 본문이 거의 같은 기사 묶음의 대표 기사 "{oid}_{aid}"
+    cluster_id: Optional[str] = None
+
+
+@slotted
+@dataclass
+class Headline:
+    """
+    기사 페이지를 요청하지 않고 목록 페이지에서 얻은 기사 정보 (headline_only)
+    """
+
+    oid: str  # 언론사 고유 ID
+    aid: str  # 뉴스 고유 ID
+    title: str  # 뉴스 제목
+    press: str  # 언론사
+    url: str  # 뉴스 URL
+    date: str  # 목록 날짜 (%Y%m%d)
+    list_time: str  # 목록에 표시된 시각 (변환할 수 없으면 표시된 문자열 그대로)
+    sid1: Optional[str] = None  # 목록의 1분류 ID (NewsSpider 는 None)
+
+
+def intern_str(string: Optional[str]) -> Optional[str]:
+    return sys.intern(string) if string else string
+
+
+class AuthorTable:
+    """
+    (oid, id) 별로 하나의 Author 인스턴스만 만들어 여러 기사에서 공유하는 테이블
+
+    Author 는 frozen 이므로 공유해도 안전하며, 이름이 바뀐 경우에만 새로 만듭니다.
+    """
+
+    def __init__(self, url_fmt: str, max_size: int = 100000):
+        self.url_fmt: str = url_fmt
+        self.max_size: int = max_size
+        self.authors: Dict[Tuple[str, str], Author] = {}
+
+    def __len__(self) -> int:
+        return len(self.authors)
+
+    def get(self, oid: str, author_id: str, name: str) -> Author:
+        author: Optional[Author] = self.authors.get((oid, author_id))
+        if author is None or author.name != name:
+            author = Author(
+                id=intern_str(author_id),
+                name=intern_str(name),
+                oid=intern_str(oid),
+                url=self.url_fmt.format(office_id=oid, author_id=author_id),
+            )
+            self.add(author)
+        return author
+
+    def add(self, author: Author) -> None:
+        if len(self.authors) >= self.max_size:
+            self.authors.clear()
+        self.authors[(author.oid, author.id)] = author
+
+    def intern(self, author: Author) -> Author:
+        # 다른 프로세스에서 만들어진 Author 를 테이블의 인스턴스로 바꿉니다.
+        interned: Optional[Author] = self.authors.get((author.oid, author.id))
+        if interned is not None and interned == author:
+            return interned
+        self.add(author)
+        return author
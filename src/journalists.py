@@ -0,0 +1,87 @@
+import sqlite3
+import time
+from typing import Dict, Optional
+
+from src.items import Author
+
+
+class JournalistProfileCache:
+    """
+    (oid, id) 별 기자 페이지 정보를 저장하는 SQLite 캐시
+
+    저장한 지 ttl 초가 지난 정보는 없는 것으로 취급하여 다시 요청하도록 합니다.
+    """
+
+    def __init__(
+        self, path: str, ttl: float = 7 * 24 * 3600, commit_interval: int = 100
+    ):
+        self.path: str = path
+        self.ttl: float = ttl
+        self.commit_interval: int = commit_interval
+        self._uncommitted: int = 0
+        self.conn: sqlite3.Connection = sqlite3.connect(path)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS journalist ("
+            "oid TEXT NOT NULL, "
+            "id TEXT NOT NULL, "
+            "name TEXT, "
+            "url TEXT, "
+            "description TEXT, "
+            "image_url TEXT, "
+            "fetched_at REAL NOT NULL, "
+            "PRIMARY KEY (oid, id)"
+            ") WITHOUT ROWID"
+        )
+        self.conn.commit()
+        # 한 번 읽은 정보는 다시 조회하지 않도록 메모리에도 보관합니다.
+        self.authors: Dict[tuple, Optional[Author]] = {}
+
+    def get(self, oid: str, author_id: str) -> Optional[Author]:
+        key: tuple = (oid, author_id)
+        if key not in self.authors:
+            row: Optional[tuple] = self.conn.execute(
+                "SELECT name, url, description, image_url, fetched_at "
+                "FROM journalist WHERE oid = ? AND id = ?",
+                key,
+            ).fetchone()
+            author: Optional[Author] = None
+            if row is not None and time.time() - row[4] < self.ttl:
+                author = Author(
+                    id=author_id,
+                    name=row[0],
+                    oid=oid,
+                    url=row[1],
+                    description=row[2],
+                    image_url=row[3],
+                )
+            self.authors[key] = author
+        return self.authors[key]
+
+    def add(self, author: Author) -> None:
+        self.authors[(author.oid, author.id)] = author
+        self.conn.execute(
+            "INSERT OR REPLACE INTO journalist "
+            "(oid, id, name, url, description, image_url, fetched_at) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (
+                author.oid,
+                author.id,
+                author.name,
+                author.url,
+                author.description,
+                author.image_url,
+                time.time(),
+            ),
+        )
+        self._uncommitted += 1
+        if self._uncommitted >= self.commit_interval:
+            self.commit()
+
+    def commit(self) -> None:
+        self.conn.commit()
+        self._uncommitted = 0
+
+    def close(self) -> None:
+        self.commit()
+        self.conn.close()
@@ -0,0 +1,220 @@
+import bisect
+import cProfile
+import os
+import time
+import tracemalloc
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional, Tuple
+
+# 단계별 소요 시간 히스토그램의 구간 상한 (초)
+DEFAULT_BUCKETS: Tuple[float, ...] = (
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+    30.0,
+)
+
+# (spider, sid, stage)
+MetricKey = Tuple[str, str, str]
+
+
+class Histogram:
+    """
+    Prometheus 의 histogram 과 같이 구간별 관측 횟수와 합계를 유지합니다.
+    """
+
+    def __init__(self, buckets: Tuple[float, ...] = DEFAULT_BUCKETS):
+        self.buckets: Tuple[float, ...] = buckets
+        # 마지막 칸은 가장 큰 상한을 넘는 관측(+Inf) 입니다.
+        self.counts: List[int] = [0] * (len(buckets) + 1)
+        self.count: int = 0
+        self.sum: float = 0.0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    def iter_cumulative(self) -> Iterator[Tuple[str, int]]:
+        cumulative: int = 0
+        for bound, count in zip(self.buckets, self.counts):
+            cumulative += count
+            yield format(bound, "g"), cumulative
+        yield "+Inf", self.count
+
+    def quantile(self, ratio: float) -> float:
+        # 관측값 대신 해당 관측이 속한 구간의 상한을 돌려줍니다.
+        if not self.count:
+            return 0.0
+        rank: float = self.count * ratio
+        cumulative: int = 0
+        for bound, count in zip(self.buckets, self.counts):
+            cumulative += count
+            if cumulative >= rank:
+                return bound
+        return float("inf")
+
+
+class StageMetrics:
+    """
+    spider / sid / 수집 단계별 소요 시간 히스토그램 모음
+
+    단계: list_download, extract_article_links, article_download,
+    extract_article_item, extract_author_item, pipeline_write
+    """
+
+    def __init__(self, buckets: Tuple[float, ...] = DEFAULT_BUCKETS):
+        self.buckets: Tuple[float, ...] = buckets
+        self.histograms: Dict[MetricKey, Histogram] = {}
+
+    def observe(
+        self, stage: str, spider: str, sid: Optional[str], seconds: float
+    ) -> None:
+        key: MetricKey = (spider, sid or "all", stage)
+        histogram: Optional[Histogram] = self.histograms.get(key)
+        if histogram is None:
+            histogram = self.histograms[key] = Histogram(self.buckets)
+        histogram.observe(seconds)
+
+    @contextmanager
+    def time(self, stage: str, spider: str, sid: Optional[str]) -> Iterator[None]:
+        start: float = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(stage, spider, sid, time.perf_counter() - start)
+
+    def to_prometheus(self, name: str = "naver_news_stage_seconds") -> str:
+        lines: List[str] = [
+            f"# HELP {name} Time spent in each crawl stage.",
+            f"# TYPE {name} histogram",
+        ]
+        for (spider, sid, stage), histogram in sorted(self.histograms.items()):
+            labels: str = f'spider="{spider}",sid="{sid}",stage="{stage}"'
+            for bound, count in histogram.iter_cumulative():
+                lines.append(f'{name}_bucket{{{labels},le="{bound}"}} {count}')
+            lines.append(f"{name}_sum{{{labels}}} {histogram.sum}")
+            lines.append(f"{name}_count{{{labels}}} {histogram.count}")
+        return "\n".join(lines) + "\n"
+
+    def to_stats(self, prefix: str = "stage_metrics") -> Dict[str, float]:
+        stats: Dict[str, float] = {}
+        for (spider, sid, stage), histogram in self.histograms.items():
+            key: str = f"{prefix}/{spider}/{sid}/{stage}"
+            stats[f"{key}/count"] = histogram.count
+            stats[f"{key}/sum"] = round(histogram.sum, 6)
+            stats[f"{key}/p50"] = histogram.quantile(0.5)
+            stats[f"{key}/p99"] = histogram.quantile(0.99)
+        return stats
+
+
+def format_folded_stacks(
+    snapshot: tracemalloc.Snapshot, base: Optional[tracemalloc.Snapshot] = None
+) -> str:
+    """
+    tracemalloc snapshot 을 flamegraph.pl / speedscope 에서 읽을 수 있는
+    "frame;frame;frame size" 형식으로 바꿉니다.
+    base 가 주어지면 base 이후에 늘어난 할당만 기록합니다.
+    """
+    stacks: List[Tuple[tracemalloc.Traceback, int]] = (
+        [(stat.traceback, stat.size) for stat in snapshot.statistics("traceback")]
+        if base is None
+        else [
+            (stat.traceback, stat.size_diff)
+            for stat in snapshot.compare_to(base, "traceback")
+            if stat.size_diff > 0
+        ]
+    )
+    lines: List[str] = []
+    for traceback, size in stacks:
+        # traceback 은 가장 최근 프레임이 앞에 있으므로 뒤집어서 바깥 호출부터 기록합니다.
+        frames: List[str] = [
+            f"{os.path.basename(frame.filename)}:{frame.lineno}"
+            for frame in reversed(traceback)
+        ]
+        lines.append(f"{';'.join(frames)} {size}")
+    return "\n".join(lines) + "\n"
+
+
+class StageProfiler:
+    """
+    기사 콜백 N 번마다 한 번씩 cProfile 로 프로파일하거나 tracemalloc snapshot 을 기록합니다.
+
+    cprofile: 샘플링한 콜백을 하나의 프로파일에 누적하여 종료 시 {spider}.prof 로 저장합니다.
+    (snakeviz, flameprof 등으로 flame graph 를 그릴 수 있습니다)
+    tracemalloc: N 번째 콜백마다 {spider}-{n}.folded 파일로 메모리 할당 스택을 저장합니다.
+    추적은 샘플링한 콜백 동안에만 켜며, 파일에는 그 콜백이 할당하여 남아 있는 메모리만 기록합니다.
+    (이미 추적 중이면 콜백 전후 snapshot 의 차이를 기록합니다)
+    """
+
+    modes: Tuple[str, ...] = ("cprofile", "tracemalloc")
+
+    def __init__(self, mode: str, path: str, every: int = 100, frames: int = 32):
+        if mode not in self.modes:
+            raise ValueError(f"Unknown profiler mode: {mode}")
+        self.mode: str = mode
+        self.path: str = path
+        self.every: int = max(every, 1)
+        self.frames: int = frames
+        self.calls: int = 0
+        self.profile: Optional[cProfile.Profile] = None
+
+    def start(self) -> None:
+        os.makedirs(self.path, exist_ok=True)
+        if self.mode == "cprofile":
+            self.profile = cProfile.Profile()
+
+    @contextmanager
+    def sample(self, spider: str) -> Iterator[None]:
+        self.calls += 1
+        if self.calls % self.every:
+            yield
+            return
+        if self.mode == "cprofile":
+            self.profile.enable()
+            try:
+                yield
+            finally:
+                self.profile.disable()
+        elif tracemalloc.is_tracing():
+            base: tracemalloc.Snapshot = tracemalloc.take_snapshot()
+            try:
+                yield
+            finally:
+                self.dump_snapshot(spider, tracemalloc.take_snapshot(), base)
+        else:
+            tracemalloc.start(self.frames)
+            try:
+                yield
+            finally:
+                snapshot: tracemalloc.Snapshot = tracemalloc.take_snapshot()
+                tracemalloc.stop()
+                self.dump_snapshot(spider, snapshot)
+
+    def dump_snapshot(
+        self,
+        spider: str,
+        snapshot: tracemalloc.Snapshot,
+        base: Optional[tracemalloc.Snapshot] = None,
+    ) -> str:
+        path: str = os.path.join(self.path, f"{spider}-{self.calls}.folded")
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(format_folded_stacks(snapshot, base))
+        return path
+
+    def stop(self, spider: str) -> Optional[str]:
+        if self.mode == "cprofile":
+            path: str = os.path.join(self.path, f"{spider}.prof")
+            self.profile.dump_stats(path)
+            return path
+        return None
@@ -0,0 +1,505 @@
+import logging
+import random
+import time
+import zlib
+from dataclasses import dataclass
+from email.utils import parsedate_to_datetime
+from typing import Optional, Tuple, Dict, List, Iterable, Generator, Set, Union
+from weakref import WeakKeyDictionary
+
+from scrapy import Request, Spider, signals
+from scrapy.core.downloader import Slot
+from scrapy.core.downloader.handlers.http11 import TunnelError
+from scrapy.crawler import Crawler
+from scrapy.downloadermiddlewares.retry import get_retry_request
+from scrapy.exceptions import IgnoreRequest, NotConfigured, StopDownload
+from scrapy.http import Headers, Response
+from scrapy.statscollectors import StatsCollector
+from scrapy.utils.response import response_status_message
+from twisted.internet import defer
+from twisted.internet.error import (
+    ConnectError,
+    ConnectionDone,
+    ConnectionLost,
+    ConnectionRefusedError,
+    DNSLookupError,
+    TCPTimedOutError,
+    TimeoutError,
+)
+from twisted.web.client import ResponseFailed
+
+from src.extractors import ArticleStreamScanner
+from src.items import News, Author
+from src.journalists import JournalistProfileCache
+from src.seen import SeenArticleIndex, SeenArticle
+from src.utils import normalize_dt_str, get_header_str
+
+logger: logging.Logger = logging.getLogger(__name__)
+
+
+class SeenArticleMiddleware:
+    """
+    이전 실행에서 이미 수집한 기사 요청을 다운로드 전에 버리는 Downloader Middleware
+
+    기사 요청의 meta["oaid"] 를 키로 사용하며, 아래 경우에는 다시 수집합니다.
+    - meta["refresh"] 가 참인 요청
+    - 저장된 수정 시각이 refresh_since (spider 인자 또는 SEEN_INDEX_REFRESH_SINCE) 이후인 기사
+    """
+
+    def __init__(
+        self,
+        index: SeenArticleIndex,
+        stats: StatsCollector,
+        refresh_since: Optional[str] = None,
+    ):
+        self.index: SeenArticleIndex = index
+        self.stats: StatsCollector = stats
+        self.refresh_since: Optional[str] = refresh_since
+
+    @classmethod
+    def from_crawler(cls, crawler: Crawler) -> "SeenArticleMiddleware":
+        if not crawler.settings.getbool("SEEN_INDEX_ENABLED"):
+            raise NotConfigured
+        middleware: SeenArticleMiddleware = cls(
+            SeenArticleIndex(
+                crawler.settings.get("SEEN_INDEX_PATH", "seen_articles.sqlite3")
+            ),
+            crawler.stats,
+            crawler.settings.get("SEEN_INDEX_REFRESH_SINCE"),
+        )
+        crawler.signals.connect(middleware.spider_opened, signal=signals.spider_opened)
+        crawler.signals.connect(middleware.item_scraped, signal=signals.item_scraped)
+        crawler.signals.connect(middleware.spider_closed, signal=signals.spider_closed)
+        return middleware
+
+    def spider_opened(self, spider: Spider) -> None:
+        refresh_since: Optional[str] = getattr(spider, "refresh_since", None)
+        if refresh_since:
+            self.refresh_since = refresh_since
+        if self.refresh_since:
+            self.refresh_since = normalize_dt_str(self.refresh_since)
+
+    def process_request(self, request: Request, spider: Spider) -> None:
+        oaid: Optional[Tuple[str, str]] = request.meta.get("oaid")
+        if not oaid or request.meta.get("refresh"):
+            return None
+        record: Optional[SeenArticle] = self.index.get(*oaid)
+        if record is None:
+            return None
+        if self.refresh_since and (record.edited_time or "") >= self.refresh_since:
+            self.stats.inc_value("seen_index/refreshed")
+            return None
+        self.stats.inc_value("seen_index/skipped")
+        raise IgnoreRequest(f"Already scraped article {oaid}")
+
+    def item_scraped(self, item: News, response: Response, spider: Spider) -> None:
+        if isinstance(item, News):
+            self.index.add_item(
+                item,
+                etag=get_header_str(response, "ETag"),
+                last_modified=get_header_str(response, "Last-Modified"),
+            )
+
+    def spider_closed(self, spider: Spider) -> None:
+        self.index.close()
+
+
+class JournalistProfileMiddleware:
+    """
+    기사의 기자 페이지를 (oid, id) 별로 JOURNALIST_PROFILE_TTL 마다 한 번만 요청하는 Spider Middleware
+
+    캐시에 있는 기자는 기사의 Author 를 캐시의 정보로 바꾸고, 없는 기자는 기사 요청보다 낮은
+    JOURNALIST_PROFILE_PRIORITY 로 기자 페이지를 요청합니다. 기자 페이지의 Author 는 캐시에 저장한
+    뒤 item 으로 내보내므로, 저장소에는 기자 정보가 갱신되어 기록됩니다.
+    """
+
+    def __init__(
+        self, cache: JournalistProfileCache, stats: StatsCollector, priority: int = -100
+    ):
+        self.cache: JournalistProfileCache = cache
+        self.stats: StatsCollector = stats
+        self.priority: int = priority
+        # 이번 실행에서 이미 요청한 기자
+        self.requested: Set[Tuple[str, str]] = set()
+
+    @classmethod
+    def from_crawler(cls, crawler: Crawler) -> "JournalistProfileMiddleware":
+        if not crawler.settings.getbool("JOURNALIST_PROFILE_ENABLED"):
+            raise NotConfigured
+        middleware: JournalistProfileMiddleware = cls(
+            JournalistProfileCache(
+                crawler.settings.get("JOURNALIST_PROFILE_PATH", "journalists.sqlite3"),
+                crawler.settings.getfloat("JOURNALIST_PROFILE_TTL", 7 * 24 * 3600),
+            ),
+            crawler.stats,
+            crawler.settings.getint("JOURNALIST_PROFILE_PRIORITY", -100),
+        )
+        crawler.signals.connect(middleware.spider_closed, signal=signals.spider_closed)
+        return middleware
+
+    def process_spider_output(
+        self, response: Response, result: Iterable, spider: Spider
+    ) -> Generator:
+        for item in result:
+            if isinstance(item, News):
+                item.authors = [
+                    self.get_author(author, spider) for author in item.authors
+                ]
+                yield item
+                for author in item.authors:
+                    if author.description is None and author.image_url is None:
+                        yield from self.make_profile_request(author, spider)
+            elif isinstance(item, Author):
+                self.cache.add(item)
+                spider.author_table.add(item)
+                self.stats.inc_value("journalist_profile/fetched")
+                yield item
+            else:
+                yield item
+
+    def get_author(self, author: Author, spider: Spider) -> Author:
+        cached: Optional[Author] = self.cache.get(author.oid, author.id)
+        if cached is None:
+            return author
+        self.stats.inc_value("journalist_profile/cache_hit")
+        if cached.name != author.name:
+            # 이름이 바뀐 경우 기사의 이름을 유지합니다.
+            cached = Author(
+                id=author.id,
+                name=author.name,
+                oid=author.oid,
+                url=author.url,
+                description=cached.description,
+                image_url=cached.image_url,
+            )
+        return spider.author_table.intern(cached)
+
+    def make_profile_request(
+        self, author: Author, spider: Spider
+    ) -> Generator[Request, None, None]:
+        key: Tuple[str, str] = (author.oid, author.id)
+        if key in self.requested or self.cache.get(*key) is not None:
+            return
+        self.requested.add(key)
+        self.stats.inc_value("journalist_profile/requested")
+        yield Request(
+            author.url,
+            callback=spider.parse_profile,
+            priority=self.priority,
+            meta={"author": author},
+        )
+
+    def spider_closed(self, spider: Spider) -> None:
+        self.cache.close()
+
+
+class StreamingStopMiddleware:
+    """
+    기사 응답을 받는 중에 extract_article_item 이 사용하는 부분(ArticleStreamScanner)이 모두
+    도착하면 나머지(댓글, 추천 기사, 스크립트 등)를 받지 않고 응답을 끝내는 Downloader Middleware
+
+    받는 중에 내용을 확인할 수 있도록 기사 요청(meta["oaid"])은 gzip 압축만 허용하며,
+    STREAMING_STOP_MAX_BYTES 이상 받은 응답도 그 자리에서 끝냅니다.
+    """
+
+    def __init__(self, stats: StatsCollector, max_bytes: int = 2 * 1024 * 1024):
+        self.stats: StatsCollector = stats
+        self.max_bytes: int = max_bytes
+        # 확인할 수 없는 압축 방식이면 scanner 는 None 이며, 받은 크기만 확인합니다.
+        self.scanners: "WeakKeyDictionary[Request, Optional[ArticleStreamScanner]]" = (
+            WeakKeyDictionary()
+        )
+        self.received: "WeakKeyDictionary[Request, int]" = WeakKeyDictionary()
+
+    @classmethod
+    def from_crawler(cls, crawler: Crawler) -> "StreamingStopMiddleware":
+        if not crawler.settings.getbool("STREAMING_STOP_ENABLED"):
+            raise NotConfigured
+        middleware: StreamingStopMiddleware = cls(
+            crawler.stats,
+            crawler.settings.getint("STREAMING_STOP_MAX_BYTES", 2 * 1024 * 1024),
+        )
+        crawler.signals.connect(
+            middleware.headers_received, signal=signals.headers_received
+        )
+        crawler.signals.connect(
+            middleware.bytes_received, signal=signals.bytes_received
+        )
+        return middleware
+
+    def process_request(self, request: Request, spider: Spider) -> None:
+        if "oaid" in request.meta:
+            request.headers[b"Accept-Encoding"] = b"gzip"
+            request.meta["streaming_stop"] = True
+        return None
+
+    def headers_received(
+        self, headers: Headers, body_length: int, request: Request, spider: Spider
+    ) -> None:
+        if not request.meta.get("streaming_stop"):
+            return
+        encoding: bytes = (headers.get(b"Content-Encoding") or b"").lower()
+        self.scanners[request] = (
+            ArticleStreamScanner(gzipped=encoding in (b"gzip", b"x-gzip"))
+            if encoding in (b"", b"identity", b"gzip", b"x-gzip")
+            else None
+        )
+        self.received[request] = 0
+        if body_length and body_length > 0:
+            request.meta["streaming_stop_length"] = body_length
+
+    def bytes_received(self, data: bytes, request: Request, spider: Spider) -> None:
+        if request not in self.received:
+            return
+        received: int = self.received[request] + len(data)
+        self.received[request] = received
+        scanner: Optional[ArticleStreamScanner] = self.scanners[request]
+        complete: bool = False
+        if scanner is not None:
+            try:
+                complete = scanner.feed(data)
+            except zlib.error:
+                self.scanners[request] = None
+        if complete or received >= self.max_bytes:
+            self.stop(request, received, capped=not complete)
+
+    def stop(self, request: Request, received: int, capped: bool) -> None:
+        del self.received[request]
+        del self.scanners[request]
+        self.stats.inc_value(
+            "streaming_stop/capped" if capped else "streaming_stop/stopped"
+        )
+        self.stats.inc_value("streaming_stop/bytes_received", received)
+        body_length: Optional[int] = request.meta.get("streaming_stop_length")
+        if body_length:
+            self.stats.inc_value(
+                "streaming_stop/bytes_skipped", max(0, body_length - received)
+            )
+        raise StopDownload(fail=False)
+
+    def process_response(
+        self, request: Request, response: Response, spider: Spider
+    ) -> Response:
+        # 끝까지 받은 응답
+        received: Optional[int] = self.received.pop(request, None)
+        self.scanners.pop(request, None)
+        if received is not None:
+            self.stats.inc_value("streaming_stop/bytes_received", received)
+        return response
+
+
+def parse_retry_after(value: Optional[bytes]) -> Optional[float]:
+    # Retry-After 헤더는 초 단위 숫자 또는 HTTP 날짜 형식입니다.
+    if not value:
+        return None
+    value: str = value.decode("latin-1").strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+# 서버의 부하 / 차단으로 볼 수 있는 연결 오류와 시간 초과 (IgnoreRequest 등은 제외)
+BACKOFF_EXCEPTIONS: Tuple = (
+    defer.TimeoutError,
+    TimeoutError,
+    DNSLookupError,
+    ConnectionRefusedError,
+    ConnectionDone,
+    ConnectError,
+    ConnectionLost,
+    TCPTimedOutError,
+    ResponseFailed,
+    TunnelError,
+)
+
+
+@dataclass
+class ThrottleState:
+    concurrency: float
+    delay: float
+    latency: Optional[float] = None  # 지수 이동 평균
+
+
+class AdaptiveThrottleMiddleware:
+    """
+    ADAPTIVE_THROTTLE_HOSTS 의 각 host(download slot)마다 동시 요청 수와 지연을 조절하는
+    Downloader Middleware
+
+    응답 지연이 ADAPTIVE_THROTTLE_TARGET_LATENCY 이하이고 상태가 정상이면 동시 요청 수를
+    조금씩 늘리고(additive increase), ADAPTIVE_THROTTLE_BACKOFF_HTTP_CODES 나 연결 오류를
+    받으면 동시 요청 수를 절반으로 줄이고 지연을 늘립니다(multiplicative decrease).
+    Retry-After 헤더가 있으면 그 이상 기다립니다.
+
+    RETRY_HTTP_CODES 에 없는 backoff 상태(403 / 429)는 RetryMiddleware 대신 여기서 최대
+    ADAPTIVE_THROTTLE_RETRY_TIMES 번 다시 요청하며, 다시 요청한 요청은 늘어난 지연을 기다립니다.
+    모든 host 의 동시 요청 수 합은 CONCURRENT_REQUESTS 를 넘을 수 없으므로, host 별 최대
+    동시 요청 수는 CONCURRENT_REQUESTS / host 수 로 제한됩니다.
+    """
+
+    def __init__(
+        self,
+        crawler: Crawler,
+        hosts: List[str],
+        start_concurrency: float,
+        max_concurrency: float,
+        min_delay: float,
+        start_delay: float,
+        max_delay: float,
+        target_latency: float,
+        backoff_http_codes: List[int],
+        retry_http_codes: Iterable[int] = (),
+        retry_times: int = 2,
+    ):
+        self.crawler: Crawler = crawler
+        self.stats: StatsCollector = crawler.stats
+        self.hosts: List[str] = hosts
+        self.start_concurrency: float = start_concurrency
+        self.max_concurrency: float = max_concurrency
+        self.min_delay: float = min_delay
+        self.start_delay: float = start_delay
+        self.max_delay: float = max_delay
+        self.target_latency: float = target_latency
+        self.backoff_http_codes: List[int] = backoff_http_codes
+        # RetryMiddleware 가 재시도하지 않는 backoff 상태만 직접 다시 요청합니다.
+        self.retry_http_codes: Set[int] = set(backoff_http_codes) - set(
+            retry_http_codes
+        )
+        self.retry_times: int = retry_times
+        self.states: Dict[str, ThrottleState] = {}
+
+    @classmethod
+    def from_crawler(cls, crawler: Crawler) -> "AdaptiveThrottleMiddleware":
+        settings = crawler.settings
+        if not settings.getbool("ADAPTIVE_THROTTLE_ENABLED"):
+            raise NotConfigured
+        hosts: List[str] = settings.getlist(
+            "ADAPTIVE_THROTTLE_HOSTS",
+            ["news.naver.com", "n.news.naver.com", "media.naver.com"],
+        )
+        max_concurrency: float = settings.getfloat(
+            "ADAPTIVE_THROTTLE_MAX_CONCURRENCY", 32
+        )
+        # Downloader 는 모든 slot 의 동시 요청 수 합을 CONCURRENT_REQUESTS 로 제한합니다.
+        total_concurrency: int = settings.getint("CONCURRENT_REQUESTS")
+        if max_concurrency * len(hosts) > total_concurrency:
+            clamped: float = float(max(1, total_concurrency // max(1, len(hosts))))
+            logger.warning(
+                f"ADAPTIVE_THROTTLE_MAX_CONCURRENCY({max_concurrency:g}) x "
+                f"{len(hosts)} hosts exceeds CONCURRENT_REQUESTS({total_concurrency}), "
+                f"clamped to {clamped:g}. Raise CONCURRENT_REQUESTS to at least "
+                f"{int(max_concurrency * len(hosts))} to allow it."
+            )
+            max_concurrency = clamped
+        return cls(
+            crawler,
+            hosts,
+            min(
+                settings.getfloat("ADAPTIVE_THROTTLE_START_CONCURRENCY", 2),
+                max_concurrency,
+            ),
+            max_concurrency,
+            settings.getfloat("ADAPTIVE_THROTTLE_MIN_DELAY", 0),
+            settings.getfloat("DOWNLOAD_DELAY"),
+            settings.getfloat("ADAPTIVE_THROTTLE_MAX_DELAY", 60),
+            settings.getfloat("ADAPTIVE_THROTTLE_TARGET_LATENCY", 2),
+            [
+                int(code)
+                for code in settings.getlist(
+                    "ADAPTIVE_THROTTLE_BACKOFF_HTTP_CODES",
+                    [403, 429, 500, 502, 503, 504],
+                )
+            ],
+            (
+                [int(code) for code in settings.getlist("RETRY_HTTP_CODES")]
+                if settings.getbool("RETRY_ENABLED", True)
+                else []
+            ),
+            settings.getint("ADAPTIVE_THROTTLE_RETRY_TIMES", 2),
+        )
+
+    def get_state(self, key: Optional[str]) -> Optional[ThrottleState]:
+        if key not in self.hosts:
+            return None
+        if key not in self.states:
+            self.states[key] = ThrottleState(self.start_concurrency, self.start_delay)
+        return self.states[key]
+
+    def increase(self, state: ThrottleState) -> None:
+        # 동시 요청 수 만큼의 정상 응답마다 1 씩 늘어납니다.
+        state.concurrency = min(
+            self.max_concurrency, state.concurrency + 1 / state.concurrency
+        )
+        state.delay = max(self.min_delay, state.delay * 0.9)
+
+    def backoff(self, state: ThrottleState, retry_after: Optional[float]) -> None:
+        state.concurrency = max(1.0, state.concurrency / 2)
+        delay: float = max(state.delay * 2, 1.0) * random.uniform(1.0, 1.5)
+        if retry_after is not None:
+            delay = max(delay, retry_after)
+        state.delay = min(self.max_delay, delay)
+
+    def apply(self, key: str, state: ThrottleState) -> None:
+        slot: Optional[Slot] = self.crawler.engine.downloader.slots.get(key)
+        if slot is not None:
+            slot.concurrency = int(state.concurrency)
+            slot.delay = state.delay
+        # 초당 요청 수 추정치: 동시 요청 수 / max(지연, 응답 시간)
+        rate: float = int(state.concurrency) / max(
+            state.delay, state.latency or 0, 1e-3
+        )
+        self.stats.set_value(
+            f"adaptive_throttle/{key}/concurrency", int(state.concurrency)
+        )
+        self.stats.set_value(f"adaptive_throttle/{key}/delay", round(state.delay, 3))
+        self.stats.set_value(f"adaptive_throttle/{key}/rate", round(rate, 3))
+
+    def process_response(
+        self, request: Request, response: Response, spider: Spider
+    ) -> Union[Request, Response]:
+        key: Optional[str] = request.meta.get("download_slot")
+        state: Optional[ThrottleState] = self.get_state(key)
+        if state is None:
+            return response
+        latency: Optional[float] = request.meta.get("download_latency")
+        if latency is not None:
+            state.latency = (
+                latency
+                if state.latency is None
+                else 0.8 * state.latency + 0.2 * latency
+            )
+        if response.status in self.backoff_http_codes:
+            self.backoff(state, parse_retry_after(response.headers.get("Retry-After")))
+            self.stats.inc_value(f"adaptive_throttle/{key}/backoff")
+        elif response.status < 400 and (
+            latency is None or latency <= self.target_latency
+        ):
+            self.increase(state)
+        self.apply(key, state)
+        if response.status in self.retry_http_codes and not request.meta.get(
+            "dont_retry"
+        ):
+            # 다시 요청한 요청은 같은 slot 의 늘어난 지연을 기다린 뒤 다운로드됩니다.
+            retry_request: Optional[Request] = get_retry_request(
+                request,
+                spider=spider or self.crawler.spider,
+                reason=response_status_message(response.status),
+                max_retry_times=request.meta.get("max_retry_times", self.retry_times),
+                stats_base_key="adaptive_throttle/retry",
+            )
+            if retry_request is not None:
+                return retry_request
+        return response
+
+    def process_exception(
+        self, request: Request, exception: Exception, spider: Spider
+    ) -> None:
+        key: Optional[str] = request.meta.get("download_slot")
+        state: Optional[ThrottleState] = self.get_state(key)
+        if state is not None and isinstance(exception, BACKOFF_EXCEPTIONS):
+            self.backoff(state, None)
+            self.stats.inc_value(f"adaptive_throttle/{key}/backoff")
+            self.apply(key, state)
+        return None
@@ -0,0 +1,224 @@
+import sqlite3
+import zlib
+from array import array
+from collections import OrderedDict
+from typing import Dict, List, Optional, Set, Tuple
+
+from scrapy import Spider
+from scrapy.crawler import Crawler
+from scrapy.exceptions import NotConfigured
+
+from src.items import News
+
+Signature = Tuple[int, ...]
+BandKey = Tuple[int, int]
+
+MAX_HASH: int = 2**32 - 1
+
+
+def iter_shingles(text: str, size: int = 3) -> List[str]:
+    # 띄어쓰기 단위 size 개 단어의 묶음으로, 언론사별 줄바꿈 / 공백 차이는 무시됩니다.
+    words: List[str] = text.split()
+    if len(words) < size:
+        return [" ".join(words)] if words else []
+    return [" ".join(words[i : i + size]) for i in range(len(words) - size + 1)]
+
+
+def get_minhash(text: str, num_perm: int = 64, shingle_size: int = 3) -> Signature:
+    """
+    one permutation MinHash: 각 shingle 을 한 번만 hash 하여 상위 비트로 칸을 정하고,
+    칸마다 최솟값을 남깁니다. 빈 칸은 오른쪽의 채워진 칸 값으로 채웁니다. (densification)
+
+    shingle 이 없으면 빈 tuple 을 돌려줍니다.
+    """
+    shingles: List[str] = iter_shingles(text, shingle_size)
+    if not shingles:
+        return ()
+    bin_bits: int = (num_perm - 1).bit_length()
+    shift: int = 32 - bin_bits
+    value_mask: int = (1 << shift) - 1
+    mins: List[int] = [MAX_HASH] * num_perm
+    for shingle in shingles:
+        hashed: int = zlib.crc32(shingle.encode("utf-8"))
+        index: int = (hashed >> shift) % num_perm
+        value: int = hashed & value_mask
+        if value < mins[index]:
+            mins[index] = value
+    for index in range(num_perm):
+        if mins[index] != MAX_HASH:
+            continue
+        for offset in range(1, num_perm):
+            filled: int = mins[(index + offset) % num_perm]
+            if filled != MAX_HASH:
+                # 어느 칸에서 가져왔는지에 따라 값이 달라지도록 offset 을 섞습니다.
+                mins[index] = filled + offset * (value_mask + 1)
+                break
+    return tuple(mins)
+
+
+def get_similarity(signature: Signature, other: Signature) -> float:
+    if not signature or len(signature) != len(other):
+        return 0.0
+    return sum(a == b for a, b in zip(signature, other)) / len(signature)
+
+
+class NearDuplicateIndex:
+    """
+    MinHash 서명을 bands 개의 묶음으로 나눈 LSH 인덱스
+
+    같은 묶음 값을 가진 클러스터 대표 기사와 유사도가 threshold 이상이면 같은 클러스터로 판단합니다.
+    묶음 수만큼만 조회하므로 기사당 처리 비용은 인덱스 크기와 무관하며, max_size 를 넘으면 가장
+    오래된 클러스터부터 제거합니다. path 를 지정하면 클러스터 대표 서명을 SQLite 에 저장합니다.
+    """
+
+    def __init__(
+        self,
+        num_perm: int = 64,
+        bands: int = 16,
+        threshold: float = 0.8,
+        max_size: int = 1000000,
+        path: Optional[str] = None,
+    ):
+        if num_perm % bands:
+            raise ValueError(f"num_perm {num_perm} must be divisible by bands {bands}")
+        self.num_perm: int = num_perm
+        self.bands: int = bands
+        self.rows: int = num_perm // bands
+        self.threshold: float = threshold
+        self.max_size: int = max_size
+        self.clusters: "OrderedDict[str, Signature]" = OrderedDict()
+        self.buckets: Dict[BandKey, str] = {}
+        self.new_clusters: List[Tuple[str, Signature]] = []
+        self.conn: Optional[sqlite3.Connection] = None
+        if path:
+            self.conn = sqlite3.connect(path)
+            self.conn.execute(
+                "CREATE TABLE IF NOT EXISTS cluster "
+                "(cluster_id TEXT PRIMARY KEY, signature BLOB NOT NULL)"
+            )
+            for cluster_id, blob in self.conn.execute(
+                "SELECT cluster_id, signature FROM cluster ORDER BY rowid"
+            ):
+                signature: Signature = tuple(array("Q", blob))
+                if len(signature) == num_perm:
+                    self.add(cluster_id, signature, persist=False)
+
+    def __len__(self) -> int:
+        return len(self.clusters)
+
+    def get_band_keys(self, signature: Signature) -> List[BandKey]:
+        return [
+            (band, hash(signature[band * self.rows : (band + 1) * self.rows]))
+            for band in range(self.bands)
+        ]
+
+    def query(self, signature: Signature) -> Optional[str]:
+        checked: Set[str] = set()
+        for band_key in self.get_band_keys(signature):
+            cluster_id: Optional[str] = self.buckets.get(band_key)
+            if cluster_id is None or cluster_id in checked:
+                continue
+            checked.add(cluster_id)
+            if get_similarity(signature, self.clusters[cluster_id]) >= self.threshold:
+                return cluster_id
+        return None
+
+    def add(self, cluster_id: str, signature: Signature, persist: bool = True) -> None:
+        if len(self.clusters) >= self.max_size:
+            self.evict()
+        self.clusters[cluster_id] = signature
+        for band_key in self.get_band_keys(signature):
+            # 이미 다른 클러스터가 있는 묶음은 먼저 만들어진 클러스터를 유지합니다.
+            self.buckets.setdefault(band_key, cluster_id)
+        if persist and self.conn is not None:
+            self.new_clusters.append((cluster_id, signature))
+            if len(self.new_clusters) >= 1000:
+                self.commit()
+
+    def evict(self) -> None:
+        cluster_id, signature = self.clusters.popitem(last=False)
+        for band_key in self.get_band_keys(signature):
+            if self.buckets.get(band_key) == cluster_id:
+                del self.buckets[band_key]
+
+    def get_or_add(self, cluster_id: str, signature: Signature) -> Tuple[str, bool]:
+        """
+        signature 와 유사한 클러스터의 id 와 True 를 돌려주고, 없으면 cluster_id 로 새 클러스터를
+        만들어 (cluster_id, False) 를 돌려줍니다.
+        """
+        found: Optional[str] = self.query(signature)
+        if found is not None:
+            return found, True
+        self.add(cluster_id, signature)
+        return cluster_id, False
+
+    def commit(self) -> None:
+        if self.conn is None or not self.new_clusters:
+            return
+        self.conn.executemany(
+            "INSERT OR REPLACE INTO cluster (cluster_id, signature) VALUES (?, ?)",
+            [
+                (cluster_id, array("Q", signature).tobytes())
+                for cluster_id, signature in self.new_clusters
+            ],
+        )
+        self.conn.commit()
+        self.new_clusters = []
+
+    def close(self) -> None:
+        self.commit()
+        if self.conn is not None:
+            self.conn.close()
+
+
+def get_cluster_id(item: News) -> str:
+    return f"{item.oid}_{item.aid}"
+
+
+class NearDuplicatePipeline:
+    """
+    본문이 거의 같은 기사(통신사 기사 전재 등)에 같은 cluster_id 를 지정하는 Item Pipeline
+
+    cluster_id 는 클러스터에서 처음 수집한 기사의 "{oid}_{aid}" 입니다.
+    """
+
+    def __init__(self, index: NearDuplicateIndex, shingle_size: int = 3):
+        self.index: NearDuplicateIndex = index
+        self.shingle_size: int = shingle_size
+        self.crawler: Optional[Crawler] = None
+
+    @classmethod
+    def from_crawler(cls, crawler: Crawler) -> "NearDuplicatePipeline":
+        if not crawler.settings.getbool("NEAR_DUPLICATE_ENABLED"):
+            raise NotConfigured
+        pipeline: NearDuplicatePipeline = cls(
+            NearDuplicateIndex(
+                num_perm=crawler.settings.getint("NEAR_DUPLICATE_NUM_PERM", 64),
+                bands=crawler.settings.getint("NEAR_DUPLICATE_BANDS", 16),
+                threshold=crawler.settings.getfloat("NEAR_DUPLICATE_THRESHOLD", 0.8),
+                max_size=crawler.settings.getint("NEAR_DUPLICATE_MAX_SIZE", 1000000),
+                path=crawler.settings.get("NEAR_DUPLICATE_PATH"),
+            )
+        )
+        pipeline.crawler = crawler
+        return pipeline
+
+    def close_spider(self, spider: Spider) -> None:
+        self.index.close()
+
+    def process_item(self, item, spider: Spider):
+        if not isinstance(item, News):
+            return item
+        signature: Signature = get_minhash(
+            item.content, self.index.num_perm, self.shingle_size
+        )
+        if not signature:
+            return item
+        item.cluster_id, duplicated = self.index.get_or_add(
+            get_cluster_id(item), signature
+        )
+        if self.crawler is not None:
+            self.crawler.stats.inc_value(
+                "near_duplicate/duplicates" if duplicated else "near_duplicate/clusters"
+            )
+        return item
@@ -0,0 +1,351 @@
+import json
+import os
+import sqlite3
+import time
+from abc import ABCMeta, abstractmethod
+from dataclasses import fields
+from typing import Dict, List, Optional, Set, Tuple, Type
+
+from scrapy import Spider
+from scrapy.crawler import Crawler
+from scrapy.exceptions import NotConfigured
+from scrapy.utils.misc import load_object
+from twisted.internet.task import LoopingCall
+
+from src.items import News, Author, Headline
+from src.metrics import StageMetrics
+from src.neardup import get_cluster_id
+
+try:
+    import pyarrow
+    import pyarrow.parquet
+except ImportError:
+    pyarrow = None
+
+NEWS_COLUMNS: List[str] = [
+    field.name for field in fields(News) if field.name != "authors"
+]
+AUTHOR_COLUMNS: List[str] = [field.name for field in fields(Author)]
+HEADLINE_COLUMNS: List[str] = [field.name for field in fields(Headline)]
+
+
+def news_to_row(item: News, body_once: bool = False) -> Dict:
+    # 기자 정보는 별도 테이블에 한 번만 저장하고, 기사에는 기자 id 만 남깁니다.
+    row: Dict = {column: getattr(item, column) for column in NEWS_COLUMNS}
+    row["author_ids"] = [author.id for author in item.authors]
+    if body_once and item.cluster_id and item.cluster_id != get_cluster_id(item):
+        # 본문은 클러스터의 대표 기사(cluster_id)에만 저장합니다.
+        row["content"] = None
+    return row
+
+
+def author_to_row(item: Author) -> Dict:
+    return {column: getattr(item, column) for column in AUTHOR_COLUMNS}
+
+
+def headline_to_row(item: Headline) -> Dict:
+    return {column: getattr(item, column) for column in HEADLINE_COLUMNS}
+
+
+class ItemSink(metaclass=ABCMeta):
+    def __init__(self, path: str):
+        os.makedirs(path, exist_ok=True)
+        self.path: str = path
+
+    @abstractmethod
+    def write_news(self, rows: List[Dict]) -> None:
+        pass
+
+    @abstractmethod
+    def write_authors(self, rows: List[Dict]) -> None:
+        pass
+
+    def write_headlines(self, rows: List[Dict]) -> None:
+        # 본문이 없는 Headline 을 저장하지 않는 저장소(archive)는 기록하지 않습니다.
+        pass
+
+    def close(self) -> None:
+        pass
+
+
+class JsonLinesSink(ItemSink):
+    def __init__(self, path: str):
+        super().__init__(path)
+        self.news_file = open(os.path.join(path, "news.jsonl"), "a", encoding="utf-8")
+        self.author_file = open(
+            os.path.join(path, "authors.jsonl"), "a", encoding="utf-8"
+        )
+        # headline_only 로 실행한 경우에만 만듭니다.
+        self.headline_file = None
+
+    @staticmethod
+    def _write_lines(file, rows: List[Dict]) -> None:
+        file.write("".join(json.dumps(row, ensure_ascii=False) + "\n" for row in rows))
+        file.flush()
+
+    def write_news(self, rows: List[Dict]) -> None:
+        self._write_lines(self.news_file, rows)
+
+    def write_authors(self, rows: List[Dict]) -> None:
+        self._write_lines(self.author_file, rows)
+
+    def write_headlines(self, rows: List[Dict]) -> None:
+        if self.headline_file is None:
+            self.headline_file = open(
+                os.path.join(self.path, "headlines.jsonl"), "a", encoding="utf-8"
+            )
+        self._write_lines(self.headline_file, rows)
+
+    def close(self) -> None:
+        self.news_file.close()
+        self.author_file.close()
+        if self.headline_file is not None:
+            self.headline_file.close()
+
+
+class ParquetSink(ItemSink):
+    """
+    배치마다 row group 하나를 기록하는 Parquet 저장소 (pyarrow 필요)
+    """
+
+    def __init__(self, path: str):
+        if pyarrow is None:
+            raise NotConfigured("ParquetSink requires pyarrow")
+        super().__init__(path)
+        news_schema = pyarrow.schema(
+            [(column, pyarrow.string()) for column in NEWS_COLUMNS]
+            + [("author_ids", pyarrow.list_(pyarrow.string()))]
+        )
+        author_schema = pyarrow.schema(
+            [(column, pyarrow.string()) for column in AUTHOR_COLUMNS]
+        )
+        self.news_writer = pyarrow.parquet.ParquetWriter(
+            os.path.join(path, f"news-{int(time.time())}.parquet"), news_schema
+        )
+        self.author_writer = pyarrow.parquet.ParquetWriter(
+            os.path.join(path, f"authors-{int(time.time())}.parquet"), author_schema
+        )
+        # headline_only 로 실행한 경우에만 만듭니다.
+        self.headline_writer = None
+
+    def write_news(self, rows: List[Dict]) -> None:
+        self.news_writer.write_table(
+            pyarrow.Table.from_pylist(rows, schema=self.news_writer.schema)
+        )
+
+    def write_authors(self, rows: List[Dict]) -> None:
+        self.author_writer.write_table(
+            pyarrow.Table.from_pylist(rows, schema=self.author_writer.schema)
+        )
+
+    def write_headlines(self, rows: List[Dict]) -> None:
+        if self.headline_writer is None:
+            self.headline_writer = pyarrow.parquet.ParquetWriter(
+                os.path.join(self.path, f"headlines-{int(time.time())}.parquet"),
+                pyarrow.schema(
+                    [(column, pyarrow.string()) for column in HEADLINE_COLUMNS]
+                ),
+            )
+        self.headline_writer.write_table(
+            pyarrow.Table.from_pylist(rows, schema=self.headline_writer.schema)
+        )
+
+    def close(self) -> None:
+        self.news_writer.close()
+        self.author_writer.close()
+        if self.headline_writer is not None:
+            self.headline_writer.close()
+
+
+class SqliteSink(ItemSink):
+    def __init__(self, path: str):
+        super().__init__(path)
+        self.conn: sqlite3.Connection = sqlite3.connect(
+            os.path.join(path, "news.sqlite3")
+        )
+        self.conn.execute(
+            f"CREATE TABLE IF NOT EXISTS news ({', '.join(NEWS_COLUMNS)}, "
+            "PRIMARY KEY (oid, aid))"
+        )
+        self.conn.execute(
+            f"CREATE TABLE IF NOT EXISTS author ({', '.join(AUTHOR_COLUMNS)}, "
+            "PRIMARY KEY (oid, id))"
+        )
+        self.add_missing_columns("news", NEWS_COLUMNS)
+        self.add_missing_columns("author", AUTHOR_COLUMNS)
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS news_author (oid, aid, author_id, "
+            "PRIMARY KEY (oid, aid, author_id))"
+        )
+        self.conn.execute(
+            f"CREATE TABLE IF NOT EXISTS headline ({', '.join(HEADLINE_COLUMNS)}, "
+            "PRIMARY KEY (oid, aid))"
+        )
+        self.conn.commit()
+
+    def add_missing_columns(self, table: str, table_columns: List[str]) -> None:
+        # 이전 버전에서 만든 테이블에 새로 추가된 컬럼을 추가합니다.
+        columns: Set[str] = {
+            row[1] for row in self.conn.execute(f"PRAGMA table_info({table})")
+        }
+        for column in table_columns:
+            if column not in columns:
+                self.conn.execute(f"ALTER TABLE {table} ADD COLUMN {column}")
+
+    def write_news(self, rows: List[Dict]) -> None:
+        self.conn.executemany(
+            f"INSERT OR REPLACE INTO news ({', '.join(NEWS_COLUMNS)}) "
+            f"VALUES ({', '.join('?' * len(NEWS_COLUMNS))})",
+            [tuple(row[column] for column in NEWS_COLUMNS) for row in rows],
+        )
+        self.conn.executemany(
+            "INSERT OR IGNORE INTO news_author (oid, aid, author_id) VALUES (?, ?, ?)",
+            [
+                (row["oid"], row["aid"], author_id)
+                for row in rows
+                for author_id in row["author_ids"]
+            ],
+        )
+        self.conn.commit()
+
+    def write_authors(self, rows: List[Dict]) -> None:
+        self.conn.executemany(
+            f"INSERT OR REPLACE INTO author ({', '.join(AUTHOR_COLUMNS)}) "
+            f"VALUES ({', '.join('?' * len(AUTHOR_COLUMNS))})",
+            [tuple(row[column] for column in AUTHOR_COLUMNS) for row in rows],
+        )
+        self.conn.commit()
+
+    def write_headlines(self, rows: List[Dict]) -> None:
+        self.conn.executemany(
+            f"INSERT OR REPLACE INTO headline ({', '.join(HEADLINE_COLUMNS)}) "
+            f"VALUES ({', '.join('?' * len(HEADLINE_COLUMNS))})",
+            [tuple(row[column] for column in HEADLINE_COLUMNS) for row in rows],
+        )
+        self.conn.commit()
+
+    def close(self) -> None:
+        self.conn.close()
+
+
+SINKS: Dict[str, Type[ItemSink]] = {
+    "jsonl": JsonLinesSink,
+    "parquet": ParquetSink,
+    "sqlite": SqliteSink,
+}
+# 이 모듈을 사용하는 다른 모듈에 정의된 저장소는 사용할 때 불러옵니다.
+SINK_PATHS: Dict[str, str] = {
+    "archive": "src.archive.ArchiveSink",
+}
+
+
+class BufferedSinkPipeline:
+    """
+    News / Author / Headline 을 모아 두었다가 ITEM_SINK 저장소에 한 번에 기록하는 Item Pipeline
+
+    버퍼가 ITEM_SINK_BATCH_SIZE 개에 도달하거나, 마지막 기록 후 ITEM_SINK_FLUSH_INTERVAL 초가
+    지나거나, spider 가 종료될 때 기록합니다.
+    """
+
+    def __init__(
+        self,
+        sink_cls: Type[ItemSink],
+        path: str,
+        batch_size: int = 500,
+        flush_interval: float = 30.0,
+        body_once: bool = False,
+    ):
+        self.sink_cls: Type[ItemSink] = sink_cls
+        self.path: str = path
+        self.batch_size: int = batch_size
+        self.flush_interval: float = flush_interval
+        self.body_once: bool = body_once
+        self.sink: Optional[ItemSink] = None
+        self.news_buffer: List[Dict] = []
+        self.author_buffer: List[Dict] = []
+        self.headline_buffer: List[Dict] = []
+        self.seen_authors: Set[Tuple[str, str]] = set()
+        self.last_flush: float = time.monotonic()
+        self.flush_loop: Optional[LoopingCall] = None
+        self.spider: Optional[Spider] = None
+
+    @classmethod
+    def from_crawler(cls, crawler: Crawler) -> "BufferedSinkPipeline":
+        sink_name: Optional[str] = crawler.settings.get("ITEM_SINK")
+        if not sink_name:
+            raise NotConfigured
+        if sink_name in SINK_PATHS:
+            SINKS[sink_name] = load_object(SINK_PATHS[sink_name])
+        if sink_name not in SINKS:
+            raise NotConfigured(f"Unknown ITEM_SINK: {sink_name}")
+        if sink_name == "parquet" and pyarrow is None:
+            raise NotConfigured("ITEM_SINK=parquet requires pyarrow")
+        return cls(
+            SINKS[sink_name],
+            crawler.settings.get("ITEM_SINK_PATH", "output"),
+            crawler.settings.getint("ITEM_SINK_BATCH_SIZE", 500),
+            crawler.settings.getfloat("ITEM_SINK_FLUSH_INTERVAL", 30.0),
+            crawler.settings.getbool("NEAR_DUPLICATE_STORE_BODY_ONCE"),
+        )
+
+    def open_spider(self, spider: Spider) -> None:
+        self.spider = spider
+        self.sink = self.sink_cls(self.path)
+        self.last_flush = time.monotonic()
+        if self.flush_interval > 0:
+            self.flush_loop = LoopingCall(self.flush_if_stale)
+            self.flush_loop.start(self.flush_interval, now=False)
+
+    def close_spider(self, spider: Spider) -> None:
+        if self.flush_loop is not None and self.flush_loop.running:
+            self.flush_loop.stop()
+        self.flush()
+        self.sink.close()
+
+    def process_item(self, item, spider: Spider):
+        if isinstance(item, Author):
+            # 기자 페이지에서 가져온 정보는 이전에 기록한 기자 정보를 덮어씁니다.
+            self.seen_authors.add((item.oid, item.id))
+            self.author_buffer.append(author_to_row(item))
+            return item
+        if isinstance(item, Headline):
+            self.headline_buffer.append(headline_to_row(item))
+            if len(self.headline_buffer) >= self.batch_size:
+                self.flush()
+            return item
+        if not isinstance(item, News):
+            return item
+        self.news_buffer.append(news_to_row(item, self.body_once))
+        for author in item.authors:
+            if (author.oid, author.id) not in self.seen_authors:
+                self.seen_authors.add((author.oid, author.id))
+                self.author_buffer.append(author_to_row(author))
+        if len(self.news_buffer) >= self.batch_size:
+            self.flush()
+        return item
+
+    def flush_if_stale(self) -> None:
+        if time.monotonic() - self.last_flush >= self.flush_interval:
+            self.flush()
+
+    def flush(self) -> None:
+        metrics: Optional[StageMetrics] = getattr(self.spider, "metrics", None)
+        if metrics is None or not (
+            self.news_buffer or self.author_buffer or self.headline_buffer
+        ):
+            self.write_buffers()
+            return
+        with metrics.time("pipeline_write", self.spider.name, None):
+            self.write_buffers()
+
+    def write_buffers(self) -> None:
+        if self.author_buffer:
+            self.sink.write_authors(self.author_buffer)
+            self.author_buffer = []
+        if self.news_buffer:
+            self.sink.write_news(self.news_buffer)
+            self.news_buffer = []
+        if self.headline_buffer:
+            self.sink.write_headlines(self.headline_buffer)
+            self.headline_buffer = []
+        self.last_flush = time.monotonic()
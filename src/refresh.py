@@ -0,0 +1,48 @@
+from datetime import datetime, timedelta
+from typing import List, Optional, Tuple
+
+# (기사 업로드 후 경과 시간 상한, 확인 간격)
+DEFAULT_REFRESH_INTERVALS: List[Tuple[timedelta, timedelta]] = [
+    (timedelta(hours=1), timedelta(minutes=10)),
+    (timedelta(hours=6), timedelta(minutes=30)),
+    (timedelta(hours=24), timedelta(hours=2)),
+    (timedelta(hours=72), timedelta(hours=12)),
+]
+
+
+class RefreshSchedule:
+    """
+    기사 수정 여부를 확인하는 주기를 기사의 경과 시간에 따라 늘려가는 스케줄
+
+    업로드 직후에는 자주, 시간이 지날수록 드물게 확인하며 max_age 이후에는 확인하지 않습니다.
+    """
+
+    def __init__(self, intervals: Optional[List[Tuple[timedelta, timedelta]]] = None):
+        self.intervals: List[Tuple[timedelta, timedelta]] = sorted(
+            intervals or DEFAULT_REFRESH_INTERVALS
+        )
+
+    @property
+    def max_age(self) -> timedelta:
+        return self.intervals[-1][0]
+
+    def get_interval(self, age: timedelta) -> Optional[timedelta]:
+        for max_age, interval in self.intervals:
+            if age < max_age:
+                return interval
+        return None
+
+    def is_due(
+        self,
+        upload_time: datetime,
+        checked_at: Optional[datetime],
+        now: datetime,
+    ) -> bool:
+        interval: Optional[timedelta] = self.get_interval(now - upload_time)
+        if interval is None:
+            return False
+        return checked_at is None or now - checked_at >= interval
+
+    def get_priority(self, upload_time: datetime, now: datetime) -> int:
+        # 최근 기사일수록 높은 우선순위(분 단위)를 가집니다.
+        return int((self.max_age - (now - upload_time)).total_seconds() // 60)
@@ -0,0 +1,247 @@
+"""
+NewsSpider / LSDSpider / EntSpider / SportSpider 를 하나의 CrawlerProcess 에서 함께 실행합니다.
+
+모든 spider 가 (oid, aid) 중복 확인과 HTTP 연결 풀을 공유하며, 각 기사는 기사 주소의 variant
+(mnews / entertain / sports) 를 담당하는 spider 에게 넘겨 한 번만 요청합니다.
+
+사용법: python -m src.runner [--spiders NewsSpider,LSDSpider,EntSpider,SportSpider]
+        [--sid LSDSpider=100,101] [-a date=20210101] [-s KEY=VALUE] [-o "output/%(name)s.jsonl"]
+"""
+
+import argparse
+import re
+from typing import Dict, List, Optional, Set, Tuple, Type, Union
+
+from scrapy import Request, signals
+from scrapy.core.downloader.handlers.http11 import HTTP11DownloadHandler
+from scrapy.crawler import Crawler, CrawlerProcess
+from scrapy.exceptions import DontCloseSpider
+from scrapy.settings import Settings
+from scrapy.utils.project import get_project_settings
+from twisted.web.client import HTTPConnectionPool
+
+from src.checkpoint import Oaid
+from src.dupefilters import pack_oaid
+from src.spiders import NewsSpider, LSDSpider, EntSpider, SportSpider
+from src.utils import ArticleKey, parse_article_link
+
+SPIDERS: Dict[str, Type[NewsSpider]] = {
+    spider_cls.name: spider_cls
+    for spider_cls in (NewsSpider, LSDSpider, EntSpider, SportSpider)
+}
+# 목록의 sid1 별 기사 주소 variant (나머지는 "mnews")
+SID_VARIANTS: Dict[str, str] = {"106": "entertain", "107": "sports"}
+
+re_sid1_query_ptrn: re.Pattern = re.compile(r"[?&]sid1=(\d+)")
+
+
+class ArticleRegistry:
+    """
+    한 프로세스에서 실행되는 여러 spider 가 공유하는 기사 등록부
+
+    - 먼저 요청된 (oid, aid) 만 수집하고, 다른 spider 에서 다시 나온 기사는 버립니다.
+    - 기사 주소의 variant 를 담당하는(article_variant 가 같은) spider 가 있으면 기사 요청을 그
+      spider 에게 넘깁니다. 체크포인트 / 분산 수집을 사용하는 spider 는 기사를 직접 요청합니다.
+    - 다른 spider 가 아직 수집 중이면 넘겨받을 기사가 남아 있을 수 있으므로 종료하지 않습니다.
+      idle 상태라도 이어서 요청을 만들 작업(다음 tail 확인, 남은 목록 단위 등)이 있으면 수집 중으로
+      봅니다.
+    - 담당 spider 가 종료 중이면 기사를 넘기지 않고 찾은 spider 가 직접 요청합니다.
+    """
+
+    def __init__(self):
+        self.articles: Set[Union[int, Tuple[str, str]]] = set()
+        self.owners: Dict[str, NewsSpider] = {}
+        self.spiders: List[NewsSpider] = []
+        # 아직 idle 상태가 되지 않은 crawler
+        self.active: Set[Crawler] = set()
+
+    def attach(self, crawler: Crawler) -> None:
+        self.active.add(crawler)
+        crawler.signals.connect(self.spider_opened, signal=signals.spider_opened)
+        crawler.signals.connect(self.spider_idle, signal=signals.spider_idle)
+        crawler.signals.connect(self.spider_closed, signal=signals.spider_closed)
+
+    def spider_opened(self, spider: NewsSpider) -> None:
+        spider.registry = self
+        self.spiders.append(spider)
+        if spider.article_variant:
+            self.owners.setdefault(spider.article_variant, spider)
+
+    def spider_idle(self, spider: NewsSpider) -> None:
+        if not spider.has_pending_work():
+            self.active.discard(spider.crawler)
+        if self.active:
+            raise DontCloseSpider
+
+    def spider_closed(self, spider: NewsSpider) -> None:
+        self.active.discard(spider.crawler)
+        self.spiders.remove(spider)
+        for variant, owner in list(self.owners.items()):
+            if owner is spider:
+                del self.owners[variant]
+        # 같은 variant 의 다른 spider 가 있으면 이어서 담당합니다.
+        for other in self.spiders:
+            if other.article_variant:
+                self.owners.setdefault(other.article_variant, other)
+
+    @staticmethod
+    def get_variant(link: str, sid: Optional[str] = None) -> str:
+        key: Optional[ArticleKey] = parse_article_link(link)
+        if key is not None and key.variant:
+            return key.variant
+        sid_match: Optional[re.Match] = re_sid1_query_ptrn.search(link)
+        if sid_match:
+            sid = sid_match.group(1)
+        return SID_VARIANTS.get(sid, "mnews")
+
+    @staticmethod
+    def is_closing(crawler: Crawler) -> bool:
+        # Scrapy 2.6 은 engine.slot, 이후 버전은 engine._slot 에 spider 의 상태를 둡니다.
+        engine = crawler.engine
+        if engine is None or not engine.running:
+            return True
+        slot = getattr(engine, "_slot", getattr(engine, "slot", None))
+        return slot is None or slot.closing is not None
+
+    def claim(self, oaid: Optional[Oaid]) -> bool:
+        # 키를 알 수 없는 기사는 각 spider 의 중복 확인에 맡깁니다.
+        if oaid is None:
+            return True
+        key: Union[int, Tuple[str, str]] = pack_oaid(*oaid)
+        if key in self.articles:
+            return False
+        self.articles.add(key)
+        return True
+
+    def get_owner(
+        self, spider: NewsSpider, link: str, sid: Optional[str] = None
+    ) -> NewsSpider:
+        if spider.checkpoint is not None or spider.distributed is not None:
+            return spider
+        owner: Optional[NewsSpider] = self.owners.get(self.get_variant(link, sid))
+        if (
+            owner is None
+            or owner.checkpoint is not None
+            or owner.distributed is not None
+            or self.is_closing(owner.crawler)
+        ):
+            return spider
+        return owner
+
+    def dispatch(
+        self,
+        spider: NewsSpider,
+        link: str,
+        oaid: Optional[Oaid],
+        sid: Optional[str] = None,
+    ) -> bool:
+        """
+        spider 가 찾은 기사를 등록하고, spider 가 직접 요청하지 않아도 되면 True 를 돌려줍니다.
+        """
+        if not self.claim(oaid):
+            spider.crawler.stats.inc_value("combined/duplicate_articles")
+            return True
+        owner: NewsSpider = self.get_owner(spider, link, sid)
+        if owner is spider:
+            return False
+        request: Request = owner.build_article_request(
+            owner.convert_article_link(link), oaid, sid
+        )
+        self.active.add(owner.crawler)
+        owner.crawler.engine.crawl(request)
+        spider.crawler.stats.inc_value("combined/routed_articles")
+        owner.crawler.stats.inc_value("combined/received_articles")
+        return True
+
+
+class SharedPoolDownloadHandler(HTTP11DownloadHandler):
+    """
+    같은 프로세스의 모든 crawler 가 하나의 HTTPConnectionPool 을 사용하는 Download Handler
+
+    DOWNLOAD_HANDLERS 의 http / https 에 등록하여 사용하며, 마지막 handler 가 닫힐 때 연결을
+    정리합니다. 연결 수 상한은 처음 만든 crawler 의 CONCURRENT_REQUESTS_PER_DOMAIN 을 따릅니다.
+    """
+
+    pool: Optional[HTTPConnectionPool] = None
+    users: int = 0
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        if SharedPoolDownloadHandler.pool is None:
+            SharedPoolDownloadHandler.pool = self._pool
+        else:
+            self._pool = SharedPoolDownloadHandler.pool
+        SharedPoolDownloadHandler.users += 1
+
+    async def close(self) -> None:
+        SharedPoolDownloadHandler.users -= 1
+        if SharedPoolDownloadHandler.users > 0:
+            return
+        SharedPoolDownloadHandler.pool = None
+        await super().close()
+
+
+def get_combined_settings(settings: Settings, output: Optional[str] = None) -> Settings:
+    settings = settings.copy()
+    if settings.getbool("COMBINED_SHARED_POOL", True):
+        handlers: Dict[str, str] = dict(settings.getdict("DOWNLOAD_HANDLERS"))
+        for scheme in ("http", "https"):
+            handlers.setdefault(scheme, "src.runner.SharedPoolDownloadHandler")
+        settings.set("DOWNLOAD_HANDLERS", handlers)
+    if output:
+        # 여러 spider 가 같은 파일에 쓰지 않도록 경로에 %(name)s 를 사용합니다.
+        settings.set("FEEDS", {output: {"format": output.rsplit(".", 1)[-1]}})
+    return settings
+
+
+def run(
+    spider_names: List[str],
+    spider_kwargs: Dict[str, str],
+    spider_sids: Dict[str, str],
+    settings: Settings,
+) -> ArticleRegistry:
+    process: CrawlerProcess = CrawlerProcess(settings)
+    registry: ArticleRegistry = ArticleRegistry()
+    for name in spider_names:
+        crawler: Crawler = process.create_crawler(SPIDERS[name])
+        registry.attach(crawler)
+        kwargs: Dict[str, str] = dict(spider_kwargs)
+        if name in spider_sids:
+            kwargs["sid"] = spider_sids[name]
+        process.crawl(crawler, **kwargs)
+    process.start()
+    return registry
+
+
+def parse_pairs(values: List[str], sep: str = "=") -> Dict[str, str]:
+    return dict(value.split(sep, 1) for value in values)
+
+
+def main() -> None:
+    parser: argparse.ArgumentParser = argparse.ArgumentParser(
+        description="Run several news spiders in one process with shared dedup"
+    )
+    parser.add_argument("--spiders", default=",".join(SPIDERS))
+    # LSDSpider / EntSpider / SportSpider 의 sid (예: --sid LSDSpider=100,101)
+    parser.add_argument("--sid", action="append", default=[])
+    parser.add_argument("-a", dest="spider_args", action="append", default=[])
+    parser.add_argument("-s", dest="settings", action="append", default=[])
+    parser.add_argument("-o", dest="output")
+    args: argparse.Namespace = parser.parse_args()
+
+    spider_names: List[str] = args.spiders.split(",")
+    for name in spider_names:
+        if name not in SPIDERS:
+            parser.error(f"Unknown spider: {name}")
+    settings: Settings = get_project_settings()
+    settings.setdict(parse_pairs(args.settings), priority="cmdline")
+    run(
+        spider_names,
+        parse_pairs(args.spider_args),
+        parse_pairs(args.sid),
+        get_combined_settings(settings, args.output),
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,584 @@
+"""
+수집 중에 만드는 기사 제목 / 본문의 역색인(inverted index)
+
+색인 디렉토리의 구성
+- segments.json: 현재 사용하는 segment 목록 (segments.lock 을 잠근 채 새 파일로 바꿔치기합니다)
+- {segment}/docs.json: segment 의 문서별 [oid, aid, upload_time, date, sid1, press]
+- {segment}/terms.json: 용어별 [postings.bin 의 시작 위치, 길이, 문서 수]
+- {segment}/postings.bin: 용어별 (문서 번호 차이, 등장 횟수, 위치 차이...) 의 varint 목록
+
+한글 등은 글자 bigram, 영문 / 숫자는 단어 단위로 나누며, 위치를 함께 저장하여 구문 검색을 지원합니다.
+한 글자 검색어는 그 글자로 시작하거나 끝나는 bigram (또는 한 글자 단어) 중 하나를 포함하는 문서를 찾습니다.
+segment 는 SEARCH_INDEX_SEGMENT_SIZE 개 문서마다 기록하고, 비슷한 크기의 segment 가
+SEARCH_INDEX_MERGE_FACTOR 개 모이면 하나로 합칩니다.
+
+사용법
+- python -m src.search build INDEX_PATH NEWS_JSONL...
+- python -m src.search query INDEX_PATH '경제 "대통령 선거"' [--since 20210101] [--sid1 100] [--press KBS]
+"""
+
+import argparse
+import json
+import math
+import mmap
+import os
+import re
+import shutil
+import sys
+import tempfile
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+from scrapy import Spider
+from scrapy.crawler import Crawler
+from scrapy.exceptions import NotConfigured
+
+from src.archive import get_partition_date
+from src.items import News
+from src.utils import json_loads
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+Oaid = Tuple[str, str]
+# (문서 번호, 위치 목록)
+Posting = Tuple[int, List[int]]
+
+SEARCH_INDEX_VERSION: int = 1
+# 영문 / 숫자는 단어 단위, 그 외 글자(한글 등)는 bigram 으로 나눕니다.
+re_token_ptrn: re.Pattern = re.compile(r"[0-9a-z]+|[^\W0-9a-z_]+")
+# 따옴표로 묶은 구문 또는 공백으로 구분된 단어
+re_query_ptrn: re.Pattern = re.compile(r'"([^"]*)"|(\S+)')
+
+
+def tokenize(text: Optional[str], start: int = 0) -> List[Tuple[str, int]]:
+    tokens: List[Tuple[str, int]] = []
+    position: int = start
+    for word in re_token_ptrn.findall((text or "").lower()):
+        if word.isascii() or len(word) == 1:
+            tokens.append((word, position))
+            position += 1
+            continue
+        for i in range(len(word) - 1):
+            tokens.append((word[i : i + 2], position))
+            position += 1
+    return tokens
+
+
+def encode_varint(value: int, buffer: bytearray) -> None:
+    while value >= 0x80:
+        buffer.append((value & 0x7F) | 0x80)
+        value >>= 7
+    buffer.append(value)
+
+
+def decode_postings(data: bytes, df: int) -> List[Posting]:
+    postings: List[Posting] = []
+    offset: int = 0
+    doc: int = 0
+
+    def read() -> int:
+        nonlocal offset
+        value: int = 0
+        shift: int = 0
+        while True:
+            byte: int = data[offset]
+            offset += 1
+            value |= (byte & 0x7F) << shift
+            if byte < 0x80:
+                return value
+            shift += 7
+
+    for _ in range(df):
+        doc += read()
+        position: int = 0
+        positions: List[int] = []
+        for _ in range(read()):
+            position += read()
+            positions.append(position)
+        postings.append((doc, positions))
+    return postings
+
+
+class PostingsBuilder:
+    """
+    한 용어의 postings 를 문서 번호 순서로 받아 varint 로 인코딩합니다.
+    """
+
+    __slots__ = ("buffer", "last_doc", "df")
+
+    def __init__(self):
+        self.buffer: bytearray = bytearray()
+        self.last_doc: int = 0
+        self.df: int = 0
+
+    def add(self, doc: int, positions: List[int]) -> None:
+        encode_varint(doc - self.last_doc, self.buffer)
+        encode_varint(len(positions), self.buffer)
+        last_position: int = 0
+        for position in positions:
+            encode_varint(position - last_position, self.buffer)
+            last_position = position
+        self.last_doc = doc
+        self.df += 1
+
+
+def write_json(path: str, value) -> None:
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(value, f, ensure_ascii=False)
+
+
+def write_segment(
+    path: str, docs: List[List[str]], terms: Dict[str, PostingsBuilder]
+) -> None:
+    tmp_path: str = path + ".tmp"
+    shutil.rmtree(tmp_path, ignore_errors=True)
+    os.makedirs(tmp_path)
+    term_offsets: Dict[str, List[int]] = {}
+    offset: int = 0
+    with open(os.path.join(tmp_path, "postings.bin"), "wb") as f:
+        for term in sorted(terms):
+            builder: PostingsBuilder = terms[term]
+            f.write(builder.buffer)
+            term_offsets[term] = [offset, len(builder.buffer), builder.df]
+            offset += len(builder.buffer)
+    write_json(os.path.join(tmp_path, "terms.json"), term_offsets)
+    write_json(os.path.join(tmp_path, "docs.json"), docs)
+    os.replace(tmp_path, path)
+
+
+class Segment:
+    def __init__(self, path: str):
+        self.path: str = path
+        with open(os.path.join(path, "docs.json"), encoding="utf-8") as f:
+            self.docs: List[List[str]] = json.load(f)
+        with open(os.path.join(path, "terms.json"), encoding="utf-8") as f:
+            self.terms: Dict[str, List[int]] = json.load(f)
+        # 글자별로 그 글자를 포함하는 한글 등의 용어 (한 글자 검색 시 만듭니다)
+        self.char_terms: Optional[Dict[str, List[str]]] = None
+        self.file = open(os.path.join(path, "postings.bin"), "rb")
+        # 빈 파일은 memory-map 할 수 없습니다.
+        self.postings: Optional[mmap.mmap] = (
+            mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+            if os.path.getsize(self.file.name)
+            else None
+        )
+
+    def __len__(self) -> int:
+        return len(self.docs)
+
+    def get_postings(self, term: str) -> List[Posting]:
+        entry: Optional[List[int]] = self.terms.get(term)
+        if entry is None:
+            return []
+        offset, length, df = entry
+        return decode_postings(self.postings[offset : offset + length], df)
+
+    def get_char_terms(self, char: str) -> List[str]:
+        if self.char_terms is None:
+            self.char_terms = {}
+            for term in self.terms:
+                if not term.isascii():
+                    for term_char in set(term):
+                        self.char_terms.setdefault(term_char, []).append(term)
+        return self.char_terms.get(char, [])
+
+    def close(self) -> None:
+        if self.postings is not None:
+            self.postings.close()
+        self.file.close()
+
+
+def merge_segments(path: str, segments: List[Segment]) -> None:
+    # 문서 번호는 segment 순서대로 이어 붙이므로 용어별 postings 의 순서가 유지됩니다.
+    docs: List[List[str]] = []
+    bases: List[int] = []
+    for segment in segments:
+        bases.append(len(docs))
+        docs.extend(segment.docs)
+    terms: Dict[str, PostingsBuilder] = {}
+    for term in sorted(set().union(*(segment.terms for segment in segments))):
+        builder: PostingsBuilder = PostingsBuilder()
+        for base, segment in zip(bases, segments):
+            for doc, positions in segment.get_postings(term):
+                builder.add(base + doc, positions)
+        terms[term] = builder
+    write_segment(path, docs, terms)
+
+
+def parse_query(query: str) -> List[List[str]]:
+    """
+    검색어를 연속한 위치에 있어야 하는 용어 목록들로 바꿉니다. 모든 목록을 포함하는 문서를 찾습니다.
+    """
+    sequences: List[List[str]] = []
+    for phrase, word in re_query_ptrn.findall(query):
+        tokens: List[str] = [token for token, _ in tokenize(phrase or word)]
+        if tokens:
+            sequences.append(tokens)
+    return sequences
+
+
+def is_single_char(sequence: List[str]) -> bool:
+    # bigram 으로 나누는 글자 하나로 된 검색어
+    return len(sequence) == 1 and len(sequence[0]) == 1 and not sequence[0].isascii()
+
+
+def match_sequence(positions: List[Set[int]]) -> bool:
+    return any(
+        all(start + i in positions[i] for i in range(1, len(positions)))
+        for start in positions[0]
+    )
+
+
+class SearchIndex:
+    """
+    segment 단위 역색인의 기록과 검색
+
+    기록한 문서는 flush 이후(segment 가 만들어진 뒤)부터 검색됩니다.
+    """
+
+    def __init__(self, path: str, segment_size: int = 10000, merge_factor: int = 10):
+        self.path: str = path
+        self.segment_size: int = segment_size
+        self.merge_factor: int = merge_factor
+        os.makedirs(path, exist_ok=True)
+        self.segments: Dict[str, Segment] = {}
+        self.docs: List[List[str]] = []
+        self.terms: Dict[str, PostingsBuilder] = {}
+        self.refresh()
+
+    def __enter__(self) -> "SearchIndex":
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+    @property
+    def manifest_path(self) -> str:
+        return os.path.join(self.path, "segments.json")
+
+    @contextmanager
+    def lock_manifest(self) -> Iterator[None]:
+        # 같은 색인에 기록하는 다른 프로세스(분산 수집, 여러 spider 실행)와 manifest 갱신이
+        # 겹치지 않도록 잠급니다. fcntl 이 없는 환경에서는 바꿔치기만 합니다.
+        with open(os.path.join(self.path, "segments.lock"), "a") as lock_file:
+            if fcntl is not None:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def read_manifest(self) -> List[str]:
+        if not os.path.exists(self.manifest_path):
+            return []
+        with open(self.manifest_path, encoding="utf-8") as f:
+            manifest: Dict = json.load(f)
+        if manifest.get("version") != SEARCH_INDEX_VERSION:
+            raise ValueError(f"Unsupported search index version in {self.path}")
+        return manifest["segments"]
+
+    def update_manifest(self, added: List[str], removed: Iterable[str] = ()) -> bool:
+        """
+        manifest 에 added 를 추가하고 removed 를 뺍니다. 다른 프로세스가 이미 removed 의 일부를
+        합쳐서 뺀 경우에는 바꾸지 않고 False 를 돌려줍니다.
+        """
+        removed: Set[str] = set(removed)
+        with self.lock_manifest():
+            # 같은 색인에 기록하는 다른 프로세스의 segment 를 잃지 않도록 잠근 뒤 다시 읽습니다.
+            current: List[str] = self.read_manifest()
+            if not removed.issubset(current):
+                return False
+            names: List[str] = [name for name in current if name not in removed]
+            fd, tmp_path = tempfile.mkstemp(
+                prefix="segments.", suffix=".tmp", dir=self.path
+            )
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(
+                    {"version": SEARCH_INDEX_VERSION, "segments": names + added}, f
+                )
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, self.manifest_path)
+        return True
+
+    def refresh(self) -> None:
+        # 다른 프로세스가 합친 뒤 지우는 segment 를 열지 않도록 manifest 를 잠근 채 엽니다.
+        # (연 뒤에 지워진 파일은 닫을 때까지 읽을 수 있습니다)
+        with self.lock_manifest():
+            names: List[str] = self.read_manifest()
+            for name in list(self.segments):
+                if name not in names:
+                    self.segments.pop(name).close()
+            for name in names:
+                if name not in self.segments:
+                    self.segments[name] = Segment(os.path.join(self.path, name))
+
+    def new_segment_name(self) -> str:
+        return f"seg-{time.time_ns():x}-{os.getpid()}"
+
+    def add(
+        self,
+        oid: str,
+        aid: str,
+        title: Optional[str],
+        content: Optional[str],
+        upload_time: Optional[str] = None,
+        sid1: Optional[str] = None,
+        press: Optional[str] = None,
+    ) -> None:
+        doc: int = len(self.docs)
+        self.docs.append(
+            [
+                oid,
+                aid,
+                upload_time,
+                get_partition_date({"upload_time": upload_time}),
+                sid1,
+                press,
+            ]
+        )
+        tokens: List[Tuple[str, int]] = tokenize(title)
+        # 제목과 본문에 걸친 구문은 찾지 않도록 위치를 띄웁니다.
+        tokens += tokenize(content, len(tokens) + 1)
+        positions: Dict[str, List[int]] = {}
+        for token, position in tokens:
+            positions.setdefault(token, []).append(position)
+        for token, token_positions in positions.items():
+            builder: Optional[PostingsBuilder] = self.terms.get(token)
+            if builder is None:
+                builder = self.terms[token] = PostingsBuilder()
+            builder.add(doc, token_positions)
+        if len(self.docs) >= self.segment_size:
+            self.flush()
+
+    def add_item(self, item: News) -> None:
+        self.add(
+            item.oid,
+            item.aid,
+            item.title,
+            item.content,
+            item.upload_time,
+            item.sid1,
+            item.press,
+        )
+
+    def flush(self) -> None:
+        if not self.docs:
+            return
+        name: str = self.new_segment_name()
+        write_segment(os.path.join(self.path, name), self.docs, self.terms)
+        self.docs = []
+        self.terms = {}
+        self.update_manifest([name])
+        self.refresh()
+        self.maybe_merge()
+
+    def get_level(self, segment: Segment) -> int:
+        # segment_size * merge_factor ** level 이상 크기의 segment 가 level 단계입니다.
+        ratio: float = max(len(segment) / self.segment_size, 1)
+        return int(math.log(ratio, self.merge_factor) + 1e-9)
+
+    def maybe_merge(self) -> None:
+        # 같은 단계의 segment 가 merge_factor 개 모이면 하나로 합치며, 합친 segment 로 다음
+        # 단계가 채워지면 계속 합칩니다.
+        while True:
+            levels: Dict[int, List[str]] = {}
+            for name, segment in self.segments.items():
+                levels.setdefault(self.get_level(segment), []).append(name)
+            names: Optional[List[str]] = next(
+                (
+                    names
+                    for _, names in sorted(levels.items())
+                    if len(names) >= self.merge_factor
+                ),
+                None,
+            )
+            if names is None:
+                return
+            self.merge(names[: self.merge_factor])
+
+    def merge(self, names: List[str]) -> None:
+        name: str = self.new_segment_name()
+        merge_segments(
+            os.path.join(self.path, name), [self.segments[merged] for merged in names]
+        )
+        if not self.update_manifest([name], names):
+            # 다른 프로세스가 먼저 합친 경우 이번에 합친 segment 는 버립니다.
+            shutil.rmtree(os.path.join(self.path, name), ignore_errors=True)
+            self.refresh()
+            return
+        self.refresh()
+        for removed in names:
+            # 다른 프로세스가 아직 읽고 있으면 지우지 못할 수 있습니다.
+            shutil.rmtree(os.path.join(self.path, removed), ignore_errors=True)
+
+    def optimize(self) -> None:
+        self.flush()
+        if len(self.segments) > 1:
+            self.merge(list(self.segments))
+
+    def search(
+        self,
+        query: str,
+        since: Optional[str] = None,
+        until: Optional[str] = None,
+        sid1: Optional[str] = None,
+        press: Optional[str] = None,
+        limit: Optional[int] = None,
+    ) -> List[Oaid]:
+        """
+        query 의 모든 단어 / 구문을 포함하고 업로드 날짜(since ~ until, %Y%m%d), sid1, press
+        조건을 만족하는 기사의 (oid, aid) 를 최근 기사부터 돌려줍니다.
+        """
+        sequences: List[List[str]] = parse_query(query)
+        if not sequences:
+            return []
+        found: Dict[Oaid, str] = {}
+        for segment in self.segments.values():
+            for doc in self.search_segment(segment, sequences):
+                oid, aid, upload_time, date, doc_sid1, doc_press = segment.docs[doc]
+                if (
+                    (since and date < since)
+                    or (until and date > until)
+                    or (sid1 and doc_sid1 != sid1)
+                    or (press and doc_press != press)
+                ):
+                    continue
+                # 같은 기사를 다시 색인한 경우 하나만 돌려줍니다.
+                found[(oid, aid)] = upload_time or ""
+        results: List[Oaid] = sorted(found, key=found.get, reverse=True)
+        return results[:limit] if limit else results
+
+    @staticmethod
+    def search_segment(segment: Segment, sequences: List[List[str]]) -> List[int]:
+        char_sequences: List[List[str]] = list(filter(is_single_char, sequences))
+        sequences = [sequence for sequence in sequences if not is_single_char(sequence)]
+        terms: Set[str] = {term for sequence in sequences for term in sequence}
+        if any(term not in segment.terms for term in terms):
+            return []
+        candidates: Optional[Set[int]] = None
+        for (char,) in char_sequences:
+            docs: Set[int] = {
+                doc
+                for term in segment.get_char_terms(char)
+                for doc, _ in segment.get_postings(term)
+            }
+            candidates = docs if candidates is None else candidates & docs
+            if not candidates:
+                return []
+        # 문서 수가 적은 용어부터 교집합을 구합니다.
+        postings: Dict[str, Dict[int, List[int]]] = {}
+        for term in sorted(terms, key=lambda term: segment.terms[term][2]):
+            postings[term] = dict(segment.get_postings(term))
+            candidates = (
+                set(postings[term])
+                if candidates is None
+                else candidates & postings[term].keys()
+            )
+            if not candidates:
+                return []
+        return [
+            doc
+            for doc in sorted(candidates)
+            if all(
+                match_sequence([set(postings[term][doc]) for term in sequence])
+                for sequence in sequences
+                if len(sequence) > 1
+            )
+        ]
+
+    def close(self) -> None:
+        self.flush()
+        for segment in self.segments.values():
+            segment.close()
+        self.segments = {}
+
+
+class SearchIndexPipeline:
+    """
+    내보내는 News 의 제목과 본문을 SEARCH_INDEX_PATH 역색인에 추가하는 Item Pipeline
+    """
+
+    def __init__(self, index: SearchIndex):
+        self.index: SearchIndex = index
+
+    @classmethod
+    def from_crawler(cls, crawler: Crawler) -> "SearchIndexPipeline":
+        if not crawler.settings.getbool("SEARCH_INDEX_ENABLED"):
+            raise NotConfigured
+        return cls(
+            SearchIndex(
+                crawler.settings.get("SEARCH_INDEX_PATH", "search_index"),
+                crawler.settings.getint("SEARCH_INDEX_SEGMENT_SIZE", 10000),
+                crawler.settings.getint("SEARCH_INDEX_MERGE_FACTOR", 10),
+            )
+        )
+
+    def close_spider(self, spider: Spider) -> None:
+        self.index.close()
+
+    def process_item(self, item, spider: Spider):
+        if isinstance(item, News):
+            self.index.add_item(item)
+        return item
+
+
+def iter_jsonl(path: str) -> Iterator[Dict]:
+    # 큰 파일도 한 줄씩 읽습니다.
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                yield json_loads(line)
+
+
+def main() -> None:
+    parser: argparse.ArgumentParser = argparse.ArgumentParser(
+        description="Build or query the full-text search index"
+    )
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    build_parser: argparse.ArgumentParser = subparsers.add_parser("build")
+    build_parser.add_argument("index_path")
+    build_parser.add_argument("news_jsonl", nargs="+")
+    query_parser: argparse.ArgumentParser = subparsers.add_parser("query")
+    query_parser.add_argument("index_path")
+    query_parser.add_argument("query")
+    query_parser.add_argument("--since")
+    query_parser.add_argument("--until")
+    query_parser.add_argument("--sid1")
+    query_parser.add_argument("--press")
+    query_parser.add_argument("--limit", type=int)
+    args: argparse.Namespace = parser.parse_args()
+
+    if args.command == "build":
+        with SearchIndex(args.index_path) as index:
+            for path in args.news_jsonl:
+                for row in iter_jsonl(path):
+                    index.add(
+                        row["oid"],
+                        row["aid"],
+                        row.get("title"),
+                        row.get("content"),
+                        row.get("upload_time"),
+                        row.get("sid1"),
+                        row.get("press"),
+                    )
+        return
+
+    with SearchIndex(args.index_path) as index:
+        start: float = time.perf_counter()
+        results: List[Oaid] = index.search(
+            args.query, args.since, args.until, args.sid1, args.press, args.limit
+        )
+        elapsed: float = time.perf_counter() - start
+    for oid, aid in results:
+        print(f"{oid}\t{aid}")
+    print(f"{len(results)} articles in {elapsed * 1000:.1f} ms", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,160 @@
+import sqlite3
+from dataclasses import dataclass
+from typing import Dict, Iterator, Optional, Set
+
+from src.items import News
+from src.utils import get_now_dt_str, get_content_hash
+
+
+@dataclass
+class SeenArticle:
+    oid: str
+    aid: str
+    upload_time: str
+    edited_time: str
+    scraped_at: str
+    url: Optional[str] = None
+    content_hash: Optional[str] = None
+    etag: Optional[str] = None  # 마지막 응답의 ETag 헤더
+    last_modified: Optional[str] = None  # 마지막 응답의 Last-Modified 헤더
+    checked_at: Optional[str] = None  # 마지막으로 변경 여부를 확인한 시각
+
+
+SEEN_ARTICLE_COLUMNS: str = (
+    "oid, aid, upload_time, edited_time, scraped_at, "
+    "url, content_hash, etag, last_modified, checked_at"
+)
+
+# 처음 버전 이후에 추가된 컬럼으로, 기존 인덱스 파일을 열 때 추가합니다.
+ADDED_COLUMNS: Dict[str, str] = {
+    "url": "TEXT",
+    "content_hash": "TEXT",
+    "etag": "TEXT",
+    "last_modified": "TEXT",
+    "checked_at": "TEXT",
+}
+
+
+class SeenArticleIndex:
+    """
+    이미 수집한 (oid, aid) 를 실행 간에 유지하는 SQLite 기반 인덱스
+    """
+
+    def __init__(self, path: str, commit_interval: int = 100):
+        self.path: str = path
+        self.commit_interval: int = commit_interval
+        self._uncommitted: int = 0
+        self.conn: sqlite3.Connection = sqlite3.connect(path)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS seen_article ("
+            "oid TEXT NOT NULL, "
+            "aid TEXT NOT NULL, "
+            "upload_time TEXT, "
+            "edited_time TEXT, "
+            "scraped_at TEXT NOT NULL, "
+            "PRIMARY KEY (oid, aid)"
+            ") WITHOUT ROWID"
+        )
+        columns: Set[str] = {
+            row[1] for row in self.conn.execute("PRAGMA table_info(seen_article)")
+        }
+        for name, column_type in ADDED_COLUMNS.items():
+            if name not in columns:
+                self.conn.execute(
+                    f"ALTER TABLE seen_article ADD COLUMN {name} {column_type}"
+                )
+        self.conn.execute(
+            "CREATE INDEX IF NOT EXISTS seen_article_upload_time "
+            "ON seen_article (upload_time)"
+        )
+        self.conn.commit()
+
+    def get(self, oid: str, aid: str) -> Optional[SeenArticle]:
+        row: Optional[tuple] = self.conn.execute(
+            f"SELECT {SEEN_ARTICLE_COLUMNS} "
+            "FROM seen_article WHERE oid = ? AND aid = ?",
+            (oid, aid),
+        ).fetchone()
+        return SeenArticle(*row) if row else None
+
+    def __contains__(self, oaid: tuple) -> bool:
+        return self.get(*oaid) is not None
+
+    def __len__(self) -> int:
+        return self.conn.execute("SELECT COUNT(*) FROM seen_article").fetchone()[0]
+
+    def iter_uploaded_since(self, upload_time: str) -> Iterator[SeenArticle]:
+        for row in self.conn.execute(
+            f"SELECT {SEEN_ARTICLE_COLUMNS} FROM seen_article "
+            "WHERE upload_time >= ? ORDER BY upload_time DESC",
+            (upload_time,),
+        ).fetchall():
+            yield SeenArticle(*row)
+
+    def add(
+        self,
+        oid: str,
+        aid: str,
+        upload_time: str,
+        edited_time: str,
+        url: Optional[str] = None,
+        content_hash: Optional[str] = None,
+        etag: Optional[str] = None,
+        last_modified: Optional[str] = None,
+    ) -> None:
+        now: str = get_now_dt_str("%Y-%m-%d %H:%M:%S")
+        self.conn.execute(
+            f"INSERT OR REPLACE INTO seen_article ({SEEN_ARTICLE_COLUMNS}) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (
+                oid,
+                aid,
+                upload_time,
+                edited_time,
+                now,
+                url,
+                content_hash,
+                etag,
+                last_modified,
+                now,
+            ),
+        )
+        self._count_write()
+
+    def add_item(
+        self,
+        item: News,
+        etag: Optional[str] = None,
+        last_modified: Optional[str] = None,
+    ) -> None:
+        self.add(
+            item.oid,
+            item.aid,
+            item.upload_time,
+            item.edited_time,
+            url=item.url,
+            content_hash=get_content_hash(item.title, item.content),
+            etag=etag,
+            last_modified=last_modified,
+        )
+
+    def mark_checked(self, oid: str, aid: str) -> None:
+        self.conn.execute(
+            "UPDATE seen_article SET checked_at = ? WHERE oid = ? AND aid = ?",
+            (get_now_dt_str("%Y-%m-%d %H:%M:%S"), oid, aid),
+        )
+        self._count_write()
+
+    def _count_write(self) -> None:
+        self._uncommitted += 1
+        if self._uncommitted >= self.commit_interval:
+            self.commit()
+
+    def commit(self) -> None:
+        self.conn.commit()
+        self._uncommitted = 0
+
+    def close(self) -> None:
+        self.commit()
+        self.conn.close()
@@ -5,8 +5,153 @@ NEWSPIDER_MODULE = "src.spiders"
 USER_AGENT = "Spider for Naver News"
 ROBOTSTXT_OBEY = False
 DOWNLOAD_DELAY = 1
-RETRY_HTTP_CODES = [500, 502, 503, 504, 522, 524, 408, 429, 403]
+# 403 / 429 는 차단 신호이므로 바로 재시도하지 않습니다. (ADAPTIVE_THROTTLE_ENABLED 이면 지연을 늘린 뒤 재시도)
+RETRY_HTTP_CODES = [500, 502, 503, 504, 522, 524, 408]
 CONCURRENT_REQUESTS = 10
 CONCURRENT_REQUESTS_PER_DOMAIN = 10
 TELNETCONSOLE_ENABLED = False
 TWISTED_REACTOR = "twisted.internet.asyncioreactor.AsyncioSelectorReactor"
+
+# 동시에 목록 / 기사를 수집할 (date, sid) 단위의 최대 개수
+FRONTIER_MAX_ACTIVE_UNITS = 4
+
+# 기사 요청은 URL 대신 (oid, aid) 로 중복을 확인합니다. (같은 기사의 read.naver / mnews 링크 등)
+DUPEFILTER_CLASS = "src.dupefilters.ArticleDupeFilter"
+
+DOWNLOADER_MIDDLEWARES = {
+    "src.middlewares.SeenArticleMiddleware": 50,
+    # RetryMiddleware(550) 보다 먼저 응답을 보도록 더 큰 값을 사용합니다.
+    "src.middlewares.AdaptiveThrottleMiddleware": 600,
+    # 압축 해제(590)와 리다이렉트(600) 이후의 응답을 저장합니다.
+    "src.cassette.CassetteRecorderMiddleware": 580,
+    # 압축 해제(590)보다 먼저 Accept-Encoding 을 지정합니다.
+    "src.middlewares.StreamingStopMiddleware": 560,
+}
+
+# host 별로 동시 요청 수와 지연을 응답 상태 / 지연 시간에 따라 조절합니다. (DOWNLOAD_DELAY 에서 시작)
+ADAPTIVE_THROTTLE_ENABLED = False
+ADAPTIVE_THROTTLE_HOSTS = ["news.naver.com", "n.news.naver.com", "media.naver.com"]
+ADAPTIVE_THROTTLE_START_CONCURRENCY = 2
+# host 별 최대 동시 요청 수 (host 수 x 이 값 까지 CONCURRENT_REQUESTS 를 늘려야 모두 사용할 수 있습니다)
+ADAPTIVE_THROTTLE_MAX_CONCURRENCY = 32
+ADAPTIVE_THROTTLE_MIN_DELAY = 0
+ADAPTIVE_THROTTLE_MAX_DELAY = 60
+ADAPTIVE_THROTTLE_TARGET_LATENCY = 2
+ADAPTIVE_THROTTLE_BACKOFF_HTTP_CODES = [403, 429, 500, 502, 503, 504]
+# RETRY_HTTP_CODES 에 없는 backoff 상태(403 / 429)를 늘어난 지연 뒤에 다시 요청하는 최대 횟수
+ADAPTIVE_THROTTLE_RETRY_TIMES = 2
+
+# 참이면 기사 응답에서 필요한 부분(div#dic_area 등)을 받은 뒤 나머지는 받지 않습니다.
+STREAMING_STOP_ENABLED = False
+# 필요한 부분을 찾지 못해도 이 크기(byte)까지만 받습니다.
+STREAMING_STOP_MAX_BYTES = 2097152
+
+# 이미 수집한 (oid, aid) 기사를 다시 요청하지 않도록 합니다.
+SEEN_INDEX_ENABLED = False
+SEEN_INDEX_PATH = "seen_articles.sqlite3"
+# 저장된 수정 시각이 이 값 이후인 기사는 다시 수집합니다. (%Y%m%d 또는 %Y-%m-%d %H:%M:%S)
+SEEN_INDEX_REFRESH_SINCE = None
+
+SPIDER_MIDDLEWARES = {
+    "src.middlewares.JournalistProfileMiddleware": 500,
+}
+
+# 기사의 기자 페이지를 (oid, id) 별로 JOURNALIST_PROFILE_TTL 초마다 한 번만 요청하여 기자 정보를 보강합니다.
+JOURNALIST_PROFILE_ENABLED = False
+JOURNALIST_PROFILE_PATH = "journalists.sqlite3"
+JOURNALIST_PROFILE_TTL = 604800
+# 기사 요청(0)보다 늦게 처리되도록 낮은 우선순위를 사용합니다.
+JOURNALIST_PROFILE_PRIORITY = -100
+
+ITEM_PIPELINES = {
+    "src.neardup.NearDuplicatePipeline": 700,
+    "src.search.SearchIndexPipeline": 750,
+    "src.pipelines.BufferedSinkPipeline": 800,
+}
+
+# 참이면 수집한 News 의 제목과 본문을 SEARCH_INDEX_PATH 역색인에 추가합니다.
+SEARCH_INDEX_ENABLED = False
+SEARCH_INDEX_PATH = "search_index"
+# 메모리에 모은 문서가 이 개수에 도달하면 segment 로 기록합니다.
+SEARCH_INDEX_SEGMENT_SIZE = 10000
+# 비슷한 크기의 segment 가 이 개수만큼 모이면 하나로 합칩니다.
+SEARCH_INDEX_MERGE_FACTOR = 10
+
+# 수집한 News 를 모아서 기록할 저장소 ("jsonl", "parquet", "sqlite", "archive"), 미지정 시 사용하지 않습니다.
+ITEM_SINK = None
+ITEM_SINK_PATH = "output"
+ITEM_SINK_BATCH_SIZE = 500
+ITEM_SINK_FLUSH_INTERVAL = 30
+
+# 본문이 거의 같은 기사(MinHash 유사도 NEAR_DUPLICATE_THRESHOLD 이상)에 같은 cluster_id 를 지정합니다.
+NEAR_DUPLICATE_ENABLED = False
+NEAR_DUPLICATE_THRESHOLD = 0.8
+NEAR_DUPLICATE_NUM_PERM = 64
+NEAR_DUPLICATE_BANDS = 16
+NEAR_DUPLICATE_MAX_SIZE = 1000000
+# 지정하면 클러스터 대표 기사의 서명을 SQLite 파일에 저장하여 다음 실행에서도 사용합니다.
+NEAR_DUPLICATE_PATH = None
+# 참이면 저장소에는 클러스터 대표 기사의 본문만 기록하고, 나머지 기사의 content 는 비워 둡니다.
+NEAR_DUPLICATE_STORE_BODY_ONCE = False
+
+# 기사 추출 방식: "selector" (CSS Selector) 또는 "fast" (정규식, 실패 시 selector 로 대체)
+ARTICLE_EXTRACTOR = "selector"
+
+# 0 보다 크면 기사 파싱(extract_article_item)을 지정한 개수의 프로세스에서 수행합니다.
+PARSE_PROCESS_POOL_WORKERS = 0
+
+# 참이면 오늘 목록의 첫 페이지를 주기적으로 확인하여, 이미 본 기사가 나올 때까지의 새 기사만 계속 수집합니다.
+TAIL_ENABLED = False
+# 새 기사가 있으면 간격을 절반으로, 없으면 두 배로 바꾸며 아래 범위(초)를 벗어나지 않습니다.
+TAIL_MIN_INTERVAL = 30
+TAIL_MAX_INTERVAL = 600
+# 한 번의 확인에서 따라갈 목록 페이지 수의 상한
+TAIL_MAX_PAGES = 10
+
+# 참이면 기사 페이지 대신 목록 페이지의 제목 / 언론사 / 시각만 Headline 으로 내보냅니다.
+HEADLINE_ONLY = False
+# Headline 중 기사 페이지까지 요청할 비율 (0 ~ 1)
+HEADLINE_ARTICLE_SAMPLE = 0
+# 지정하면 비율 대신 Headline 을 받아 기사 요청 여부를 돌려주는 함수(import 경로)를 사용합니다.
+HEADLINE_ARTICLE_PREDICATE = None
+
+# 참이면 받은 응답을 CASSETTE_PATH 에 저장합니다. 저장한 응답으로 다시 수집하려면 DOWNLOAD_HANDLERS 의
+# http / https 를 "src.cassette.CassetteDownloadHandler" 로 지정합니다.
+CASSETTE_RECORD = False
+CASSETTE_PATH = "cassette"
+
+# python -m src.runner 로 여러 spider 를 함께 실행할 때 모든 spider 가 하나의 HTTP 연결 풀을 사용합니다.
+COMBINED_SHARED_POOL = True
+
+EXTENSIONS = {
+    "src.extensions.StageMetricsExtension": 500,
+    "src.checkpoint.CheckpointExtension": 510,
+    "src.distributed.DistributedFrontierExtension": 520,
+}
+
+# 단계별 소요 시간을 spider / sid 별 히스토그램으로 기록하여 종료 시 수집 통계에 남깁니다.
+STAGE_METRICS_ENABLED = False
+# 0 보다 크면 http://STAGE_METRICS_HOST:STAGE_METRICS_PORT/metrics 로 Prometheus 형식의 값을 제공합니다.
+STAGE_METRICS_HOST = "127.0.0.1"
+STAGE_METRICS_PORT = 0
+# 기사 콜백 STAGE_PROFILER_EVERY 번마다 프로파일을 기록합니다. ("cprofile" 또는 "tracemalloc")
+STAGE_PROFILER = None
+STAGE_PROFILER_EVERY = 100
+STAGE_PROFILER_PATH = "profile"
+
+# 완료된 목록 페이지와 기사를 CHECKPOINT_PATH/{spider}.checkpoint 에 기록하여, 같은 인자로 다시 실행하면
+# 이어서 수집합니다. 기록은 CHECKPOINT_SYNC_INTERVAL 초마다 디스크에 반영됩니다.
+CHECKPOINT_ENABLED = False
+CHECKPOINT_PATH = "checkpoints"
+CHECKPOINT_SYNC_INTERVAL = 5
+
+# 지정하면 여러 노드가 공유 frontier ("sqlite:///path" 또는 "http://host:port") 로 작업을 나누어 수집합니다.
+# 각 노드는 DISTRIBUTED_WORKERS 중 자신의 DISTRIBUTED_WORKER_ID 가 맡은 consistent hash 범위의 작업을 가져갑니다.
+DISTRIBUTED_FRONTIER = None
+DISTRIBUTED_WORKER_ID = "0"
+DISTRIBUTED_WORKERS = ["0"]
+DISTRIBUTED_CLAIM_BATCH_SIZE = 100
+# 가져간 뒤 이 시간(초) 안에 완료되지 않은 작업과 이 시간 동안 아무도 가져가지 않은 작업은 다른 노드도 가져갈 수 있습니다.
+DISTRIBUTED_LEASE = 300
+# 추가 / 완료한 작업은 모아 두었다가 이 간격(초) 또는 DISTRIBUTED_CLAIM_BATCH_SIZE 개마다 별도 스레드에서 frontier 에 기록합니다.
+DISTRIBUTED_FLUSH_INTERVAL = 1
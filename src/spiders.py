@@ -1,35 +1,138 @@
+import asyncio
+import multiprocessing
 import re
+import zlib
 from abc import ABCMeta
+from contextlib import nullcontext
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
-from typing import List, Dict, Generator, Union
-from urllib.parse import urlparse, parse_qs
+from typing import (
+    List,
+    Dict,
+    Generator,
+    Union,
+    Optional,
+    Callable,
+    Type,
+    ContextManager,
+    Tuple,
+    Set,
+    TYPE_CHECKING,
+)
 
-from scrapy import Spider, Selector, Request
-from scrapy.http import Response
+from scrapy import Spider, Selector, Request, signals
+from scrapy.crawler import Crawler
+from scrapy.exceptions import DontCloseSpider, IgnoreRequest
+from scrapy.http import Response, HtmlResponse
+from scrapy.utils.misc import load_object
+from twisted.internet.interfaces import IDelayedCall
+from twisted.python.failure import Failure
 
-from src.items import News, Author
+from src.checkpoint import CheckpointStore, Oaid
+from src.distributed import DistributedFrontierExtension, WorkUnit
+from src.extractors import fast_extract_article_fields
+from src.frontier import ListFrontier, ListUnit, UnitKey
+from src.items import News, Author, AuthorTable, Headline, intern_str
+from src.metrics import StageMetrics, StageProfiler
+from src.refresh import RefreshSchedule
+from src.seen import SeenArticleIndex, SeenArticle
+from src.tail import TailState
 from src.utils import (
+    get_now_dt,
     get_now_dt_str,
+    strptime_util,
+    strftime_util,
+    get_content_hash,
+    get_header_str,
+    get_date_range,
+    split_str,
+    str_to_bool,
     remove_query_and_fragment,
+    ArticleKey,
+    parse_article_link,
+    format_article_url,
     js_object_to_json,
     get_oaid_from_news_url,
+    get_oaid_from_article_link,
+    get_page_from_list_url,
     strip_and_filter_str_list,
 )
 
+if TYPE_CHECKING:
+    from src.runner import ArticleRegistry
+
+# 기사 파싱용 프로세스 풀의 각 프로세스가 사용하는 spider 인스턴스
+_worker_spider: Optional["NewsSpider"] = None
+
+
+def _init_parse_worker(spider_cls: Type["NewsSpider"], spider_kwargs: Dict) -> None:
+    global _worker_spider
+    _worker_spider = spider_cls(**spider_kwargs)
+
+
+def _parse_article_in_worker(url: str, body: bytes, encoding: str) -> News:
+    article_res: HtmlResponse = HtmlResponse(url=url, body=body, encoding=encoding)
+    return _worker_spider.extract_article_item(article_res)
+
 
 class NewsSpider(Spider, metaclass=ABCMeta):
     name: str = "NewsSpider"
     allowed_domains: List[str] = ["naver.com"]
+    # 기사 주소의 variant (mnews / entertain / sports), 목록의 링크를 그대로 요청하면 None
+    article_variant: Optional[str] = None
+    # 범위를 넘는 페이지를 요청하면 네이버는 마지막 페이지를 돌려줍니다.
+    last_page_probe: int = 10000
 
     def __init__(
         self,
         date: str = get_now_dt_str(),
         join_char: str = "\n",
+        start_date: Optional[str] = None,
+        end_date: Optional[str] = None,
+        extractor: Optional[str] = None,
+        parse_workers: Union[int, str, None] = None,
+        headline_only: Union[bool, str] = False,
+        headline_sample: Union[float, str, None] = None,
+        headline_predicate: Union[str, Callable[[Headline], bool], None] = None,
+        tail: Union[bool, str] = False,
+        tail_min_interval: Union[float, str] = 30,
+        tail_max_interval: Union[float, str] = 600,
+        tail_max_pages: Union[int, str] = 10,
         **kwargs,
     ):
         super().__init__(**kwargs)
         self.date: str = date
         self.join_char: str = join_char
+        # 기사 추출 방식 ("selector" 또는 "fast"), from_crawler 에서 ARTICLE_EXTRACTOR 설정을 따릅니다.
+        self.extractor: str = extractor or "selector"
+        # 0 보다 크면 기사 파싱을 별도 프로세스 풀에서 수행합니다. (PARSE_PROCESS_POOL_WORKERS)
+        self.parse_workers: int = int(parse_workers or 0)
+        self.parse_pool: Optional[ProcessPoolExecutor] = None
+        # 참이면 목록 페이지의 Headline 만 내보내고, select_article 로 고른 기사만 요청합니다.
+        self.headline_only: bool = str_to_bool(headline_only)
+        self.headline_sample: float = float(headline_sample or 0)
+        if isinstance(headline_predicate, str):
+            headline_predicate = load_object(headline_predicate)
+        self.headline_predicate: Optional[Callable[[Headline], bool]] = (
+            headline_predicate
+        )
+        # 참이면 오늘 목록의 첫 페이지를 주기적으로 확인하여 새 기사만 수집하며 종료하지 않습니다.
+        self.tail: bool = str_to_bool(tail)
+        self.tail_min_interval: float = float(tail_min_interval)
+        self.tail_max_interval: float = float(tail_max_interval)
+        self.tail_max_pages: int = int(tail_max_pages)
+        self.tail_states: Dict[Optional[str], TailState] = {}
+        self.tail_calls: Dict[Optional[str], IDelayedCall] = {}
+        # start_date 만 주어지면 start_date ~ 오늘, end_date 만 주어지면 date ~ end_date
+        if start_date or end_date:
+            self.dates: List[str] = get_date_range(
+                start_date or date, end_date or get_now_dt_str()
+            )
+        else:
+            self.dates: List[str] = [date]
+        # NewsSpider 의 목록은 sid 구분이 없으므로 (date, None) 단위로만 수집합니다.
+        self.sids: List[Optional[str]] = [None]
+        self.frontier: Optional[ListFrontier] = None
         self.list_url: str = (
             "https://news.naver.com/main/list.naver?mode=LS2D&mid=sec&listType=title&"
             "date={date}&page={page}"
@@ -37,10 +140,48 @@ class NewsSpider(Spider, metaclass=ABCMeta):
         self.author_url: str = (
             "https://media.naver.com/journalist/{office_id}/{author_id}"
         )
+        self.author_table: AuthorTable = AuthorTable(self.author_url)
+        # StageMetricsExtension 이 활성화된 경우 spider_opened 에서 설정됩니다.
+        self.metrics: Optional[StageMetrics] = None
+        self.profiler: Optional[StageProfiler] = None
+        # CheckpointExtension 이 활성화된 경우 spider_opened 에서 설정됩니다.
+        self.checkpoint: Optional[CheckpointStore] = None
+        # DistributedFrontierExtension 이 활성화된 경우 spider_opened 에서 설정됩니다.
+        self.distributed: Optional[DistributedFrontierExtension] = None
+        # src.runner 로 여러 spider 를 함께 실행하는 경우 spider_opened 에서 설정됩니다.
+        self.registry: Optional["ArticleRegistry"] = None
 
         self.re_article_ptrn: re.Pattern = re.compile(r"var article = (\{[^;]+});")
         self.re_office_ptrn: re.Pattern = re.compile(r"var office = (\{[^;]+});")
 
+    @classmethod
+    def from_crawler(cls, crawler: Crawler, *args, **kwargs) -> "NewsSpider":
+        kwargs.setdefault("extractor", crawler.settings.get("ARTICLE_EXTRACTOR"))
+        kwargs.setdefault(
+            "parse_workers", crawler.settings.getint("PARSE_PROCESS_POOL_WORKERS")
+        )
+        kwargs.setdefault("headline_only", crawler.settings.getbool("HEADLINE_ONLY"))
+        kwargs.setdefault(
+            "headline_sample", crawler.settings.getfloat("HEADLINE_ARTICLE_SAMPLE")
+        )
+        kwargs.setdefault(
+            "headline_predicate", crawler.settings.get("HEADLINE_ARTICLE_PREDICATE")
+        )
+        kwargs.setdefault("tail", crawler.settings.getbool("TAIL_ENABLED"))
+        kwargs.setdefault(
+            "tail_min_interval", crawler.settings.getfloat("TAIL_MIN_INTERVAL", 30)
+        )
+        kwargs.setdefault(
+            "tail_max_interval", crawler.settings.getfloat("TAIL_MAX_INTERVAL", 600)
+        )
+        kwargs.setdefault(
+            "tail_max_pages", crawler.settings.getint("TAIL_MAX_PAGES", 10)
+        )
+        spider: NewsSpider = super().from_crawler(crawler, *args, **kwargs)
+        crawler.signals.connect(spider.spider_idle, signal=signals.spider_idle)
+        crawler.signals.connect(spider.request_dropped, signal=signals.request_dropped)
+        return spider
+
     @staticmethod
     def extract_article_links(list_res: Response) -> List[str]:
         return list_res.css("div.list_body ul.type02 li a::attr(href)").getall()
@@ -52,53 +193,192 @@ class NewsSpider(Spider, metaclass=ABCMeta):
             map(lambda x: "https://news.naver.com/main/list.naver" + x, other_pages)
         )
 
-    def fmt_list_url(self, date: Union[str, datetime], page: int = 1) -> str:
+    @staticmethod
+    def extract_last_page(list_res: Response) -> int:
+        current_page: Optional[str] = list_res.css("div.paging strong::text").get()
+        if current_page and current_page.strip().isdigit():
+            return int(current_page)
+        pages: List[int] = [
+            int(page)
+            for page in strip_and_filter_str_list(
+                list_res.css("div.paging a::text").getall()
+            )
+            if page.isdigit()
+        ]
+        return max(pages, default=1)
+
+    def fmt_list_url(
+        self, date: Union[str, datetime], page: int = 1, sid: Optional[str] = None
+    ) -> str:
         if isinstance(date, datetime):
             date = date.strftime("%Y%m%d")
         return self.list_url.format(date=date, page=page)
 
+    def convert_article_link(self, link: str) -> str:
+        return link
+
+    def extract_headline_items(
+        self, list_res: Response, unit_key: UnitKey
+    ) -> List[Headline]:
+        date, sid = unit_key
+        headlines: List[Headline] = []
+        for li in list_res.css("div.list_body ul.type02 li"):
+            link: Optional[str] = li.css("a::attr(href)").get()
+            oaid: Optional[Oaid] = get_oaid_from_article_link(link) if link else None
+            if oaid is None:
+                continue
+            list_time: str = (li.css("span.date::text").get() or "").strip()
+            try:
+                list_time = strftime_util(strptime_util(list_time))
+            except ValueError:
+                # "1분전" 처럼 상대 시각으로 표시된 경우
+                pass
+            headlines.append(
+                Headline(
+                    oid=intern_str(oaid[0]),
+                    aid=oaid[1],
+                    title="".join(li.css("a ::text").getall()).strip(),
+                    press=intern_str(
+                        (li.css("span.writing::text").get() or "").strip()
+                    ),
+                    url=self.convert_article_link(link),
+                    date=date,
+                    list_time=list_time,
+                    sid1=sid,
+                )
+            )
+        return headlines
+
+    def select_article(self, headline: Headline) -> bool:
+        # 같은 기사는 실행마다 같은 결과가 나오도록 (oid, aid) 의 hash 로 표본을 고릅니다.
+        if self.headline_predicate is not None:
+            return self.headline_predicate(headline)
+        key: bytes = f"{headline.oid}_{headline.aid}".encode("ascii")
+        return zlib.crc32(key) < self.headline_sample * 2**32
+
+    def extract_list_items(
+        self, list_res: Response, unit_key: UnitKey
+    ) -> Tuple[List[Headline], List[str]]:
+        """
+        headline_only 이면 목록의 Headline 과 그중 select_article 로 고른 기사의 링크를,
+        아니면 빈 목록과 모든 기사의 링크를 돌려줍니다.
+        """
+        if not self.headline_only:
+            return [], self.extract_article_links(list_res)
+        headlines: List[Headline] = self.extract_headline_items(list_res, unit_key)
+        return headlines, [
+            headline.url for headline in headlines if self.select_article(headline)
+        ]
+
+    def time_stage(self, stage: str, response: Response) -> ContextManager:
+        if self.metrics is None:
+            return nullcontext()
+        # 요청 없이 만든 응답(테스트, 벤치마크 등)은 meta 에 접근할 수 없습니다.
+        sid: Optional[str] = response.meta.get("sid") if response.request else None
+        return self.metrics.time(stage, self.name, sid)
+
     def extract_article_item(self, article_res: Response) -> News:
-        title: str = article_res.css("head title::text").get()
-        article_str: str = self.re_article_ptrn.search(article_res.text).group(1)
-        article_dict: Dict = js_object_to_json(article_str, ["document.title"])
-        office_str: str = self.re_office_ptrn.search(article_res.text).group(1)
-        office_dict: Dict = js_object_to_json(office_str)
-        oid, aid = get_oaid_from_news_url(article_res.url)
+        if self.extractor == "fast":
+            item: Optional[News] = self.extract_article_item_fast(article_res)
+            if item is not None:
+                return item
+            self.logger.debug(f"Fast extractor failed, fallback: {article_res.url}")
+            if getattr(self, "crawler", None):
+                self.crawler.stats.inc_value("extractor/fast_fallback")
+        return self.extract_article_item_selector(article_res)
 
+    def extract_article_item_selector(self, article_res: Response) -> News:
+        title: str = article_res.css("head title::text").get()
         content: List[str] = strip_and_filter_str_list(
             article_res.css("div#dic_area::text").getall()
         )
-        content: str = self.join_char.join(content)
         # summary: str = article_res.css("div#dic_area strong.media_end_summary::text").get()
-        sid1: str = article_dict["sectionInfo"]["firstSection"]
-        sid2: str = article_dict["sectionInfo"]["secondSection"]
-        sid3: str = article_dict["sectionInfo"]["thirdSection"]
-        url: str = remove_query_and_fragment(article_res.url)
         upload_time: str = article_res.css(
             "span._ARTICLE_DATE_TIME::attr(data-date-time)"
         ).get()
         edited_time: str = article_res.css(
             "span._ARTICLE_MODIFY_DATE_TIME::attr(data-modify-date-time)"
         ).get()
+        with self.time_stage("extract_author_item", article_res):
+            authors: List[Author] = self.extract_author_item(article_res)
+        return self.build_article_item(
+            article_res, title, content, upload_time, edited_time, authors
+        )
+
+    def extract_article_item_fast(self, article_res: Response) -> Optional[News]:
+        fields: Optional[Dict] = fast_extract_article_fields(article_res.text)
+        if fields is None:
+            return None
+        oid, aid = get_oaid_from_news_url(article_res.url)
+        with self.time_stage("extract_author_item", article_res):
+            authors: List[Author] = [
+                self.make_author_item(oid, author_id, author_name)
+                for author_id, author_name in fields["journalists"]
+            ]
+        try:
+            return self.build_article_item(
+                article_res,
+                fields["title"],
+                strip_and_filter_str_list(fields["content"]),
+                fields["upload_time"],
+                fields["edited_time"],
+                authors,
+            )
+        except (AttributeError, KeyError, ValueError):
+            return None
+
+    def build_article_item(
+        self,
+        article_res: Response,
+        title: str,
+        content: List[str],
+        upload_time: str,
+        edited_time: Optional[str],
+        authors: List[Author],
+    ) -> News:
+        article_str: str = self.re_article_ptrn.search(article_res.text).group(1)
+        article_dict: Dict = js_object_to_json(article_str, ["document.title"])
+        office_str: str = self.re_office_ptrn.search(article_res.text).group(1)
+        # var office 는 같은 언론사의 기사에서 모두 같으므로 캐시된 결과를 사용합니다.
+        office_dict: Dict = js_object_to_json(office_str, cache=True)
+        oid, aid = get_oaid_from_news_url(article_res.url)
+
+        sid1: str = article_dict["sectionInfo"]["firstSection"]
+        sid2: str = article_dict["sectionInfo"]["secondSection"]
+        sid3: str = article_dict["sectionInfo"]["thirdSection"]
+        url: str = remove_query_and_fragment(article_res.url)
         press: str = office_dict["name"]
-        authors: List[Author] = self.extract_author_item(article_res)
 
+        # 반복되는 짧은 문자열은 intern 하여 기사 사이에 공유합니다.
         item: News = News(
-            oid=oid,
+            oid=intern_str(oid),
             aid=aid,
             title=title,
-            content=content,
-            sid1=sid1,
-            sid2=sid2,
-            sid3=sid3,
+            content=self.join_char.join(content),
+            sid1=intern_str(sid1),
+            sid2=intern_str(sid2),
+            sid3=intern_str(sid3),
             url=url,
             upload_time=upload_time,
             edited_time=edited_time if edited_time else upload_time,
-            press=press,
+            press=intern_str(press),
             authors=authors,
         )
         return item
 
+    def intern_item(self, item: News) -> News:
+        # 다른 프로세스에서 파싱된 News 의 문자열과 Author 를 이 프로세스의 것으로 바꿉니다.
+        item.oid = intern_str(item.oid)
+        item.sid1 = intern_str(item.sid1)
+        item.sid2 = intern_str(item.sid2)
+        item.sid3 = intern_str(item.sid3)
+        item.press = intern_str(item.press)
+        item.authors = [self.author_table.intern(author) for author in item.authors]
+        return item
+
+    def make_author_item(self, oid: str, author_id: str, author_name: str) -> Author:
+        return self.author_table.get(oid, author_id, author_name)
+
     def extract_author_item(self, article_res: Response) -> List[Author]:
         oid, aid = get_oaid_from_news_url(article_res.url)
         author_selector_list: List[Selector] = article_res.css(
@@ -108,33 +388,517 @@ class NewsSpider(Spider, metaclass=ABCMeta):
         for author in author_selector_list:
             author_id: str = author.css("::attr(data-channelkey)").get().split("_")[1]
             author_name: str = author.css("::attr(data-messagevalue)").get()
-            author_url: str = self.author_url.format(office_id=oid, author_id=author_id)
-            author_item: Author = Author(
-                id=author_id,
-                name=author_name,
-                oid=oid,
-                url=author_url,
-            )
-            author_list.append(author_item)
+            author_list.append(self.make_author_item(oid, author_id, author_name))
 
         return author_list
 
+    def extract_profile_item(self, profile_res: Response) -> Author:
+        # 기자 페이지는 script 로 그려지므로 og 메타 태그의 정보만 사용합니다.
+        author: Author = profile_res.meta["author"]
+        description: Optional[str] = profile_res.css(
+            'meta[property="og:description"]::attr(content)'
+        ).get()
+        image_url: Optional[str] = profile_res.css(
+            'meta[property="og:image"]::attr(content)'
+        ).get()
+        return Author(
+            id=author.id,
+            name=author.name,
+            oid=author.oid,
+            url=author.url,
+            description=description.strip() if description else None,
+            image_url=image_url,
+        )
+
+    def parse_profile(self, response: Response) -> Generator[Author, None, None]:
+        with self.time_stage("extract_profile_item", response):
+            item: Author = self.extract_profile_item(response)
+        yield item
+
     def start_requests(self) -> Generator[Request, None, None]:
-        yield Request(url=self.fmt_list_url(date=self.date), callback=self.parse_list)
+        if self.tail:
+            for sid in self.sids:
+                self.tail_states[sid] = TailState(
+                    sid, self.tail_min_interval, self.tail_max_interval
+                )
+                yield self.make_tail_request(sid)
+            return
+        if self.distributed is not None:
+            # 모든 노드가 같은 시작 작업을 추가하며, 중복은 공유 frontier 에서 걸러집니다.
+            for date in self.dates:
+                for sid in self.sids:
+                    self.make_list_request(
+                        (date, sid),
+                        self.fmt_list_url(
+                            date=date, page=self.last_page_probe, sid=sid
+                        ),
+                        callback=self.parse_list_probe,
+                    )
+            yield from self.claim_requests()
+            return
+        self.frontier = ListFrontier(
+            self.dates,
+            self.sids,
+            max_active=self.settings.getint("FRONTIER_MAX_ACTIVE_UNITS", 4),
+        )
+        yield from self.next_list_requests()
+
+    def next_list_requests(self) -> Generator[Request, None, None]:
+        # 체크포인트로 요청 없이 끝난 단위가 있으면 그 자리를 다음 단위로 채웁니다.
+        while True:
+            units: List[ListUnit] = self.frontier.fill()
+            if not units:
+                return
+            for unit in units:
+                yield from self.start_unit(unit)
+
+    def start_unit(self, unit: ListUnit) -> Generator[Request, None, None]:
+        last_page: Optional[int] = (
+            self.checkpoint.get_last_page(unit.key)
+            if self.uses_checkpoint(unit.key)
+            else None
+        )
+        if last_page is None:
+            # 마지막 페이지를 한 번에 알아낸 뒤 모든 페이지를 동시에 요청합니다.
+            request: Optional[Request] = self.make_list_request(
+                unit.key,
+                self.fmt_list_url(
+                    date=unit.date, page=self.last_page_probe, sid=unit.sid
+                ),
+                callback=self.parse_list_probe,
+            )
+            if request is not None:
+                yield request
+            return
+
+        # 이전 실행에서 마지막 페이지를 알아낸 단위는 완료되지 않은 페이지만 요청합니다.
+        requested: bool = False
+        for page in range(1, last_page + 1):
+            if self.checkpoint.is_page_done(unit.key, page):
+                continue
+            request: Optional[Request] = self.make_list_request(
+                unit.key, self.fmt_list_url(date=unit.date, page=page, sid=unit.sid)
+            )
+            if request is not None:
+                requested = True
+                yield request
+        if not requested:
+            self.frontier.finish_unit(unit.key)
+
+    def uses_checkpoint(self, unit_key: UnitKey) -> bool:
+        # 오늘 날짜의 목록은 새 기사가 앞에 추가되어 페이지가 밀리므로 페이지 단위로 기록하지 않습니다.
+        return (
+            self.checkpoint is not None
+            and self.distributed is None
+            and unit_key[0] != get_now_dt_str()
+        )
+
+    def make_list_request(
+        self,
+        unit_key: UnitKey,
+        url: str,
+        callback: Optional[Callable] = None,
+        follow_pages: bool = False,
+    ) -> Optional[Request]:
+        callback = callback or self.parse_list
+        if self.distributed is not None:
+            # 분산 모드에서는 요청 대신 공유 frontier 에 작업을 추가합니다.
+            date, sid = unit_key
+            self.distributed.push(
+                WorkUnit(
+                    key=self.get_list_work_key(unit_key, url),
+                    kind=(
+                        "probe"
+                        if callback == self.parse_list_probe
+                        else "follow" if follow_pages else "list"
+                    ),
+                    url=url,
+                    date=date,
+                    sid=sid,
+                )
+            )
+            return None
+        # 목록 페이지 중복은 frontier 가 걸러내므로 dupefilter 는 거치지 않습니다.
+        if not self.frontier.add_page(unit_key, url):
+            return None
+        return self.build_list_request(unit_key, url, callback, follow_pages)
+
+    def build_list_request(
+        self,
+        unit_key: UnitKey,
+        url: str,
+        callback: Callable,
+        follow_pages: bool = False,
+        work_key: Optional[str] = None,
+    ) -> Request:
+        return Request(
+            url=url,
+            callback=callback,
+            errback=self.errback_list,
+            meta={
+                "unit": unit_key,
+                "sid": unit_key[1],
+                "list_url": url,
+                "follow_pages": follow_pages,
+                "work_key": work_key,
+            },
+            dont_filter=True,
+        )
+
+    @staticmethod
+    def get_list_work_key(unit_key: UnitKey, url: str) -> str:
+        date, sid = unit_key
+        return f"L:{date}:{sid or '-'}:{get_page_from_list_url(url)}"
+
+    @staticmethod
+    def get_article_work_key(link: str, oaid: Optional[Oaid]) -> str:
+        return f"A:{oaid[0]}:{oaid[1]}" if oaid else f"U:{link}"
+
+    def claim_requests(
+        self, units: Optional[List[WorkUnit]] = None
+    ) -> Generator[Request, None, None]:
+        # 공유 frontier 에서 가져온 작업(미지정 시 지금 가져옵니다)을 요청으로 만듭니다.
+        unit: WorkUnit
+        for unit in self.distributed.claim() if units is None else units:
+            if unit.kind == "article":
+                yield self.build_article_request(
+                    unit.url,
+                    get_oaid_from_article_link(unit.url),
+                    unit.sid,
+                    unit.key,
+                )
+            else:
+                yield self.build_list_request(
+                    (unit.date, unit.sid),
+                    unit.url,
+                    (
+                        self.parse_list_probe
+                        if unit.kind == "probe"
+                        else self.parse_list
+                    ),
+                    follow_pages=unit.kind == "follow",
+                    work_key=unit.key,
+                )
+
+    def make_article_request(
+        self, link: str, sid: Optional[str] = None
+    ) -> Optional[Request]:
+        # meta["oaid"] 는 수집 이력 확인 등 Downloader Middleware 에서 기사 키로 사용합니다.
+        # meta["sid"] 는 기사를 찾은 목록의 sid 로, 단계별 소요 시간을 구분하는 데 사용합니다.
+        oaid: Optional[Oaid] = get_oaid_from_article_link(link)
+        if self.checkpoint is not None and self.checkpoint.has_article(oaid):
+            self.crawler.stats.inc_value("checkpoint/skipped_articles")
+            return None
+        if self.registry is not None and self.registry.dispatch(self, link, oaid, sid):
+            return None
+        if self.distributed is not None:
+            self.distributed.push(
+                WorkUnit(
+                    key=self.get_article_work_key(link, oaid),
+                    kind="article",
+                    url=link,
+                    sid=sid,
+                )
+            )
+            return None
+        return self.build_article_request(link, oaid, sid)
+
+    def build_article_request(
+        self,
+        link: str,
+        oaid: Optional[Oaid],
+        sid: Optional[str] = None,
+        work_key: Optional[str] = None,
+    ) -> Request:
+        return Request(
+            url=link,
+            callback=(
+                self.parse_article_offload if self.parse_workers else self.parse_article
+            ),
+            errback=self.errback_article,
+            meta={"oaid": oaid, "sid": sid, "work_key": work_key},
+            # 분산 모드의 중복은 공유 frontier 에서 걸러집니다.
+            dont_filter=work_key is not None,
+        )
+
+    def make_article_requests(
+        self,
+        unit_key: UnitKey,
+        list_url: str,
+        links: List[str],
+        page: Optional[int] = None,
+    ) -> List[Request]:
+        requests: List[Request] = []
+        for link in links:
+            request: Optional[Request] = self.make_article_request(link, unit_key[1])
+            if request is not None:
+                requests.append(request)
+        if self.frontier is not None:
+            # 기사 요청이 모두 처리될 때까지 단위를 끝내지 않습니다.
+            for request in requests:
+                request.meta["list_unit"] = unit_key
+                self.frontier.add_article(unit_key, request.url)
+        if self.uses_checkpoint(unit_key):
+            # 기사 요청을 내보내기 전에 페이지를 등록해야 기사 처리 결과를 놓치지 않습니다.
+            self.checkpoint.add_page(
+                unit_key,
+                page or get_page_from_list_url(list_url),
+                [request.meta["oaid"] for request in requests if request.meta["oaid"]],
+            )
+        return requests
+
+    def parse_list_probe(
+        self, response: Response
+    ) -> Generator[Union[Request, Headline], None, None]:
+        unit_key: UnitKey = response.meta["unit"]
+        date, sid = unit_key
+        with self.time_stage("extract_article_links", response):
+            headlines, article_links = self.extract_list_items(response, unit_key)
+        if not headlines and not article_links:
+            # 마지막 페이지로 보정되지 않은 경우, 첫 페이지부터 페이지 링크를 따라갑니다.
+            request: Optional[Request] = self.make_list_request(
+                unit_key, self.fmt_list_url(date=date, sid=sid), follow_pages=True
+            )
+            if request is not None:
+                yield request
+        else:
+            last_page: int = self.extract_last_page(response)
+            if self.uses_checkpoint(unit_key):
+                self.checkpoint.set_last_page(unit_key, last_page)
+            # 응답은 마지막 페이지이므로 나머지 1 ~ (last_page - 1) 페이지만 요청합니다.
+            for page in range(1, last_page):
+                if self.uses_checkpoint(unit_key) and self.checkpoint.is_page_done(
+                    unit_key, page
+                ):
+                    continue
+                request: Optional[Request] = self.make_list_request(
+                    unit_key, self.fmt_list_url(date=date, page=page, sid=sid)
+                )
+                if request is not None:
+                    yield request
+
+            yield from headlines
+            yield from self.make_article_requests(
+                unit_key, response.meta["list_url"], article_links, last_page
+            )
+
+        yield from self.finish_list_page(unit_key, response.meta["list_url"])
+
+    def finish_list_page(
+        self, unit_key: UnitKey, url: str, failed: bool = False
+    ) -> Generator[Request, None, None]:
+        if self.distributed is not None:
+            self.distributed.complete(self.get_list_work_key(unit_key, url), failed)
+            return
+        if self.frontier.finish_page(unit_key, url):
+            yield from self.next_list_requests()
+
+    def finish_article(self, request: Request) -> Generator[Request, None, None]:
+        if self.frontier is None:
+            return
+        unit_key: Optional[UnitKey] = request.meta.get("list_unit")
+        if unit_key is None:
+            return
+        # 리다이렉트된 요청은 처음 요청한 주소로 등록되어 있습니다.
+        url: str = request.meta.get("redirect_urls", [request.url])[0]
+        if self.frontier.finish_article(unit_key, url):
+            yield from self.next_list_requests()
+
+    def parse_list(
+        self, response: Response
+    ) -> Generator[Union[Request, Headline], None, None]:
+        unit_key: UnitKey = response.meta["unit"]
+        if response.meta.get("follow_pages"):
+            for page in self.extract_pages(response):
+                request: Optional[Request] = self.make_list_request(
+                    unit_key, page, follow_pages=True
+                )
+                if request is not None:
+                    yield request
+
+        with self.time_stage("extract_article_links", response):
+            headlines, article_links = self.extract_list_items(response, unit_key)
+        yield from headlines
+        yield from self.make_article_requests(
+            unit_key, response.meta["list_url"], article_links
+        )
+
+        yield from self.finish_list_page(unit_key, response.meta["list_url"])
+
+    def errback_list(self, failure: Failure) -> Generator[Request, None, None]:
+        request: Request = failure.request
+        self.logger.error(f"Failed to fetch list page {request.url}: {failure!r}")
+        yield from self.finish_list_page(
+            request.meta["unit"], request.meta["list_url"], failed=True
+        )
+
+    def errback_article(self, failure: Failure) -> Generator[Request, None, None]:
+        request: Request = failure.request
+        # 수집 이력 등으로 걸러진 요청은 오류로 기록하지 않습니다.
+        if not failure.check(IgnoreRequest):
+            self.logger.error(f"Failed to fetch article {request.url}: {failure!r}")
+        if self.checkpoint is not None:
+            self.checkpoint.finish_article(request.meta.get("oaid"), emitted=False)
+        if self.distributed is not None:
+            self.distributed.complete(request.meta.get("work_key"), failed=True)
+        yield from self.finish_article(request)
+
+    def request_dropped(self, request: Request, spider: Spider) -> None:
+        # dupefilter 등 scheduler 에서 버린 기사 요청은 콜백이 호출되지 않습니다.
+        if spider is not self:
+            return
+        if self.checkpoint is not None:
+            # 앞서 실패한 기사가 다른 목록 페이지에 다시 나오면 그 페이지가 기다리지 않게 합니다.
+            self.checkpoint.finish_article(request.meta.get("oaid"), emitted=False)
+        for next_request in self.finish_article(request):
+            self.crawler.engine.crawl(next_request)
+
+    def make_tail_request(self, sid: Optional[str], page: int = 1) -> Request:
+        # 자정이 지나면 새 날짜의 목록을 확인합니다.
+        date: str = get_now_dt_str()
+        url: str = self.fmt_list_url(date=date, page=page, sid=sid)
+        return Request(
+            url=url,
+            callback=self.parse_tail,
+            errback=self.errback_tail,
+            # 같은 목록 페이지를 반복해서 요청합니다.
+            dont_filter=True,
+            meta={"unit": (date, sid), "list_url": url, "sid": sid, "page": page},
+        )
+
+    def parse_tail(
+        self, response: Response
+    ) -> Generator[Union[Request, Headline], None, None]:
+        unit_key: UnitKey = response.meta["unit"]
+        state: TailState = self.tail_states[unit_key[1]]
+        page: int = response.meta["page"]
+        with self.time_stage("extract_article_links", response):
+            headlines, article_links = self.extract_list_items(response, unit_key)
+        oaids: List[Optional[Oaid]] = (
+            [(headline.oid, headline.aid) for headline in headlines]
+            if self.headline_only
+            else list(map(get_oaid_from_article_link, article_links))
+        )
+        new_oaids, reached = state.find_new(oaids)
+        new_oaid_set: Set[Oaid] = set(new_oaids)
+        state.add(new_oaids)
+        self.crawler.stats.inc_value("tail/new_articles", len(new_oaids))
+        for headline in headlines:
+            if (headline.oid, headline.aid) in new_oaid_set:
+                yield headline
+        for link in article_links:
+            if get_oaid_from_article_link(link) in new_oaid_set:
+                request: Optional[Request] = self.make_article_request(
+                    link, unit_key[1]
+                )
+                if request is not None:
+                    yield request
+
+        # 이미 본 기사를 만날 때까지 다음 페이지로 넘어갑니다.
+        if reached or not state.primed or not new_oaids:
+            self.schedule_tail(state)
+        elif page >= self.tail_max_pages:
+            self.crawler.stats.inc_value("tail/overflow")
+            self.schedule_tail(state, overflowed=True)
+        else:
+            yield self.make_tail_request(state.sid, page + 1)
+
+    def errback_tail(self, failure: Failure) -> None:
+        request: Request = failure.request
+        self.logger.error(f"Failed to fetch list page {request.url}: {failure!r}")
+        self.schedule_tail(self.tail_states[request.meta["unit"][1]])
+
+    def schedule_tail(self, state: TailState, overflowed: bool = False) -> None:
+        from twisted.internet import reactor
+
+        interval: float = state.finish_poll(overflowed)
+        self.tail_calls[state.sid] = reactor.callLater(
+            interval, self.crawl_tail, state.sid
+        )
 
-    def parse_list(self, response: Response) -> Generator[Request, None, None]:
-        for page in self.extract_pages(response):
-            yield Request(url=page, callback=self.parse_list)
+    def crawl_tail(self, sid: Optional[str]) -> None:
+        self.tail_calls.pop(sid, None)
+        self.crawler.engine.crawl(self.make_tail_request(sid))
 
-        for link in self.extract_article_links(response):
-            yield Request(url=link, callback=self.parse_article)
+    def has_pending_work(self) -> bool:
+        # 요청이 모두 끝난 idle 상태에서도 이어서 요청을 만들 작업이 남아 있는지 확인합니다.
+        return (
+            bool(self.tail_calls)
+            or (self.frontier is not None and not self.frontier.done)
+            or (self.distributed is not None and not self.distributed.frontier_finished)
+        )
+
+    def spider_idle(self, spider: Spider) -> None:
+        # 다음 확인을 기다리는 동안 종료되지 않도록 합니다.
+        if self.tail_calls:
+            raise DontCloseSpider
+        # 요청이 모두 끝났는데 남은 단위가 있으면, 처리 결과를 받지 못한 기사 요청이 있었던
+        # 것이므로 기다리지 않고 다음 단위를 시작합니다.
+        if self.frontier is not None and self.frontier.release_articles():
+            requested: bool = False
+            for request in self.next_list_requests():
+                self.crawler.engine.crawl(request)
+                requested = True
+            if requested:
+                raise DontCloseSpider
+
+    def parse_article(
+        self, response: Response
+    ) -> Generator[Union[News, Request], None, None]:
+        with self.sample_profile():
+            with self.time_stage("extract_article_item", response):
+                item: News = self.extract_article_item(response)
+        yield item
+        yield from self.finish_article(response.request)
 
-    def parse_article(self, response: Response) -> Generator[News, None, None]:
-        yield self.extract_article_item(response)
+    def sample_profile(self) -> ContextManager:
+        if self.profiler is None:
+            return nullcontext()
+        return self.profiler.sample(self.name)
+
+    def get_parse_pool(self) -> ProcessPoolExecutor:
+        if self.parse_pool is None:
+            # reactor 스레드를 복제하지 않도록 fork 대신 spawn 으로 프로세스를 만듭니다.
+            self.parse_pool = ProcessPoolExecutor(
+                max_workers=self.parse_workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_parse_worker,
+                initargs=(
+                    type(self),
+                    {"join_char": self.join_char, "extractor": self.extractor},
+                ),
+            )
+        return self.parse_pool
+
+    async def parse_article_offload(
+        self, response: Response
+    ) -> List[Union[News, Request]]:
+        # 프로세스 간 전달 시간을 포함한 대기 시간을 기록하며, 프로파일에는 이 프로세스에서
+        # 수행하는 응답 / 결과 전달과 intern 이 기록됩니다.
+        with self.sample_profile():
+            with self.time_stage("extract_article_item", response):
+                item: News = await asyncio.get_event_loop().run_in_executor(
+                    self.get_parse_pool(),
+                    _parse_article_in_worker,
+                    response.url,
+                    response.body,
+                    response.encoding,
+                )
+            return [self.intern_item(item), *self.finish_article(response.request)]
+
+    def closed(self, reason: str) -> None:
+        for call in self.tail_calls.values():
+            if call.active():
+                call.cancel()
+        self.tail_calls = {}
+        if self.parse_pool is not None:
+            self.parse_pool.shutdown(wait=True)
+            self.parse_pool = None
 
 
 class LSDSpider(NewsSpider, metaclass=ABCMeta):
     name: str = "LSDSpider"
+    article_variant: Optional[str] = "mnews"
 
     def __init__(
         self,
@@ -149,38 +913,36 @@ class LSDSpider(NewsSpider, metaclass=ABCMeta):
             "&sid1={sid1}&date={date}&page={page}"
         )
         self.article_url: str = "https://n.news.naver.com/mnews/article/{oid}/{aid}"
-        self.sid: str = sid
+        # 쉼표로 구분된 여러 sid 를 입력받을 수 있습니다. (예: "100,101,102")
+        self.sids: List[str] = split_str(sid)
+        self.sid: str = self.sids[0]
 
-    def convert_url(self, url: str, conv: str = "mnews") -> str:
-        if "mnews" in url and conv != "mnews":
-            url: str = url.replace("mnews", conv)
-        else:
-            parsed_url: urlparse = urlparse(url)
-            query_dict: Dict = parse_qs(parsed_url.query)
-            oid: str = query_dict["oid"][0]
-            aid: str = query_dict["aid"][0]
-            url = self.article_url.format(oid=oid, aid=aid)
-        return remove_query_and_fragment(url)
-
-    def fmt_list_url(self, date: Union[str, datetime], page: int = 1) -> str:
+    def convert_url(self, url: str, conv: Optional[str] = None) -> str:
+        # 목록의 read.naver 링크와 다른 variant 의 기사 링크 모두 conv 의 기사 주소로 바꿉니다.
+        key: Optional[ArticleKey] = parse_article_link(url)
+        if key is None:
+            return remove_query_and_fragment(url)
+        return format_article_url(key, conv or self.article_variant)
+
+    def fmt_list_url(
+        self, date: Union[str, datetime], page: int = 1, sid: Optional[str] = None
+    ) -> str:
         if isinstance(date, datetime):
             date = date.strftime("%Y%m%d")
-        return self.list_url.format(sid1=self.sid, date=date, page=page)
+        return self.list_url.format(sid1=sid or self.sid, date=date, page=page)
+
+    def convert_article_link(self, link: str) -> str:
+        return self.convert_url(link)
 
     def extract_article_links(self, list_res: Response) -> List[str]:
         link_list: List[str] = super().extract_article_links(list_res)
 
         return list(map(self.convert_url, link_list))
 
-    def start_requests(self) -> Generator[Request, None, None]:
-        yield Request(
-            url=self.fmt_list_url(self.date),
-            callback=self.parse_list,
-        )
-
 
 class EntSpider(LSDSpider, metaclass=ABCMeta):
     name: str = "EntSpider"
+    article_variant: Optional[str] = "entertain"
 
     def __init__(
         self,
@@ -192,12 +954,10 @@ class EntSpider(LSDSpider, metaclass=ABCMeta):
         super().__init__(date=date, join_char=join_char, sid=sid, **kwargs)
         self.article_url: str = "https://n.news.naver.com/entertain/article/{oid}/{aid}"
 
-    def convert_url(self, url: str, conv: str = "entertain") -> str:
-        return super().convert_url(url, conv)
-
 
 class SportSpider(LSDSpider, metaclass=ABCMeta):
     name: str = "SportSpider"
+    article_variant: Optional[str] = "sports"
 
     def __init__(
         self,
@@ -209,5 +969,95 @@ class SportSpider(LSDSpider, metaclass=ABCMeta):
         super().__init__(date=date, join_char=join_char, sid=sid, **kwargs)
         self.article_url: str = "https://n.news.naver.com/sports/article/{oid}/{aid}"
 
-    def convert_url(self, url: str, conv: str = "sports") -> str:
-        return super().convert_url(url, conv)
+
+class RefreshSpider(NewsSpider, metaclass=ABCMeta):
+    """
+    수집 이력(SEEN_INDEX_PATH)에 저장된 최근 기사를 다시 요청하여, 수정 시각이나 본문이 바뀐
+    기사만 다시 내보내는 Spider
+
+    확인 주기는 RefreshSchedule 을 따르며, 이전 응답의 ETag / Last-Modified 로 조건부 요청을 합니다.
+    """
+
+    name: str = "RefreshSpider"
+
+    def __init__(
+        self,
+        join_char: str = "\n",
+        index_path: str = "seen_articles.sqlite3",
+        **kwargs,
+    ):
+        super().__init__(join_char=join_char, **kwargs)
+        self.index_path: str = index_path
+        self.index: Optional[SeenArticleIndex] = None
+        self.schedule: RefreshSchedule = RefreshSchedule()
+
+    @classmethod
+    def from_crawler(cls, crawler: Crawler, *args, **kwargs) -> "RefreshSpider":
+        kwargs.setdefault(
+            "index_path",
+            crawler.settings.get("SEEN_INDEX_PATH", "seen_articles.sqlite3"),
+        )
+        return super().from_crawler(crawler, *args, **kwargs)
+
+    def start_requests(self) -> Generator[Request, None, None]:
+        self.index = SeenArticleIndex(self.index_path)
+        now: datetime = get_now_dt()
+        fmt: str = "%Y-%m-%d %H:%M:%S"
+        record: SeenArticle
+        for record in self.index.iter_uploaded_since(
+            strftime_util(now - self.schedule.max_age, fmt)
+        ):
+            if not record.url:
+                continue
+            upload_time: datetime = strptime_util(record.upload_time, fmt)
+            checked_at: Optional[datetime] = (
+                strptime_util(record.checked_at, fmt) if record.checked_at else None
+            )
+            if not self.schedule.is_due(upload_time, checked_at, now):
+                continue
+            headers: Dict[str, str] = {}
+            if record.etag:
+                headers["If-None-Match"] = record.etag
+            if record.last_modified:
+                headers["If-Modified-Since"] = record.last_modified
+            yield Request(
+                url=record.url,
+                callback=self.parse_refresh,
+                headers=headers,
+                priority=self.schedule.get_priority(upload_time, now),
+                dont_filter=True,
+                meta={
+                    "oaid": (record.oid, record.aid),
+                    "refresh": True,
+                    "seen_article": record,
+                    "handle_httpstatus_list": [304],
+                },
+            )
+
+    def parse_refresh(self, response: Response) -> Generator[News, None, None]:
+        record: SeenArticle = response.meta["seen_article"]
+        if response.status == 304:
+            self.crawler.stats.inc_value("refresh/not_modified")
+            self.index.mark_checked(record.oid, record.aid)
+            return
+        item: News = self.extract_article_item(response)
+        if (
+            item.edited_time == record.edited_time
+            and get_content_hash(item.title, item.content) == record.content_hash
+        ):
+            self.crawler.stats.inc_value("refresh/unchanged")
+            self.index.mark_checked(record.oid, record.aid)
+            return
+        self.crawler.stats.inc_value("refresh/changed")
+        self.index.add_item(
+            item,
+            etag=get_header_str(response, "ETag"),
+            last_modified=get_header_str(response, "Last-Modified"),
+        )
+        yield item
+
+    def closed(self, reason: str) -> None:
+        super().closed(reason)
+        if self.index is not None:
+            self.index.close()
+            self.index = None
@@ -0,0 +1,71 @@
+from collections import OrderedDict
+from typing import Iterable, List, Optional, Tuple
+
+Oaid = Tuple[str, str]
+
+
+class TailState:
+    """
+    tail 모드에서 한 sid 목록의 최근 기사와 다음 확인까지의 간격을 관리하는 상태
+
+    새 기사가 있으면 간격을 절반으로 줄이고, 없으면 두 배로 늘려 조용한 시간대에는 드물게
+    확인합니다. 최근 기사는 max_seen 개까지만 기억합니다.
+    """
+
+    def __init__(
+        self,
+        sid: Optional[str],
+        min_interval: float = 30.0,
+        max_interval: float = 600.0,
+        max_seen: int = 5000,
+    ):
+        self.sid: Optional[str] = sid
+        self.min_interval: float = min_interval
+        self.max_interval: float = max_interval
+        self.max_seen: int = max_seen
+        self.interval: float = min_interval
+        self.seen: "OrderedDict[Oaid, None]" = OrderedDict()
+        # 첫 확인(primed 이전)은 목록의 첫 페이지만 수집합니다.
+        self.primed: bool = False
+        # 진행 중인 확인에서 찾은 새 기사 수
+        self.new_count: int = 0
+
+    def __contains__(self, oaid: Oaid) -> bool:
+        return oaid in self.seen
+
+    def find_new(self, oaids: Iterable[Optional[Oaid]]) -> Tuple[List[Oaid], bool]:
+        """
+        최신순 목록에서 이미 본 기사 앞까지의 새 기사와, 이미 본 기사를 만났는지 여부를 돌려줍니다.
+        """
+        new_oaids: List[Oaid] = []
+        for oaid in oaids:
+            if oaid is None:
+                continue
+            if oaid in self.seen:
+                return new_oaids, True
+            new_oaids.append(oaid)
+        return new_oaids, False
+
+    def add(self, oaids: Iterable[Oaid]) -> None:
+        for oaid in oaids:
+            if oaid in self.seen:
+                continue
+            self.seen[oaid] = None
+            self.new_count += 1
+            if len(self.seen) > self.max_seen:
+                self.seen.popitem(last=False)
+
+    def finish_poll(self, overflowed: bool = False) -> float:
+        """
+        확인을 마치고 다음 확인까지의 간격(초)을 돌려줍니다. overflowed 는 이미 본 기사를 만나기
+        전에 페이지 수 상한에 도달한 경우입니다.
+        """
+        if overflowed:
+            self.interval = self.min_interval
+        elif self.new_count and self.primed:
+            self.interval = max(self.min_interval, self.interval / 2)
+        elif not self.new_count:
+            self.interval = min(self.max_interval, self.interval * 2)
+        self.primed = True
+        self.new_count = 0
+        return self.interval
@@ -1,20 +1,94 @@
+import hashlib
 import json
+import os
 import re
-from datetime import datetime
-from typing import Optional, Dict, List, Iterable, Callable, Tuple
-from urllib.parse import urlsplit, urlunsplit, urlparse, ParseResult
+from datetime import datetime, timedelta
+from functools import lru_cache
+from typing import (
+    Optional,
+    Dict,
+    List,
+    Iterable,
+    Callable,
+    Tuple,
+    FrozenSet,
+    Union,
+    NamedTuple,
+)
+from urllib.parse import urlsplit, urlunsplit, urlparse, ParseResult, parse_qs
 
 import requests
-from scrapy.http import HtmlResponse
+from scrapy.http import HtmlResponse, Response
 
+from src.cassette import Cassette, record_to_response
 from src.settings import USER_AGENT
 
+try:
+    import orjson
+
+    json_loads: Callable = orjson.loads
+except ImportError:
+    json_loads: Callable = json.loads
+
+# 문자열("..." / '...'), 객체 끝의 쉼표, 식별자(속성 접근 포함)와 뒤따르는 ":" 를 한 번에 찾습니다.
+re_js_token_ptrn: re.Pattern = re.compile(
+    r"""("(?:[^"\\]|\\.)*")"""
+    r"""|'((?:[^'\\]|\\.)*)'"""
+    r"""|(,\s*(?=[}\]]))"""
+    r"""|([\w$]+(?:\.[\w$]+)*)(\s*:)?""",
+    re.S,
+)
+re_js_single_quoted_ptrn: re.Pattern = re.compile(r'\\.|"', re.S)
+
+# 기사 링크의 "oid=" / "aid=" query 와 ".../{variant}/article/{oid}/{aid}" 경로
+re_oid_query_ptrn: re.Pattern = re.compile(r"[?&]oid=(\w+)")
+re_aid_query_ptrn: re.Pattern = re.compile(r"[?&]aid=(\w+)")
+re_article_path_ptrn: re.Pattern = re.compile(
+    r"^\w+://[^/?#]+/(?:(\w+)/)?article/(\w+)/(\w+)(?=[/?#]|$)"
+)
+ARTICLE_URL_FMT: str = "https://n.news.naver.com/{variant}/article/{oid}/{aid}"
+
 
 def remove_query_and_fragment(url: str) -> str:
     return urlunsplit(urlsplit(url)._replace(query="", fragment=""))
 
 
+class ArticleKey(NamedTuple):
+    oid: str
+    aid: str
+    # ".../{variant}/article/{oid}/{aid}" 링크의 variant ("mnews", "entertain", "sports")
+    variant: Optional[str]
+
+
+@lru_cache(maxsize=65536)
+def parse_article_link(url: str) -> Optional[ArticleKey]:
+    """
+    기사 링크를 (oid, aid, variant) 로 바꿉니다. 같은 링크는 목록, 요청 중복 확인, 기사 추출에서
+    여러 번 사용되므로 결과를 저장해 둡니다.
+
+    "...?oid=...&aid=..." (목록의 read.naver 링크 등)와 ".../{variant}/article/{oid}/{aid}" 형식을
+    지원하며, 기사 링크가 아니면 None 을 반환합니다.
+    """
+    oid_match: Optional[re.Match] = re_oid_query_ptrn.search(url)
+    aid_match: Optional[re.Match] = re_aid_query_ptrn.search(url)
+    if oid_match and aid_match:
+        return ArticleKey(oid_match.group(1), aid_match.group(1), None)
+    path_match: Optional[re.Match] = re_article_path_ptrn.match(url)
+    if path_match:
+        return ArticleKey(path_match.group(2), path_match.group(3), path_match.group(1))
+    return None
+
+
+def format_article_url(key: ArticleKey, variant: Optional[str] = None) -> str:
+    return ARTICLE_URL_FMT.format(
+        variant=variant or key.variant or "mnews", oid=key.oid, aid=key.aid
+    )
+
+
 def get_oaid_from_news_url(url: str) -> Tuple[str, str]:
+    key: Optional[ArticleKey] = parse_article_link(url)
+    if key is not None:
+        return key.oid, key.aid
     url_split: ParseResult = urlparse(url)
     path_split: List[str] = url_split.path.split("/")
     oid: str = path_split[-2]
@@ -22,6 +96,17 @@ def get_oaid_from_news_url(url: str) -> Tuple[str, str]:
     return oid, aid
 
 
+def get_oaid_from_article_link(url: str) -> Optional[Tuple[str, str]]:
+    # 목록의 링크는 "read.naver?oid=...&aid=..." 또는 ".../article/{oid}/{aid}" 형식입니다.
+    key: Optional[ArticleKey] = parse_article_link(url)
+    return (key.oid, key.aid) if key is not None else None
+
+
+def get_page_from_list_url(url: str) -> int:
+    page: List[str] = parse_qs(urlparse(url).query).get("page", ["1"])
+    return int(page[0]) if page[0].isdigit() else 1
+
+
 def strptime_util(
     datetime_str: str,
     fmt: str = "%Y.%m.%d. %p %I:%M",
@@ -46,39 +131,165 @@ def get_now_dt_str(fmt: str = "%Y%m%d") -> str:
     return get_now_dt().strftime(fmt)
 
 
+def normalize_dt_str(datetime_str: str) -> str:
+    # "%Y%m%d" 형식의 날짜를 기사 시각과 비교할 수 있는 "%Y-%m-%d %H:%M:%S" 형식으로 맞춥니다.
+    if len(datetime_str) == 8 and datetime_str.isdigit():
+        return strftime_util(datetime.strptime(datetime_str, "%Y%m%d"))
+    return datetime_str
+
+
+def get_date_range(start_date: str, end_date: str, fmt: str = "%Y%m%d") -> List[str]:
+    start_dt: datetime = datetime.strptime(start_date, fmt)
+    end_dt: datetime = datetime.strptime(end_date, fmt)
+    if start_dt > end_dt:
+        raise ValueError(f"start_date({start_date}) is after end_date({end_date})")
+    return [
+        (start_dt + timedelta(days=i)).strftime(fmt)
+        for i in range((end_dt - start_dt).days + 1)
+    ]
+
+
 def strip_and_filter_str_list(
     str_list: List[str], func: Callable = lambda x: x != ""
 ) -> List[str]:
     return list(filter(func, map(lambda x: x.strip(), str_list)))
 
 
+def get_content_hash(*strings: Optional[str]) -> str:
+    return hashlib.sha1(
+        "\x00".join(s or "" for s in strings).encode("utf-8")
+    ).hexdigest()
+
+
+def get_header_str(response: Response, name: str) -> Optional[str]:
+    value: Optional[bytes] = response.headers.get(name) if response else None
+    return value.decode("latin-1") if value else None
+
+
+def str_to_bool(value: Union[bool, str, None]) -> bool:
+    # spider 인자(-a)는 문자열로 전달됩니다.
+    return str(value).lower() in ("1", "true", "yes")
+
+
+def split_str(string: str, sep: str = ",") -> List[str]:
+    return strip_and_filter_str_list(string.split(sep))
+
+
 def js_object_to_json(
-    js_object: str, remove_str_iter: Optional[Iterable[str]] = None
+    js_object: str,
+    remove_str_iter: Optional[Iterable[str]] = None,
+    cache: bool = False,
 ) -> Dict:
-    result: str = re.sub(r"(\w+)\s*:", r'"\1":', js_object)
-    if remove_str_iter:
-        for string in remove_str_iter:
-            result = result.replace(string, '""')
-    return json.loads(result)
+    """
+    JS 객체 리터럴을 dict 로 변환합니다.
+
+    remove_str_iter 의 식별자(예: "document.title")는 빈 문자열로 바뀝니다.
+    cache 가 참이면 같은 문자열에 대해 이전 결과를 그대로 반환하므로, 결과를 수정하면 안 됩니다.
+    """
+    remove_strs: FrozenSet[str] = frozenset(remove_str_iter or ())
+    if cache:
+        return _js_object_to_json_cached(js_object, remove_strs)
+    return json_loads(_js_object_to_json_str(js_object, remove_strs))
+
+
+def _escape_js_char(match: re.Match) -> str:
+    # 작은따옴표 문자열을 큰따옴표 문자열로 옮길 때 \' 는 ' 로, " 는 \" 로 바꿉니다.
+    char: str = match.group()
+    if char == '"':
+        return '\\"'
+    if char == "\\'":
+        return "'"
+    return char
+
+
+@lru_cache(maxsize=1024)
+def _js_object_to_json_cached(js_object: str, remove_strs: FrozenSet[str]) -> Dict:
+    return json_loads(_js_object_to_json_str(js_object, remove_strs))
+
+
+def _js_object_to_json_str(js_object: str, remove_strs: FrozenSet[str]) -> str:
+    def replace(match: re.Match) -> str:
+        double_quoted, single_quoted, trailing_comma, identifier, colon = match.groups()
+        if double_quoted is not None:
+            return double_quoted
+        if single_quoted is not None:
+            return (
+                '"' + re_js_single_quoted_ptrn.sub(_escape_js_char, single_quoted) + '"'
+            )
+        if trailing_comma is not None:
+            return ""
+        if colon:
+            return f'"{identifier}":'
+        if identifier in remove_strs:
+            return '""'
+        return identifier
+
+    return re_js_token_ptrn.sub(replace, js_object)
 
 
 def convert_requests_res_to_scrapy(res: requests.Response) -> HtmlResponse:
     # convert requests.Response to scrapy.Response
+    # body 는 bytes 그대로 넘기며, 인코딩은 Content-Type 헤더 또는 문서에서 판별됩니다.
     return HtmlResponse(
         url=res.url,
         status=res.status_code,
         headers=res.headers,
-        body=res.content.decode(res.encoding),
+        body=res.content,
         request=res.request,
-        encoding=res.encoding,
     )
 
 
+_session: Optional[requests.Session] = None
+
+
+def get_requests_session() -> requests.Session:
+    # 같은 host 에 대한 연결을 재사용하도록 하나의 Session 을 공유합니다.
+    global _session
+    if _session is None:
+        _session = requests.Session()
+    return _session
+
+
+def get_scrapy_res_from_cassette(
+    url: str, cassette_path: str
+) -> Optional[HtmlResponse]:
+    record: Optional[Dict] = Cassette(cassette_path).load(url)
+    return record_to_response(record) if record else None
+
+
+def save_requests_res_to_cassette(res: requests.Response, cassette_path: str) -> None:
+    # requests 는 body 의 압축을 이미 해제하였으므로 Content-Encoding 은 저장하지 않습니다.
+    headers: Dict[str, List[str]] = {
+        key: [value]
+        for key, value in res.headers.items()
+        if key.lower() != "content-encoding"
+    }
+    cassette: Cassette = Cassette(cassette_path)
+    for history_res in [*res.history, res]:
+        cassette.save(
+            history_res.request.url, res.status_code, headers, res.content, res.url
+        )
+
+
 def get_scrapy_res_from_url(url: str, params=None, **kwargs) -> HtmlResponse:
+    # NAVER_NEWS_CASSETTE 환경 변수가 있으면 해당 경로에 저장된 응답을 사용합니다.
+    # NAVER_NEWS_CASSETTE_RECORD=1 이면 저장되지 않은 URL 을 요청하여 저장합니다.
+    cassette_path: Optional[str] = os.environ.get("NAVER_NEWS_CASSETTE")
+    if cassette_path:
+        full_url: str = requests.Request("GET", url, params=params).prepare().url
+        cassette_res: Optional[HtmlResponse] = get_scrapy_res_from_cassette(
+            full_url, cassette_path
+        )
+        if cassette_res is not None:
+            return cassette_res
+        if os.environ.get("NAVER_NEWS_CASSETTE_RECORD") != "1":
+            raise LookupError(f"Not in cassette({cassette_path}): {full_url}")
     try:
         if not kwargs["headers"]["User-Agent"]:
             kwargs["headers"]["User-Agent"] = USER_AGENT
     except KeyError:
         kwargs["headers"] = {"User-Agent": USER_AGENT}
-    res: requests.Response = requests.get(url, params, **kwargs)
+    res: requests.Response = get_requests_session().get(url, params=params, **kwargs)
+    if cassette_path:
+        save_requests_res_to_cassette(res, cassette_path)
     return convert_requests_res_to_scrapy(res)
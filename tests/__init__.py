@@ -0,0 +1,31 @@
+from typing import List, Optional
+
+from src.items import News, Author
+
+
+def make_news(
+    oid: str = "056",
+    aid: str = "0010963679",
+    edited_time: str = "2021-01-01 22:19:26",
+    authors: Optional[List[Author]] = None,
+    **kwargs,
+) -> News:
+    """
+    테스트에 사용할 News 를 만듭니다. 지정하지 않은 필드는 기본값으로 채웁니다.
+    """
+    values: dict = dict(
+        oid=oid,
+        aid=aid,
+        title="title",
+        content="content",
+        sid1="100",
+        sid2="269",
+        sid3="000",
+        url=f"https://n.news.naver.com/mnews/article/{oid}/{aid}",
+        upload_time="2021-01-01 21:25:01",
+        edited_time=edited_time,
+        press="KBS",
+        authors=authors or [],
+    )
+    values.update(kwargs)
+    return News(**values)
@@ -0,0 +1,125 @@
+import os
+import tempfile
+import unittest
+from typing import Dict, List
+
+from src.archive import Archive, ArchivePartition, ArchiveSink, export_rows
+from src.items import News, Author
+from src.pipelines import BufferedSinkPipeline, news_to_row, author_to_row
+from tests import make_news
+
+AUTHOR: Author = Author(
+    id="71060",
+    name="name",
+    oid="056",
+    url="https://media.naver.com/journalist/056/71060",
+)
+
+ITEMS: List[News] = [
+    make_news("056", "0000000002", upload_time="2021-01-01 21:25:01", authors=[AUTHOR]),
+    make_news(
+        "056",
+        "0000000001",
+        sid1="101",
+        upload_time="2021-01-01 09:00:00",
+        content="content\n본문",
+        authors=[AUTHOR],
+    ),
+    make_news("001", "0000000003", upload_time="2021-01-01 12:30:00", press="연합뉴스"),
+    make_news("001", "0000000004", upload_time="2021-01-02 08:00:00", press="연합뉴스"),
+]
+
+
+class TestArchive(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmp_dir: tempfile.TemporaryDirectory = tempfile.TemporaryDirectory()
+        self.path: str = self.tmp_dir.name
+
+    def tearDown(self) -> None:
+        self.tmp_dir.cleanup()
+
+    def export(self, items: List[News]) -> Dict[str, int]:
+        return export_rows(
+            [news_to_row(item) for item in items], [author_to_row(AUTHOR)], self.path
+        )
+
+    def test_scan_and_get(self):
+        self.assertEqual(self.export(ITEMS), {"20210101": 3, "20210102": 1})
+        with Archive(self.path) as archive:
+            self.assertEqual(archive.dates(), ["20210101", "20210102"])
+            self.assertEqual(
+                [news.aid for news in archive.scan(sid1="100")],
+                ["0000000003", "0000000002", "0000000004"],
+            )
+            self.assertEqual(
+                [news.aid for news in archive.scan(press="KBS", sid1="100")],
+                ["0000000002"],
+            )
+            self.assertEqual(
+                [
+                    news.aid
+                    for news in archive.scan(
+                        since="2021-01-01 10", until="2021-01-02 08:00:00"
+                    )
+                ],
+                ["0000000003", "0000000002"],
+            )
+            self.assertEqual(list(archive.scan(press="MBC")), [])
+            # 본문은 요청한 경우에만 읽습니다.
+            self.assertIsNone(next(archive.scan(sid1="101")).content)
+            self.assertEqual(archive.get("056", "0000000002"), ITEMS[0])
+            self.assertIsNone(archive.get("056", "0000000009"))
+
+    def test_merge_and_missing_body(self):
+        self.export(ITEMS[:2])
+        updated: News = make_news(
+            "056",
+            "0000000001",
+            sid1="101",
+            upload_time="2021-01-01 09:00:00",
+            title="updated",
+            content=None,
+            authors=[AUTHOR],
+        )
+        self.export([updated, ITEMS[2]])
+        with ArchivePartition(os.path.join(self.path, "date=20210101")) as partition:
+            self.assertEqual(len(partition), 3)
+            index: int = partition.find("056", "0000000001")
+            self.assertEqual(partition.get_value("title", index), "updated")
+            self.assertIsNone(partition.get_content(index))
+            self.assertEqual(partition.get_news(index).authors, [AUTHOR])
+
+    def test_string_columns(self):
+        item: News = make_news(
+            "056", "0000000005", upload_time="2021-01-01 10:00:00", title=""
+        )
+        self.export(ITEMS[:3] + [item])
+        path: str = os.path.join(self.path, "date=20210101")
+        # aid, title, url 은 사전 인코딩하지 않고 문자열 그대로 저장합니다.
+        self.assertFalse(os.path.exists(os.path.join(path, "aid.dict.json")))
+        self.assertTrue(os.path.exists(os.path.join(path, "oid.dict.json")))
+        self.assertTrue(os.path.exists(os.path.join(path, "cluster_id.nulls")))
+        self.assertFalse(os.path.exists(os.path.join(path, "title.nulls")))
+        with ArchivePartition(path) as partition:
+            self.assertEqual(
+                [partition.find(news.oid, news.aid) for news in ITEMS[:3] + [item]],
+                [2, 1, 0, 3],
+            )
+            self.assertIsNone(partition.find("056", "0000000003"))
+            self.assertIsNone(partition.find("056", "0000000006"))
+            self.assertIsNone(partition.find("999", "0000000001"))
+            self.assertEqual(partition.get_news(3), item)
+            self.assertIsNone(partition.get_value("cluster_id", 3))
+
+    def test_sink(self):
+        pipeline: BufferedSinkPipeline = BufferedSinkPipeline(
+            ArchiveSink, self.path, batch_size=2, flush_interval=0
+        )
+        pipeline.open_spider(None)
+        for item in ITEMS:
+            pipeline.process_item(item, None)
+        pipeline.close_spider(None)
+        self.assertFalse(os.path.exists(os.path.join(self.path, ".spool")))
+        with Archive(self.path) as archive:
+            self.assertEqual(len(list(archive.scan(start_date="20210101"))), 4)
+            self.assertEqual(len(list(archive.scan(end_date="20210101"))), 3)
@@ -0,0 +1,93 @@
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from scrapy import Request
+from scrapy.http import HtmlResponse, Response
+from scrapy.utils.test import get_crawler
+
+from src.benchmark import run_benchmark
+from src.cassette import Cassette, CassetteRecorderMiddleware, CassetteDownloadHandler
+from src.spiders import NewsSpider
+from src.utils import get_scrapy_res_from_url
+
+FIXTURE_DIR: str = os.path.join(os.path.dirname(__file__), "fixtures")
+ARTICLE_URL: str = "https://n.news.naver.com/mnews/article/056/0010963679"
+
+
+class TestCassette(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmp_dir: tempfile.TemporaryDirectory = tempfile.TemporaryDirectory()
+        self.cassette: Cassette = Cassette(self.tmp_dir.name)
+        with open(os.path.join(FIXTURE_DIR, "article_056_0010963679.html"), "rb") as f:
+            self.body: bytes = f.read()
+
+    def tearDown(self) -> None:
+        self.tmp_dir.cleanup()
+
+    def record_article(self) -> None:
+        crawler = get_crawler(
+            NewsSpider, {"CASSETTE_RECORD": True, "CASSETTE_PATH": self.tmp_dir.name}
+        )
+        middleware: CassetteRecorderMiddleware = (
+            CassetteRecorderMiddleware.from_crawler(crawler)
+        )
+        request: Request = Request(
+            ARTICLE_URL,
+            meta={"redirect_urls": [ARTICLE_URL.replace("mnews", "entertain")]},
+        )
+        response: HtmlResponse = HtmlResponse(
+            ARTICLE_URL,
+            headers={"Content-Type": "text/html; charset=utf-8"},
+            body=self.body,
+            request=request,
+        )
+        middleware.process_response(request, response, None)
+
+    def test_save_and_load(self):
+        self.cassette.save(ARTICLE_URL + "?b=1&a=2", 200, {"X": ["1"]}, b"\nbody\n")
+        record = self.cassette.load(ARTICLE_URL + "?a=2&b=1")
+        self.assertEqual(record["body"], b"\nbody\n")
+        self.assertEqual(record["headers"], {"X": ["1"]})
+        self.assertIsNone(self.cassette.load(ARTICLE_URL))
+        self.assertEqual(len(list(self.cassette)), 1)
+
+    def test_record_and_replay(self):
+        self.record_article()
+        handler: CassetteDownloadHandler = CassetteDownloadHandler(self.cassette)
+        request: Request = Request(ARTICLE_URL.replace("mnews", "entertain"))
+        responses = []
+        handler.download_request(request, None).addCallback(responses.append)
+        self.assertIsInstance(responses[0], HtmlResponse)
+        self.assertEqual(responses[0].url, ARTICLE_URL)
+        self.assertEqual(
+            NewsSpider().extract_article_item(responses[0]).aid, "0010963679"
+        )
+
+        failures = []
+        handler.download_request(Request(ARTICLE_URL + "0"), None).addErrback(
+            failures.append
+        )
+        self.assertEqual(len(failures), 1)
+
+    def test_get_scrapy_res_from_url_replay(self):
+        self.record_article()
+        with mock.patch.dict(os.environ, {"NAVER_NEWS_CASSETTE": self.tmp_dir.name}):
+            response: Response = get_scrapy_res_from_url(ARTICLE_URL)
+            self.assertEqual(response.status, 200)
+            with self.assertRaises(LookupError):
+                get_scrapy_res_from_url(ARTICLE_URL + "0")
+
+    def test_benchmark(self):
+        self.record_article()
+        result = run_benchmark(self.tmp_dir.name, NewsSpider(), repeat=2)
+        self.assertEqual(result["extract_article_item"]["count"], 2)
+        self.assertEqual(result["extract_article_links"]["count"], 0)
+        self.assertGreater(result["extract_author_item"]["per_sec"], 0)
+
+    def test_synthetic_cassette_is_labeled(self):
+        # 직접 작성한 테스트용 응답은 실제 응답과 구분되도록 표시되어 있어야 합니다.
+        records = list(Cassette(os.path.join(FIXTURE_DIR, "synthetic_cassette")))
+        self.assertEqual(len(records), 7)
+        self.assertTrue(all(record.get("synthetic") for record in records))
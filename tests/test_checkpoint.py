@@ -0,0 +1,133 @@
+import os
+import tempfile
+import unittest
+from typing import List
+from unittest import mock
+
+from scrapy import Request
+from scrapy.http import HtmlResponse
+from scrapy.utils.test import get_crawler
+
+from src.checkpoint import CheckpointStore
+from src.spiders import LSDSpider
+
+LIST_BODY: str = """
+<html><body>
+<div class="list_body"><ul class="type02">
+<li><a href="https://news.naver.com/main/read.naver?oid=056&amp;aid=0000000001">a</a></li>
+<li><a href="https://news.naver.com/main/read.naver?oid=056&amp;aid=0000000002">b</a></li>
+</ul></div>
+<div class="paging"><a href="?page=1">1</a><a href="?page=2">2</a><strong>3</strong></div>
+</body></html>
+"""
+
+
+class TestCheckpointStore(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmp_dir: tempfile.TemporaryDirectory = tempfile.TemporaryDirectory()
+        self.path: str = os.path.join(self.tmp_dir.name, "LSDSpider.checkpoint")
+
+    def tearDown(self) -> None:
+        self.tmp_dir.cleanup()
+
+    def test_page_done_after_articles(self):
+        store: CheckpointStore = CheckpointStore(self.path)
+        key = ("20210101", "100")
+        store.set_last_page(key, 2)
+        store.add_page(key, 1, [("056", "1"), ("056", "2")])
+        store.add_page(key, 2, [])
+        self.assertFalse(store.is_page_done(key, 1))
+        self.assertTrue(store.is_page_done(key, 2))
+        store.finish_article(("056", "1"), emitted=True)
+        store.finish_article(("056", "2"), emitted=False)
+        self.assertTrue(store.is_unit_done(key))
+        store.close()
+
+        # 중간에 잘린 마지막 줄은 무시합니다.
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write("A\t056\t3")
+        store = CheckpointStore(self.path)
+        self.assertEqual(store.get_last_page(key), 2)
+        self.assertTrue(store.is_unit_done(key))
+        self.assertTrue(store.has_article(("056", "1")))
+        self.assertFalse(store.has_article(("056", "2")))
+        self.assertFalse(store.has_article(("056", "3")))
+        store.close()
+
+
+class TestSpiderResume(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmp_dir: tempfile.TemporaryDirectory = tempfile.TemporaryDirectory()
+        self.path: str = os.path.join(self.tmp_dir.name, "LSDSpider.checkpoint")
+
+    def tearDown(self) -> None:
+        self.tmp_dir.cleanup()
+
+    def make_spider(self, **kwargs) -> LSDSpider:
+        spider: LSDSpider = LSDSpider.from_crawler(
+            get_crawler(LSDSpider), date="20210101", **kwargs
+        )
+        spider.checkpoint = CheckpointStore(self.path)
+        return spider
+
+    def test_resume(self):
+        spider: LSDSpider = self.make_spider()
+        (probe,) = list(spider.start_requests())
+        response: HtmlResponse = HtmlResponse(
+            url=probe.url, body=LIST_BODY, encoding="utf-8", request=probe
+        )
+        requests: List[Request] = list(spider.parse_list_probe(response))
+        self.assertEqual(
+            [request.meta["oaid"] for request in requests if "oaid" in request.meta],
+            [("056", "0000000001"), ("056", "0000000002")],
+        )
+        self.assertEqual(
+            len([request for request in requests if "unit" in request.meta]), 2
+        )
+        spider.checkpoint.finish_article(("056", "0000000001"), emitted=True)
+        spider.checkpoint.finish_article(("056", "0000000002"), emitted=True)
+        spider.checkpoint.close()
+
+        # 마지막 페이지(3)는 완료되었으므로 1, 2 페이지만 다시 요청합니다.
+        spider = self.make_spider()
+        requests = list(spider.start_requests())
+        self.assertEqual(
+            [request.url.split("page=")[1] for request in requests], ["1", "2"]
+        )
+        response = HtmlResponse(
+            url=requests[0].url, body=LIST_BODY, encoding="utf-8", request=requests[0]
+        )
+        # 이미 수집한 기사는 요청하지 않습니다.
+        self.assertEqual(list(spider.parse_list(response)), [])
+        self.assertTrue(spider.checkpoint.is_page_done(("20210101", "100"), 1))
+        self.assertEqual(
+            spider.crawler.stats.get_value("checkpoint/skipped_articles"), 2
+        )
+        spider.checkpoint.close()
+
+    def test_dropped_article(self):
+        spider: LSDSpider = self.make_spider()
+        spider.crawler.engine = mock.Mock()
+        key = ("20210101", "100")
+        # 첫 요청이 실패한 기사가 뒤의 목록 페이지에 다시 나와 dupefilter 에서 버려진 경우
+        spider.checkpoint.finish_article(("056", "0000000001"), emitted=False)
+        spider.checkpoint.add_page(key, 2, [("056", "0000000001")])
+        request: Request = Request(
+            "https://n.news.naver.com/mnews/article/056/0000000001",
+            meta={"oaid": ("056", "0000000001")},
+        )
+        spider.request_dropped(request, spider)
+        self.assertTrue(spider.checkpoint.is_page_done(key, 2))
+        spider.checkpoint.close()
+
+    def test_skip_done_units(self):
+        store: CheckpointStore = CheckpointStore(self.path)
+        store.set_last_page(("20210101", "100"), 1)
+        store.add_page(("20210101", "100"), 1, [])
+        store.close()
+        spider: LSDSpider = self.make_spider(sid="100,101")
+        requests: List[Request] = list(spider.start_requests())
+        self.assertEqual(
+            [request.meta["unit"] for request in requests], [("20210101", "101")]
+        )
+        spider.checkpoint.close()
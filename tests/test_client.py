@@ -0,0 +1,76 @@
+import threading
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from types import GeneratorType
+from typing import Dict, Iterator, List
+
+from scrapy.http import HtmlResponse
+
+from src.client import NewsClient, fetch_many
+
+
+class NaverLikeHandler(BaseHTTPRequestHandler):
+    hits: Dict[str, int] = {}
+
+    def do_GET(self):
+        self.hits[self.path] = self.hits.get(self.path, 0) + 1
+        # /flaky 는 첫 요청에 429 를 돌려줍니다.
+        if self.path == "/flaky" and self.hits[self.path] == 1:
+            self.send_response(429)
+            self.end_headers()
+            return
+        body: bytes = f"<html><title>{self.path}</title></html>".encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args) -> None:
+        pass
+
+
+class TestNewsClient(unittest.TestCase):
+    def setUp(self) -> None:
+        NaverLikeHandler.hits = {}
+        self.server: ThreadingHTTPServer = ThreadingHTTPServer(
+            ("127.0.0.1", 0), NaverLikeHandler
+        )
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.base_url: str = f"http://127.0.0.1:{self.server.server_address[1]}"
+
+    def tearDown(self) -> None:
+        self.server.shutdown()
+        self.server.server_close()
+
+    def test_fetch_many(self):
+        urls: List[str] = [f"{self.base_url}/{i}" for i in range(20)]
+        with NewsClient(max_workers=4, per_host_concurrency=2) as client:
+            responses: List[HtmlResponse] = list(client.fetch_many(urls))
+        self.assertEqual(sorted(res.url for res in responses), sorted(urls))
+        self.assertTrue(all(isinstance(res, HtmlResponse) for res in responses))
+        self.assertEqual(
+            responses[0].css("title::text").get(), "/" + responses[0].url.split("/")[-1]
+        )
+
+    def test_pool_size(self):
+        with NewsClient(per_host_concurrency=3, max_hosts=5) as client:
+            adapter = client.session.get_adapter(self.base_url)
+        self.assertEqual(adapter._pool_connections, 5)
+        self.assertEqual(adapter._pool_maxsize, 3)
+
+    def test_module_fetch_many(self):
+        responses: Iterator[HtmlResponse] = fetch_many([f"{self.base_url}/1"])
+        self.assertIsInstance(responses, GeneratorType)
+        self.assertEqual([res.url for res in responses], [f"{self.base_url}/1"])
+
+    def test_retry(self):
+        with NewsClient(retry_backoff=0) as client:
+            res: HtmlResponse = client.fetch(f"{self.base_url}/flaky")
+        self.assertEqual(res.status, 200)
+        self.assertEqual(NaverLikeHandler.hits["/flaky"], 2)
+
+        with NewsClient(retry_times=0) as client:
+            NaverLikeHandler.hits = {}
+            res = client.fetch(f"{self.base_url}/flaky")
+        self.assertEqual(res.status, 429)
@@ -0,0 +1,218 @@
+import os
+import tempfile
+import threading
+import unittest
+from collections import Counter
+from http.server import ThreadingHTTPServer
+from typing import List
+from unittest import mock
+
+from scrapy import Request
+from scrapy.exceptions import DontCloseSpider
+from scrapy.http import HtmlResponse
+from scrapy.utils.test import get_crawler
+from twisted.internet import defer
+
+from src.distributed import (
+    DistributedFrontierExtension,
+    HashRing,
+    RemoteFrontier,
+    SqliteFrontier,
+    WorkUnit,
+    hash_key,
+    serve,
+)
+from src.spiders import LSDSpider
+from tests.test_checkpoint import LIST_BODY
+
+ARTICLE_URL: str = "https://n.news.naver.com/mnews/article/056/0000000001"
+
+
+def make_units(count: int) -> List[WorkUnit]:
+    return [
+        WorkUnit(key=f"A:056:{i:010d}", kind="article", url=f"https://a.com/{i}")
+        for i in range(count)
+    ]
+
+
+class TestHashRing(unittest.TestCase):
+    def test_ranges_match_nodes(self):
+        ring: HashRing = HashRing(["0", "1", "2"])
+        for unit in make_units(200):
+            node: str = ring.get_node(unit.key)
+            owners: List[str] = [
+                candidate
+                for candidate in ring.nodes
+                if any(
+                    start < hash_key(unit.key) <= end
+                    for start, end in ring.get_ranges(candidate)
+                )
+            ]
+            self.assertEqual(owners, [node])
+
+    def test_adding_node_moves_few_keys(self):
+        keys: List[str] = [unit.key for unit in make_units(3000)]
+        before: HashRing = HashRing(["0", "1", "2"])
+        after: HashRing = HashRing(["0", "1", "2", "3"])
+        moved: int = sum(before.get_node(key) != after.get_node(key) for key in keys)
+        self.assertLess(moved, len(keys) * 0.4)
+        self.assertTrue(
+            all(
+                after.get_node(key) == "3"
+                for key in keys
+                if before.get_node(key) != after.get_node(key)
+            )
+        )
+
+
+class TestSqliteFrontier(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmp_dir: tempfile.TemporaryDirectory = tempfile.TemporaryDirectory()
+        self.path: str = os.path.join(self.tmp_dir.name, "frontier.sqlite3")
+
+    def tearDown(self) -> None:
+        self.tmp_dir.cleanup()
+
+    def test_claim_is_sharded_and_global(self):
+        frontier: SqliteFrontier = SqliteFrontier(self.path)
+        other: SqliteFrontier = SqliteFrontier(self.path)
+        self.assertEqual(frontier.push(make_units(100)), 100)
+        self.assertEqual(other.push(make_units(100)), 0)
+
+        claimed: Counter = Counter()
+        for worker, node in (("0", frontier), ("1", other)):
+            for unit in node.claim(worker, ["0", "1"], 1000):
+                claimed[unit.key] += 1
+        self.assertEqual(len(claimed), 100)
+        self.assertEqual(set(claimed.values()), {1})
+        self.assertEqual(frontier.claim("0", ["0", "1"], 1000), [])
+        self.assertFalse(frontier.finished())
+
+        frontier.complete(list(claimed))
+        self.assertTrue(other.finished())
+        frontier.close()
+        other.close()
+
+    def test_expired_lease_is_reclaimed(self):
+        frontier: SqliteFrontier = SqliteFrontier(self.path)
+        frontier.push(make_units(3))
+        self.assertEqual(len(frontier.claim("0", ["0"], 10, lease=-1)), 3)
+        self.assertEqual(len(frontier.claim("0", ["0"], 10)), 3)
+        frontier.close()
+
+    def test_dead_worker_units_are_taken_over(self):
+        frontier: SqliteFrontier = SqliteFrontier(self.path)
+        frontier.push(make_units(100))
+        workers: List[str] = ["0", "1"]
+        own: List[WorkUnit] = frontier.claim("0", workers, 1000, lease=60)
+        self.assertLess(len(own), 100)
+        # 1 번 노드가 시작하지 않았어도 lease 가 지나기 전에는 그 범위의 작업을 가져가지 않습니다.
+        self.assertEqual(frontier.claim("0", workers, 1000, lease=60), [])
+
+        # 1 번 노드가 일부를 가져간 뒤 종료되어 lease 가 만료된 경우
+        dead: List[WorkUnit] = frontier.claim("1", workers, 10, lease=-1)
+        self.assertEqual(len(dead), 10)
+        taken: List[WorkUnit] = frontier.claim("0", workers, 1000, lease=60)
+        self.assertEqual({unit.key for unit in taken}, {unit.key for unit in dead})
+
+        # 아무도 가져가지 않은 채 lease 이상 대기한 작업도 가져갑니다.
+        orphans: List[WorkUnit] = frontier.claim("0", workers, 1000, lease=0)
+        self.assertEqual(len(own) + len(taken) + len(orphans), 100)
+        frontier.complete([unit.key for unit in own + taken + orphans])
+        self.assertTrue(frontier.finished())
+        frontier.close()
+
+    def test_remote_frontier(self):
+        server: ThreadingHTTPServer = serve(SqliteFrontier(self.path), port=0)
+        thread: threading.Thread = threading.Thread(target=server.serve_forever)
+        thread.start()
+        try:
+            remote: RemoteFrontier = RemoteFrontier(
+                f"http://127.0.0.1:{server.server_address[1]}"
+            )
+            self.assertEqual(remote.push(make_units(5)), 5)
+            units: List[WorkUnit] = remote.claim("0", ["0"], 10)
+            self.assertEqual(len(units), 5)
+            self.assertFalse(remote.finished())
+            remote.complete([unit.key for unit in units])
+            self.assertTrue(remote.finished())
+            remote.close()
+        finally:
+            server.shutdown()
+            server.server_close()
+            thread.join()
+
+
+class TestDistributedSpider(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmp_dir: tempfile.TemporaryDirectory = tempfile.TemporaryDirectory()
+        self.path: str = os.path.join(self.tmp_dir.name, "frontier.sqlite3")
+
+    def tearDown(self) -> None:
+        self.tmp_dir.cleanup()
+
+    def open_spider(self, **settings) -> LSDSpider:
+        crawler = get_crawler(
+            LSDSpider, {"DISTRIBUTED_FRONTIER": self.path, **settings}
+        )
+        crawler.engine = mock.Mock()
+        ext: DistributedFrontierExtension = DistributedFrontierExtension.from_crawler(
+            crawler
+        )
+        # reactor 없이 확인할 수 있도록 frontier 호출을 바로 수행합니다.
+        ext.call = defer.maybeDeferred
+        spider: LSDSpider = LSDSpider.from_crawler(crawler, date="20210101")
+        crawler.spider = spider
+        ext.spider_opened(spider)
+        return spider
+
+    def test_list_and_article_units(self):
+        spider: LSDSpider = self.open_spider()
+        ext: DistributedFrontierExtension = spider.distributed
+
+        (probe,) = list(spider.start_requests())
+        self.assertEqual(probe.meta["work_key"], "L:20210101:100:10000")
+        self.assertEqual(probe.callback, spider.parse_list_probe)
+        response: HtmlResponse = HtmlResponse(
+            url=probe.url, body=LIST_BODY, encoding="utf-8", request=probe
+        )
+        self.assertEqual(list(spider.parse_list_probe(response)), [])
+
+        requests: List[Request] = list(spider.claim_requests())
+        self.assertEqual(
+            [request.meta["work_key"] for request in requests],
+            [
+                "A:056:0000000001",
+                "A:056:0000000002",
+                "L:20210101:100:1",
+                "L:20210101:100:2",
+            ],
+        )
+        self.assertTrue(requests[0].dont_filter)
+        self.assertEqual(requests[2].callback, spider.parse_list)
+        for request in requests:
+            ext.complete(request.meta["work_key"])
+        # 완료한 작업은 모아서 기록합니다.
+        self.assertFalse(ext.frontier.finished())
+        ext.flush()
+        self.assertTrue(ext.frontier.finished())
+        ext.spider_closed(spider)
+
+    def test_spider_idle_claims_until_finished(self):
+        spider: LSDSpider = self.open_spider(DISTRIBUTED_FLUSH_INTERVAL=0)
+        ext: DistributedFrontierExtension = spider.distributed
+        ext.push(WorkUnit(key="A:056:0000000001", kind="article", url=ARTICLE_URL))
+
+        with self.assertRaises(DontCloseSpider):
+            ext.spider_idle(spider)
+        (call,) = spider.crawler.engine.crawl.call_args_list
+        ext.complete(call[0][0].meta["work_key"])
+
+        # 남은 작업이 없음을 확인하는 동안에도 종료하지 않고, 확인한 뒤에 종료합니다.
+        with self.assertRaises(DontCloseSpider):
+            ext.spider_idle(spider)
+        self.assertTrue(ext.frontier_finished)
+        ext.spider_idle(spider)
+        self.assertEqual(spider.crawler.stats.get_value("distributed/claimed"), 1)
+        ext.spider_closed(spider)
+        self.assertFalse(ext.pool.started)
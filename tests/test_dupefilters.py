@@ -0,0 +1,80 @@
+import tempfile
+import unittest
+
+from scrapy import Request
+from scrapy.utils.test import get_crawler
+
+from src.dupefilters import ArticleDupeFilter, pack_oaid
+from src.spiders import LSDSpider
+
+
+class TestArticleDupeFilter(unittest.TestCase):
+    def make_dupefilter(self, path=None) -> ArticleDupeFilter:
+        crawler = get_crawler(LSDSpider, {"JOBDIR": path} if path else {})
+        return ArticleDupeFilter.from_crawler(crawler)
+
+    def test_pack_oaid(self):
+        self.assertEqual(pack_oaid("056", "0010963679"), 56 << 34 | 10963679)
+        self.assertEqual(pack_oaid("056", "abc"), ("056", "abc"))
+
+    def test_request_seen(self):
+        dupefilter: ArticleDupeFilter = self.make_dupefilter()
+        self.assertFalse(
+            dupefilter.request_seen(
+                Request("https://n.news.naver.com/mnews/article/056/0010963679")
+            )
+        )
+        # 같은 기사의 다른 주소도 중복으로 봅니다.
+        self.assertTrue(
+            dupefilter.request_seen(
+                Request("https://news.naver.com/main/read.naver?oid=056&aid=0010963679")
+            )
+        )
+        self.assertTrue(
+            dupefilter.request_seen(
+                Request(
+                    "https://n.news.naver.com/entertain/article/056/0010963679",
+                    meta={"oaid": ("056", "0010963679")},
+                )
+            )
+        )
+        # 기사 요청이 아니면 URL 지문을 사용합니다.
+        list_url: str = "https://news.naver.com/main/list.naver?sid1=100&page=1"
+        self.assertFalse(dupefilter.request_seen(Request(list_url)))
+        self.assertTrue(dupefilter.request_seen(Request(list_url)))
+        self.assertEqual(len(dupefilter.article_keys), 1)
+        dupefilter.close("finished")
+
+    def test_redirected_request(self):
+        dupefilter: ArticleDupeFilter = self.make_dupefilter()
+        request: Request = Request(
+            "https://n.news.naver.com/mnews/article/056/0010963679",
+            meta={"oaid": ("056", "0010963679")},
+        )
+        self.assertFalse(dupefilter.request_seen(request))
+        # RedirectMiddleware 와 같이 원래 요청의 meta 를 복사하여 리다이렉트 요청을 만듭니다.
+        redirected: Request = request.replace(
+            url="https://n.news.naver.com/entertain/article/056/0010963679"
+        )
+        redirected.meta["redirect_times"] = 1
+        redirected.meta["redirect_urls"] = [request.url]
+        self.assertFalse(redirected.dont_filter)
+        self.assertFalse(dupefilter.request_seen(redirected))
+        self.assertTrue(dupefilter.request_seen(redirected.replace()))
+        dupefilter.close("finished")
+
+    def test_jobdir(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            dupefilter: ArticleDupeFilter = self.make_dupefilter(tmp_dir)
+            dupefilter.request_seen(
+                Request("https://n.news.naver.com/mnews/article/056/0010963679")
+            )
+            dupefilter.close("shutdown")
+
+            dupefilter = self.make_dupefilter(tmp_dir)
+            self.assertTrue(
+                dupefilter.request_seen(
+                    Request("https://n.news.naver.com/sports/article/056/0010963679")
+                )
+            )
+            dupefilter.close("finished")
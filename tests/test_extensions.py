@@ -0,0 +1,199 @@
+import asyncio
+import os
+import tempfile
+import tracemalloc
+import unittest
+from typing import List
+
+from scrapy import Request
+from scrapy.exceptions import NotConfigured
+from scrapy.http import HtmlResponse, Response
+from scrapy.utils.test import get_crawler
+from twisted.web.test.requesthelper import DummyRequest
+
+from src.extensions import MetricsResource, StageMetricsExtension
+from src.items import News
+from src.metrics import Histogram, StageMetrics, StageProfiler
+from src.spiders import LSDSpider
+
+FIXTURE_DIR: str = os.path.join(os.path.dirname(__file__), "fixtures")
+ARTICLE_URL: str = "https://n.news.naver.com/mnews/article/056/0010963679"
+
+
+def get_article_res(sid: str) -> HtmlResponse:
+    with open(os.path.join(FIXTURE_DIR, "article_056_0010963679.html"), "rb") as f:
+        body: bytes = f.read()
+    request: Request = Request(ARTICLE_URL, meta={"sid": sid})
+    return HtmlResponse(url=ARTICLE_URL, body=body, encoding="utf-8", request=request)
+
+
+class TestStageMetrics(unittest.TestCase):
+    def test_histogram(self):
+        histogram: Histogram = Histogram((0.1, 1.0))
+        for value in (0.05, 0.1, 0.5, 2.0):
+            histogram.observe(value)
+        self.assertEqual(
+            list(histogram.iter_cumulative()), [("0.1", 2), ("1", 3), ("+Inf", 4)]
+        )
+        self.assertEqual(histogram.quantile(0.5), 0.1)
+        self.assertEqual(histogram.quantile(0.99), float("inf"))
+
+    def test_prometheus_and_stats(self):
+        metrics: StageMetrics = StageMetrics((0.1, 1.0))
+        metrics.observe("article_download", "LSDSpider", "100", 0.5)
+        metrics.observe("pipeline_write", "LSDSpider", None, 0.05)
+        text: str = metrics.to_prometheus()
+        self.assertIn(
+            'naver_news_stage_seconds_bucket{spider="LSDSpider",sid="100",'
+            'stage="article_download",le="1"} 1',
+            text,
+        )
+        self.assertIn(
+            'naver_news_stage_seconds_count{spider="LSDSpider",sid="all",'
+            'stage="pipeline_write"} 1',
+            text,
+        )
+        stats = metrics.to_stats()
+        self.assertEqual(stats["stage_metrics/LSDSpider/100/article_download/count"], 1)
+        self.assertEqual(stats["stage_metrics/LSDSpider/100/article_download/p50"], 1.0)
+
+
+class TestStageMetricsExtension(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmp_dir: tempfile.TemporaryDirectory = tempfile.TemporaryDirectory()
+
+    def tearDown(self) -> None:
+        self.tmp_dir.cleanup()
+
+    def test_not_configured(self):
+        crawler = get_crawler(LSDSpider)
+        with self.assertRaises(NotConfigured):
+            StageMetricsExtension.from_crawler(crawler)
+
+    def test_stage_timings(self):
+        crawler = get_crawler(LSDSpider, {"STAGE_METRICS_ENABLED": True})
+        ext: StageMetricsExtension = StageMetricsExtension.from_crawler(crawler)
+        spider: LSDSpider = LSDSpider.from_crawler(crawler, sid="100,101")
+        ext.spider_opened(spider)
+        self.assertIs(spider.metrics, ext.metrics)
+
+        response: HtmlResponse = get_article_res("101")
+        response.request.meta["download_latency"] = 0.3
+        ext.response_received(response, response.request, spider)
+        items: List[News] = list(spider.parse_article(response))
+        self.assertEqual(items[0].aid, "0010963679")
+
+        ext.spider_closed(spider)
+        stats = crawler.stats.get_stats()
+        for stage in (
+            "article_download",
+            "extract_article_item",
+            "extract_author_item",
+        ):
+            self.assertEqual(stats[f"stage_metrics/LSDSpider/101/{stage}/count"], 1)
+        self.assertIn(
+            b"article_download",
+            MetricsResource(ext.metrics).render_GET(DummyRequest([b"metrics"])),
+        )
+
+    def test_profiler(self):
+        for mode, suffix in (("cprofile", ".prof"), ("tracemalloc", ".folded")):
+            crawler = get_crawler(
+                LSDSpider,
+                {
+                    "STAGE_PROFILER": mode,
+                    "STAGE_PROFILER_EVERY": 2,
+                    "STAGE_PROFILER_PATH": os.path.join(self.tmp_dir.name, mode),
+                },
+            )
+            ext: StageMetricsExtension = StageMetricsExtension.from_crawler(crawler)
+            spider: LSDSpider = LSDSpider.from_crawler(crawler)
+            ext.spider_opened(spider)
+            self.assertIsNone(spider.metrics)
+            for _ in range(2):
+                list(spider.parse_article(get_article_res("100")))
+            ext.spider_closed(spider)
+            files: List[str] = os.listdir(os.path.join(self.tmp_dir.name, mode))
+            self.assertTrue(files and all(name.endswith(suffix) for name in files))
+
+    def test_fast_extractor_stage_timings(self):
+        crawler = get_crawler(
+            LSDSpider, {"STAGE_METRICS_ENABLED": True, "ARTICLE_EXTRACTOR": "fast"}
+        )
+        ext: StageMetricsExtension = StageMetricsExtension.from_crawler(crawler)
+        spider: LSDSpider = LSDSpider.from_crawler(crawler)
+        ext.spider_opened(spider)
+        list(spider.parse_article(get_article_res("100")))
+        ext.spider_closed(spider)
+        self.assertEqual(
+            crawler.stats.get_value(
+                "stage_metrics/LSDSpider/100/extract_author_item/count"
+            ),
+            1,
+        )
+
+    def test_profiler_offload(self):
+        crawler = get_crawler(
+            LSDSpider,
+            {
+                "STAGE_PROFILER": "cprofile",
+                "STAGE_PROFILER_EVERY": 1,
+                "STAGE_PROFILER_PATH": self.tmp_dir.name,
+            },
+        )
+        ext: StageMetricsExtension = StageMetricsExtension.from_crawler(crawler)
+        spider: LSDSpider = LSDSpider.from_crawler(crawler, parse_workers=1)
+        ext.spider_opened(spider)
+        try:
+            asyncio.run(spider.parse_article_offload(get_article_res("100")))
+        finally:
+            spider.closed("finished")
+        self.assertEqual(spider.profiler.calls, 1)
+        ext.spider_closed(spider)
+        self.assertEqual(os.listdir(self.tmp_dir.name), ["LSDSpider.prof"])
+
+    def test_tracemalloc_only_in_sampled_callback(self):
+        profiler: StageProfiler = StageProfiler(
+            "tracemalloc", self.tmp_dir.name, every=2
+        )
+        profiler.start()
+        self.assertFalse(tracemalloc.is_tracing())
+        kept: List[bytes] = []
+        with profiler.sample("LSDSpider"):
+            self.assertFalse(tracemalloc.is_tracing())
+            kept.append(bytes(1 << 20))
+        with profiler.sample("LSDSpider"):
+            self.assertTrue(tracemalloc.is_tracing())
+            kept.append(bytes(1 << 20))
+        self.assertFalse(tracemalloc.is_tracing())
+        with open(os.path.join(self.tmp_dir.name, "LSDSpider-2.folded")) as f:
+            folded: str = f.read()
+        sizes: List[int] = [int(line.split()[-1]) for line in folded.splitlines()]
+        # 샘플링한 콜백에서 할당한 메모리만 기록합니다.
+        self.assertIn("test_extensions.py", folded)
+        self.assertGreaterEqual(max(sizes), 1 << 20)
+        self.assertLess(sum(sizes), 1 << 21)
+
+    def test_tracemalloc_diff_when_already_tracing(self):
+        profiler: StageProfiler = StageProfiler(
+            "tracemalloc", self.tmp_dir.name, every=1
+        )
+        profiler.start()
+        tracemalloc.start()
+        kept: List[bytes] = []
+        try:
+            kept.append(bytes(1 << 20))
+            with profiler.sample("LSDSpider"):
+                kept.append(bytes(1 << 16))
+            self.assertTrue(tracemalloc.is_tracing())
+        finally:
+            tracemalloc.stop()
+        with open(os.path.join(self.tmp_dir.name, "LSDSpider-1.folded")) as f:
+            sizes: List[int] = [int(line.split()[-1]) for line in f if line.strip()]
+        # 콜백 전에 할당한 메모리는 차이에 포함되지 않습니다.
+        self.assertTrue(sizes and max(sizes) < 1 << 20)
+        self.assertGreaterEqual(max(sizes), 1 << 16)
+
+    def test_profiler_invalid_mode(self):
+        with self.assertRaises(ValueError):
+            StageProfiler("perf", self.tmp_dir.name)
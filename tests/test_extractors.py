@@ -0,0 +1,74 @@
+import gzip
+import os
+import unittest
+
+from src.extractors import (
+    ArticleStreamScanner,
+    parse_attrs,
+    extract_title,
+    extract_journalists,
+    extract_direct_texts,
+)
+
+
+class TestExtractors(unittest.TestCase):
+    def test_parse_attrs(self):
+        self.assertEqual(
+            parse_attrs(" class=\"a b\" data-x='1' data-y=2 disabled"),
+            {"class": "a b", "data-x": "1", "data-y": "2", "disabled": ""},
+        )
+
+    def test_extract_title(self):
+        self.assertEqual(
+            extract_title("<head><title>A &amp; B</title></head>"), "A & B"
+        )
+        self.assertIsNone(extract_title("<head></head>"))
+
+    def test_extract_journalists(self):
+        self.assertEqual(
+            extract_journalists(
+                '<button class="media_end_head_journalist_btn_subscribe _UNSUBSCRIBE"'
+                ' data-channelkey="JOURNALIST_1" data-messagevalue="A">'
+                '<button class="media_end_head_journalist_btn_subscribe _SUBSCRIBE"'
+                ' data-channelkey="JOURNALIST_2" data-messagevalue="B">'
+            ),
+            [("1", "A")],
+        )
+
+    def test_extract_direct_texts(self):
+        text: str = '<div id="x">a<br>b<div>c<img src="">d</div><!-- e -->f</div>g'
+        texts, end = extract_direct_texts(text, text.index(">") + 1)
+        self.assertEqual(texts, ["a", "b", "", "f"])
+        self.assertEqual(text[end:], "g")
+        self.assertIsNone(extract_direct_texts("<div>a<div>b</div>", 5))
+
+    def test_article_stream_scanner(self):
+        with open(
+            os.path.join(
+                os.path.dirname(__file__), "fixtures", "article_056_0010963679.html"
+            ),
+            "rb",
+        ) as f:
+            body: bytes = f.read()
+        # div#dic_area 를 닫는 태그 다음 위치
+        dic_area_end: int = body.index(
+            b"\t</div>\n</div>", body.index(b'id="dic_area"')
+        ) + len(b"\t</div>")
+        for gzipped in (False, True):
+            data: bytes = gzip.compress(body) if gzipped else body
+            scanner: ArticleStreamScanner = ArticleStreamScanner(gzipped)
+            # 7 byte 씩 나누어 태그와 marker 가 조각 경계에 걸치도록 합니다.
+            fed: int = 0
+            while not scanner.feed(data[fed : fed + 7]):
+                fed += 7
+                self.assertLess(fed, len(data))
+            if not gzipped:
+                self.assertGreaterEqual(fed + 7, dic_area_end)
+                self.assertLess(fed, dic_area_end)
+
+        scanner = ArticleStreamScanner()
+        self.assertFalse(
+            scanner.feed(b'<div id="dic_area"><div>a</div>b</div><script>var article')
+        )
+        self.assertTrue(scanner.closed)
+        self.assertTrue(scanner.feed(b" = {}; var office = {};</script>"))
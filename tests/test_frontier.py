@@ -0,0 +1,70 @@
+import unittest
+
+from src.frontier import ListFrontier
+
+
+class TestListFrontier(unittest.TestCase):
+    def test_fill_respects_budget(self):
+        frontier: ListFrontier = ListFrontier(
+            ["20210101", "20210102"], ["100", "101"], max_active=3
+        )
+        started = frontier.fill()
+        self.assertEqual(
+            [unit.key for unit in started],
+            [("20210101", "100"), ("20210101", "101"), ("20210102", "100")],
+        )
+        self.assertEqual(frontier.fill(), [])
+        self.assertFalse(frontier.done)
+
+    def test_unit_finishes_after_all_pages(self):
+        frontier: ListFrontier = ListFrontier(["20210101"], [None], max_active=1)
+        (unit,) = frontier.fill()
+        self.assertTrue(frontier.add_page(unit.key, "https://a.com/?page=1&date=1"))
+        self.assertTrue(frontier.add_page(unit.key, "https://a.com/?page=2&date=1"))
+        # 파라미터 순서만 다른 URL 은 같은 페이지로 취급합니다.
+        self.assertFalse(frontier.add_page(unit.key, "https://a.com/?date=1&page=2"))
+        self.assertFalse(frontier.finish_page(unit.key, "https://a.com/?page=1&date=1"))
+        self.assertTrue(frontier.finish_page(unit.key, "https://a.com/?page=2&date=1"))
+        self.assertEqual(frontier.fill(), [])
+        self.assertTrue(frontier.done)
+
+    def test_invalid_budget(self):
+        with self.assertRaises(ValueError):
+            ListFrontier(["20210101"], [None], max_active=0)
+
+    def test_finish_unit_without_pages(self):
+        frontier: ListFrontier = ListFrontier(
+            ["20210101"], ["100", "101"], max_active=1
+        )
+        (unit,) = frontier.fill()
+        self.assertTrue(frontier.finish_unit(unit.key))
+        self.assertFalse(frontier.finish_unit(unit.key))
+        self.assertEqual([unit.key for unit in frontier.fill()], [("20210101", "101")])
+
+    def test_unit_waits_for_articles(self):
+        frontier: ListFrontier = ListFrontier(["20210101"], [None], max_active=1)
+        (unit,) = frontier.fill()
+        frontier.add_page(unit.key, "https://a.com/?page=1")
+        self.assertTrue(frontier.add_article(unit.key, "https://a.com/article/1"))
+        self.assertTrue(frontier.add_article(unit.key, "https://a.com/article/2"))
+        # 목록 페이지가 끝나도 기사 요청이 남아 있으면 단위는 계속 진행 중입니다.
+        self.assertFalse(frontier.finish_page(unit.key, "https://a.com/?page=1"))
+        self.assertFalse(frontier.finish_article(unit.key, "https://a.com/article/1"))
+        self.assertEqual(list(frontier.active), [unit.key])
+        self.assertTrue(frontier.finish_article(unit.key, "https://a.com/article/2"))
+        self.assertEqual(frontier.fill(), [])
+        self.assertTrue(frontier.done)
+
+    def test_release_articles(self):
+        frontier: ListFrontier = ListFrontier(
+            ["20210101"], ["100", "101"], max_active=2
+        )
+        first, second = frontier.fill()
+        frontier.add_page(first.key, "https://a.com/?page=1")
+        frontier.add_article(first.key, "https://a.com/article/1")
+        frontier.finish_page(first.key, "https://a.com/?page=1")
+        frontier.add_page(second.key, "https://a.com/?page=2")
+        frontier.add_article(second.key, "https://a.com/article/2")
+        # 목록 페이지가 남은 단위는 그대로 둡니다.
+        self.assertEqual(frontier.release_articles(), [first])
+        self.assertEqual(list(frontier.active), [second.key])
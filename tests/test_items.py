@@ -0,0 +1,56 @@
+import pickle
+import unittest
+from dataclasses import FrozenInstanceError, asdict
+
+from itemadapter import ItemAdapter
+
+from src.items import Author, AuthorTable, News
+
+
+class TestItems(unittest.TestCase):
+    def setUp(self) -> None:
+        self.author: Author = Author(
+            id="71060",
+            name="김기자",
+            oid="056",
+            url="https://media.naver.com/journalist/056/71060",
+        )
+        self.news: News = News(
+            oid="056",
+            aid="0010963679",
+            title="title",
+            content="content",
+            sid1="100",
+            sid2="269",
+            sid3="000",
+            url="https://n.news.naver.com/mnews/article/056/0010963679",
+            upload_time="2021-01-01 21:25:01",
+            edited_time="2021-01-01 22:19:26",
+            press="KBS",
+            authors=[self.author],
+        )
+
+    def test_slots(self):
+        self.assertFalse(hasattr(self.news, "__dict__"))
+        self.assertFalse(hasattr(self.author, "__dict__"))
+        with self.assertRaises(FrozenInstanceError):
+            self.author.name = "이기자"
+        self.news.title = "new title"
+        self.assertEqual(self.news.title, "new title")
+
+    def test_pickle_and_adapter(self):
+        self.assertEqual(pickle.loads(pickle.dumps(self.news)), self.news)
+        self.assertEqual(pickle.loads(pickle.dumps(self.author)), self.author)
+        self.assertEqual(ItemAdapter(self.news).asdict(), asdict(self.news))
+
+    def test_author_table(self):
+        table: AuthorTable = AuthorTable(
+            "https://media.naver.com/journalist/{office_id}/{author_id}"
+        )
+        author: Author = table.get("056", "71060", "김기자")
+        self.assertEqual(author, self.author)
+        self.assertIs(table.get("056", "71060", "김기자"), author)
+        self.assertIsNot(table.get("056", "71060", "김 기자"), author)
+        self.assertEqual(len(table), 1)
+        copied: Author = pickle.loads(pickle.dumps(table.get("056", "71060", "김기자")))
+        self.assertIs(table.intern(copied), table.get("056", "71060", "김기자"))
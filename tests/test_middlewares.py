@@ -0,0 +1,331 @@
+import os
+import tempfile
+import time
+import unittest
+from types import SimpleNamespace
+from typing import List
+from unittest import mock
+
+from scrapy import Request
+from scrapy.core.downloader import Slot
+from scrapy.http import Headers, Response, HtmlResponse
+from scrapy.exceptions import IgnoreRequest, StopDownload
+from scrapy.utils.test import get_crawler
+from twisted.internet.error import TimeoutError
+
+from src.items import News, Author
+from src.journalists import JournalistProfileCache
+from src.middlewares import (
+    SeenArticleMiddleware,
+    AdaptiveThrottleMiddleware,
+    JournalistProfileMiddleware,
+    StreamingStopMiddleware,
+    parse_retry_after,
+)
+from src.spiders import NewsSpider
+from tests import make_news
+
+
+class TestSeenArticleMiddleware(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmp_dir: tempfile.TemporaryDirectory = tempfile.TemporaryDirectory()
+        self.crawler = get_crawler(
+            NewsSpider,
+            {
+                "SEEN_INDEX_ENABLED": True,
+                "SEEN_INDEX_PATH": os.path.join(self.tmp_dir.name, "seen.sqlite3"),
+            },
+        )
+        self.crawler.spider = NewsSpider.from_crawler(self.crawler)
+        self.middleware: SeenArticleMiddleware = SeenArticleMiddleware.from_crawler(
+            self.crawler
+        )
+        self.middleware.spider_opened(self.crawler.spider)
+
+    def tearDown(self) -> None:
+        self.middleware.spider_closed(self.crawler.spider)
+        self.tmp_dir.cleanup()
+
+    def make_request(self, **meta) -> Request:
+        return Request(
+            "https://n.news.naver.com/mnews/article/056/0010963679",
+            meta={"oaid": ("056", "0010963679"), **meta},
+        )
+
+    def test_skip_seen_article(self):
+        spider = self.crawler.spider
+        self.assertIsNone(self.middleware.process_request(self.make_request(), spider))
+        self.middleware.item_scraped(
+            make_news("056", "0010963679", "2021-01-01 22:19:26"), None, spider
+        )
+        with self.assertRaises(IgnoreRequest):
+            self.middleware.process_request(self.make_request(), spider)
+        self.assertIsNone(
+            self.middleware.process_request(self.make_request(refresh=True), spider)
+        )
+        self.assertEqual(self.crawler.stats.get_value("seen_index/skipped"), 1)
+
+    def test_refresh_since(self):
+        spider = self.crawler.spider
+        self.middleware.item_scraped(
+            make_news("056", "0010963679", "2021-01-01 22:19:26"), None, spider
+        )
+        spider.refresh_since = "20210101"
+        self.middleware.spider_opened(spider)
+        self.assertIsNone(self.middleware.process_request(self.make_request(), spider))
+        spider.refresh_since = "20210102"
+        self.middleware.spider_opened(spider)
+        with self.assertRaises(IgnoreRequest):
+            self.middleware.process_request(self.make_request(), spider)
+
+    def test_ignore_non_article_request(self):
+        request: Request = Request("https://news.naver.com/main/list.naver")
+        self.assertIsNone(self.middleware.process_request(request, self.crawler.spider))
+
+
+PROFILE_BODY: bytes = (
+    '<html><head><meta property="og:description" content=" KBS 기자입니다. ">'
+    '<meta property="og:image" content="https://imgnews.pstatic.net/a.jpg">'
+    "</head><body></body></html>"
+).encode("utf-8")
+
+
+class TestJournalistProfileMiddleware(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmp_dir: tempfile.TemporaryDirectory = tempfile.TemporaryDirectory()
+        self.path: str = os.path.join(self.tmp_dir.name, "journalists.sqlite3")
+        self.crawler = get_crawler(
+            NewsSpider,
+            {"JOURNALIST_PROFILE_ENABLED": True, "JOURNALIST_PROFILE_PATH": self.path},
+        )
+        self.spider: NewsSpider = NewsSpider.from_crawler(self.crawler)
+        self.middleware: JournalistProfileMiddleware = (
+            JournalistProfileMiddleware.from_crawler(self.crawler)
+        )
+
+    def tearDown(self) -> None:
+        self.middleware.spider_closed(self.spider)
+        self.tmp_dir.cleanup()
+
+    def make_news(self, aid: str) -> News:
+        news: News = make_news("056", aid, "2021-01-01 22:19:26")
+        news.authors = [self.spider.make_author_item("056", "71060", "기자")]
+        return news
+
+    def process(self, items: List) -> List:
+        return list(self.middleware.process_spider_output(None, items, self.spider))
+
+    def fetch_profile(self, request: Request) -> Author:
+        response: HtmlResponse = HtmlResponse(
+            request.url, body=PROFILE_BODY, request=request
+        )
+        return next(request.callback(response))
+
+    def test_request_profile_once(self):
+        output: List = self.process(
+            [self.make_news("0010963679"), self.make_news("0010963680")]
+        )
+        requests: List[Request] = [r for r in output if isinstance(r, Request)]
+        self.assertEqual(len(requests), 1)
+        self.assertEqual(
+            requests[0].url, "https://media.naver.com/journalist/056/71060"
+        )
+        self.assertEqual(requests[0].priority, -100)
+        self.assertEqual(
+            self.crawler.stats.get_value("journalist_profile/requested"), 1
+        )
+
+    def test_enrich_authors_from_profile(self):
+        request: Request = self.process([self.make_news("0010963679")])[1]
+        author: Author = self.fetch_profile(request)
+        self.assertEqual(author.description, "KBS 기자입니다.")
+        self.assertEqual(author.image_url, "https://imgnews.pstatic.net/a.jpg")
+        self.assertEqual(self.process([author]), [author])
+        output: List = self.process([self.make_news("0010963680")])
+        # 캐시된 기자는 다시 요청하지 않고 기사의 Author 를 바꿉니다.
+        self.assertEqual(len(output), 1)
+        self.assertIs(output[0].authors[0], author)
+        self.assertEqual(
+            self.crawler.stats.get_value("journalist_profile/cache_hit"), 1
+        )
+
+    def test_cache_ttl(self):
+        cache: JournalistProfileCache = JournalistProfileCache(self.path, ttl=60)
+        author: Author = Author(
+            id="71060", name="기자", oid="056", url="", description="소개"
+        )
+        cache.add(author)
+        cache.close()
+        cache = JournalistProfileCache(self.path, ttl=60)
+        self.assertEqual(cache.get("056", "71060"), author)
+        self.assertIsNone(cache.get("056", "00000"))
+        cache.close()
+        with mock.patch("time.time", return_value=time.time() + 120):
+            cache = JournalistProfileCache(self.path, ttl=60)
+            self.assertIsNone(cache.get("056", "71060"))
+            cache.close()
+
+
+class TestStreamingStopMiddleware(unittest.TestCase):
+    def setUp(self) -> None:
+        self.crawler = get_crawler(
+            NewsSpider,
+            {"STREAMING_STOP_ENABLED": True, "STREAMING_STOP_MAX_BYTES": 100},
+        )
+        self.middleware: StreamingStopMiddleware = StreamingStopMiddleware.from_crawler(
+            self.crawler
+        )
+
+    def start(self, content_encoding: bytes = b"") -> Request:
+        request: Request = Request(
+            "https://n.news.naver.com/mnews/article/056/0010963679",
+            meta={"oaid": ("056", "0010963679")},
+        )
+        self.middleware.process_request(request, None)
+        self.assertEqual(request.headers[b"Accept-Encoding"], b"gzip")
+        headers: Headers = Headers({"Content-Encoding": content_encoding})
+        self.middleware.headers_received(headers, 1000, request, None)
+        return request
+
+    def test_stop_after_dic_area(self):
+        request: Request = self.start()
+        self.middleware.bytes_received(
+            b"<script>var article = {}; var office = {};</script>", request, None
+        )
+        with self.assertRaises(StopDownload) as cm:
+            self.middleware.bytes_received(
+                b'<div id="dic_area">a</div><div>', request, None
+            )
+        self.assertFalse(cm.exception.fail)
+        self.assertEqual(self.crawler.stats.get_value("streaming_stop/stopped"), 1)
+        self.assertEqual(
+            self.crawler.stats.get_value("streaming_stop/bytes_skipped"), 1000 - 82
+        )
+
+    def test_byte_cap(self):
+        request: Request = self.start(b"br")
+        self.middleware.bytes_received(b"a" * 60, request, None)
+        with self.assertRaises(StopDownload):
+            self.middleware.bytes_received(b"a" * 60, request, None)
+        self.assertEqual(self.crawler.stats.get_value("streaming_stop/capped"), 1)
+
+    def test_ignore_non_article_request(self):
+        request: Request = Request("https://news.naver.com/main/list.naver")
+        self.middleware.process_request(request, None)
+        self.assertNotIn(b"Accept-Encoding", request.headers)
+        self.middleware.bytes_received(b"a" * 200, request, None)
+
+
+class TestAdaptiveThrottleMiddleware(unittest.TestCase):
+    def setUp(self) -> None:
+        self.crawler = get_crawler(
+            NewsSpider,
+            {
+                "ADAPTIVE_THROTTLE_ENABLED": True,
+                "DOWNLOAD_DELAY": 1,
+                "CONCURRENT_REQUESTS": 10,
+                "RETRY_HTTP_CODES": [500, 502, 503, 504, 522, 524, 408],
+            },
+        )
+        self.slot: Slot = Slot(10, 1)
+        self.crawler.engine = SimpleNamespace(
+            downloader=SimpleNamespace(slots={"n.news.naver.com": self.slot})
+        )
+        self.spider: NewsSpider = NewsSpider.from_crawler(self.crawler)
+        self.middleware: AdaptiveThrottleMiddleware = (
+            AdaptiveThrottleMiddleware.from_crawler(self.crawler)
+        )
+
+    def make_request(self, latency: float = 0.1) -> Request:
+        return Request(
+            "https://n.news.naver.com/mnews/article/056/0010963679",
+            meta={"download_slot": "n.news.naver.com", "download_latency": latency},
+        )
+
+    def fetch(self, status: int, latency: float = 0.1, headers=None):
+        request: Request = self.make_request(latency)
+        response: Response = Response(
+            request.url, status=status, headers=headers, request=request
+        )
+        return self.middleware.process_response(request, response, self.spider)
+
+    def test_increase_and_backoff(self):
+        for _ in range(20):
+            self.fetch(200)
+        self.assertGreater(self.slot.concurrency, 2)
+        self.assertLess(self.slot.delay, 1)
+        concurrency: int = self.slot.concurrency
+
+        self.fetch(429, headers={"Retry-After": "30"})
+        self.assertEqual(self.slot.concurrency, concurrency // 2)
+        self.assertGreaterEqual(self.slot.delay, 30)
+        self.assertEqual(
+            self.crawler.stats.get_value(
+                "adaptive_throttle/n.news.naver.com/concurrency"
+            ),
+            self.slot.concurrency,
+        )
+
+    def test_clamp_to_total_concurrency(self):
+        # CONCURRENT_REQUESTS(10) 를 3 개 host 가 나누어 사용합니다.
+        self.assertEqual(self.middleware.max_concurrency, 3)
+        for _ in range(50):
+            self.fetch(200)
+        self.assertEqual(self.slot.concurrency, 3)
+
+        crawler = get_crawler(
+            NewsSpider,
+            {"ADAPTIVE_THROTTLE_ENABLED": True, "CONCURRENT_REQUESTS": 96},
+        )
+        self.assertEqual(
+            AdaptiveThrottleMiddleware.from_crawler(crawler).max_concurrency, 32
+        )
+
+    def test_retry_after_backoff(self):
+        # 403 / 429 는 RetryMiddleware 대신 늘어난 지연 뒤에 다시 요청합니다.
+        result = self.fetch(429)
+        self.assertIsInstance(result, Request)
+        self.assertEqual(result.meta["retry_times"], 1)
+        self.assertGreaterEqual(self.slot.delay, 1)
+        response: Response = Response(result.url, status=429, request=result)
+        result = self.middleware.process_response(result, response, self.spider)
+        self.assertIsInstance(result, Request)
+        response = Response(result.url, status=429, request=result)
+        self.assertIs(
+            self.middleware.process_response(result, response, self.spider), response
+        )
+        self.assertEqual(
+            self.crawler.stats.get_value("adaptive_throttle/retry/count"), 2
+        )
+        # RETRY_HTTP_CODES 의 상태는 RetryMiddleware 에 맡깁니다.
+        self.assertIsInstance(self.fetch(503), Response)
+
+    def test_backoff_on_connection_errors_only(self):
+        self.middleware.process_exception(
+            self.make_request(), IgnoreRequest(), self.spider
+        )
+        self.assertEqual(self.middleware.states["n.news.naver.com"].concurrency, 2)
+        self.middleware.process_exception(
+            self.make_request(), TimeoutError(), self.spider
+        )
+        self.assertEqual(self.middleware.states["n.news.naver.com"].concurrency, 1)
+
+    def test_slow_response_does_not_increase(self):
+        self.fetch(200, latency=10)
+        self.assertEqual(self.slot.concurrency, 2)
+
+    def test_ignore_other_hosts(self):
+        request: Request = Request(
+            "https://example.com", meta={"download_slot": "example.com"}
+        )
+        response: Response = Response(request.url, status=429, request=request)
+        self.assertIs(
+            self.middleware.process_response(request, response, None), response
+        )
+        self.assertEqual(self.middleware.states, {})
+
+    def test_parse_retry_after(self):
+        self.assertEqual(parse_retry_after(b"120"), 120)
+        self.assertEqual(parse_retry_after(b"Wed, 21 Oct 2015 07:28:00 GMT"), 0)
+        self.assertIsNone(parse_retry_after(b"soon"))
+        self.assertIsNone(parse_retry_after(None))
@@ -0,0 +1,99 @@
+import os
+import random
+import tempfile
+import unittest
+from typing import List
+
+from scrapy.utils.test import get_crawler
+
+from src.items import News
+from src.neardup import (
+    NearDuplicateIndex,
+    NearDuplicatePipeline,
+    get_minhash,
+    get_similarity,
+)
+from src.pipelines import news_to_row
+from src.spiders import NewsSpider
+from tests import make_news
+
+WORDS: List[str] = [f"단어{i}" for i in range(2000)]
+
+
+def make_text(seed: int, length: int = 300) -> str:
+    rng: random.Random = random.Random(seed)
+    return " ".join(rng.choice(WORDS) for _ in range(length))
+
+
+def make_item(aid: str, content: str) -> News:
+    item: News = make_news("001", aid, "2021-01-01 00:00:00")
+    item.content = content
+    return item
+
+
+class TestMinHash(unittest.TestCase):
+    def test_similarity(self):
+        text: str = make_text(1)
+        # 앞뒤에 언론사 문구가 붙고 줄바꿈이 다른 전재 기사
+        syndicated: str = (
+            "[서울=뉴시스] " + text.replace(" ", "\n", 10) + " 무단 전재 금지"
+        )
+        self.assertEqual(get_minhash(text), get_minhash(" ".join(text.split())))
+        self.assertGreater(
+            get_similarity(get_minhash(text), get_minhash(syndicated)), 0.8
+        )
+        self.assertLess(
+            get_similarity(get_minhash(text), get_minhash(make_text(2))), 0.2
+        )
+        self.assertEqual(get_minhash(""), ())
+
+
+class TestNearDuplicateIndex(unittest.TestCase):
+    def test_cluster_and_evict(self):
+        index: NearDuplicateIndex = NearDuplicateIndex(max_size=2)
+        text: str = make_text(1)
+        self.assertEqual(index.get_or_add("a", get_minhash(text)), ("a", False))
+        self.assertEqual(index.get_or_add("b", get_minhash(text + " 끝")), ("a", True))
+        self.assertEqual(index.get_or_add("c", get_minhash(make_text(2))), ("c", False))
+        self.assertEqual(index.get_or_add("d", get_minhash(make_text(3))), ("d", False))
+        # 가장 오래된 클러스터 a 는 제거되었습니다.
+        self.assertEqual(len(index), 2)
+        self.assertEqual(index.query(get_minhash(text)), None)
+        self.assertNotIn("a", index.buckets.values())
+
+    def test_persistence(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path: str = os.path.join(tmp_dir, "clusters.sqlite3")
+            index: NearDuplicateIndex = NearDuplicateIndex(path=path)
+            index.get_or_add("a", get_minhash(make_text(1)))
+            index.close()
+            index = NearDuplicateIndex(path=path)
+            self.assertEqual(index.query(get_minhash(make_text(1))), "a")
+            index.close()
+
+
+class TestNearDuplicatePipeline(unittest.TestCase):
+    def test_process_item(self):
+        crawler = get_crawler(NewsSpider, {"NEAR_DUPLICATE_ENABLED": True})
+        pipeline: NearDuplicatePipeline = NearDuplicatePipeline.from_crawler(crawler)
+        spider: NewsSpider = NewsSpider()
+        text: str = make_text(1)
+        items: List[News] = [
+            make_item("0000000001", text),
+            make_item("0000000002", "(서울=연합뉴스) " + text),
+            make_item("0000000003", make_text(2)),
+            make_item("0000000004", ""),
+        ]
+        for item in items:
+            pipeline.process_item(item, spider)
+        pipeline.close_spider(spider)
+        self.assertEqual(
+            [item.cluster_id for item in items],
+            ["001_0000000001", "001_0000000001", "001_0000000003", None],
+        )
+        self.assertEqual(crawler.stats.get_value("near_duplicate/duplicates"), 1)
+
+        # 대표 기사가 아닌 기사의 본문은 저장하지 않습니다.
+        self.assertEqual(news_to_row(items[0], body_once=True)["content"], text)
+        self.assertIsNone(news_to_row(items[1], body_once=True)["content"])
+        self.assertIsNotNone(news_to_row(items[1])["content"])
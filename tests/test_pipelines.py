@@ -0,0 +1,121 @@
+import json
+import os
+import sqlite3
+import tempfile
+import unittest
+
+from src.items import Author, Headline
+from src.pipelines import BufferedSinkPipeline, JsonLinesSink, SqliteSink
+from tests import make_news
+
+
+class TestBufferedSinkPipeline(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmp_dir: tempfile.TemporaryDirectory = tempfile.TemporaryDirectory()
+        self.author: Author = Author(
+            id="71060",
+            name="name",
+            oid="056",
+            url="https://media.naver.com/journalist/056/71060",
+        )
+
+    def tearDown(self) -> None:
+        self.tmp_dir.cleanup()
+
+    def run_pipeline(self, sink_cls, batch_size: int) -> BufferedSinkPipeline:
+        pipeline: BufferedSinkPipeline = BufferedSinkPipeline(
+            sink_cls, self.tmp_dir.name, batch_size=batch_size, flush_interval=0
+        )
+        pipeline.open_spider(None)
+        for aid in ("0010963679", "0010963680", "0010963681"):
+            pipeline.process_item(make_news(aid=aid, authors=[self.author]), None)
+        return pipeline
+
+    def test_jsonl_sink(self):
+        pipeline: BufferedSinkPipeline = self.run_pipeline(JsonLinesSink, 2)
+        # 배치 크기에 도달한 2개만 기록되어 있어야 합니다.
+        with open(os.path.join(self.tmp_dir.name, "news.jsonl")) as f:
+            self.assertEqual(len(f.readlines()), 2)
+        pipeline.close_spider(None)
+        with open(os.path.join(self.tmp_dir.name, "news.jsonl")) as f:
+            rows = [json.loads(line) for line in f]
+        self.assertEqual(len(rows), 3)
+        self.assertEqual(rows[0]["author_ids"], ["71060"])
+        self.assertNotIn("authors", rows[0])
+        with open(os.path.join(self.tmp_dir.name, "authors.jsonl")) as f:
+            self.assertEqual(len(f.readlines()), 1)
+
+    def test_sqlite_sink(self):
+        self.run_pipeline(SqliteSink, 10).close_spider(None)
+        conn = sqlite3.connect(os.path.join(self.tmp_dir.name, "news.sqlite3"))
+        self.assertEqual(conn.execute("SELECT COUNT(*) FROM news").fetchone()[0], 3)
+        self.assertEqual(conn.execute("SELECT COUNT(*) FROM author").fetchone()[0], 1)
+        self.assertEqual(
+            conn.execute("SELECT COUNT(*) FROM news_author").fetchone()[0], 3
+        )
+        conn.close()
+
+    def test_pass_through_other_items(self):
+        pipeline: BufferedSinkPipeline = self.run_pipeline(JsonLinesSink, 10)
+        self.assertEqual(pipeline.process_item({"a": 1}, None), {"a": 1})
+        pipeline.close_spider(None)
+
+    def test_headline_items(self):
+        headline: Headline = Headline(
+            oid="056",
+            aid="0010963682",
+            title="title",
+            press="press",
+            url="https://n.news.naver.com/mnews/article/056/0010963682",
+            date="20210101",
+            list_time="2021-01-01 21:25:00",
+            sid1="100",
+        )
+        for sink_cls in (JsonLinesSink, SqliteSink):
+            pipeline: BufferedSinkPipeline = self.run_pipeline(sink_cls, 10)
+            self.assertIs(pipeline.process_item(headline, None), headline)
+            pipeline.close_spider(None)
+        with open(os.path.join(self.tmp_dir.name, "headlines.jsonl")) as f:
+            self.assertEqual(json.loads(f.readline())["aid"], "0010963682")
+        conn = sqlite3.connect(os.path.join(self.tmp_dir.name, "news.sqlite3"))
+        self.assertEqual(
+            conn.execute("SELECT aid, sid1 FROM headline").fetchall(),
+            [("0010963682", "100")],
+        )
+        conn.close()
+
+    def test_author_item_replaces_author(self):
+        pipeline: BufferedSinkPipeline = self.run_pipeline(SqliteSink, 10)
+        profile: Author = Author(
+            id="71060",
+            name="name",
+            oid="056",
+            url=self.author.url,
+            description="description",
+        )
+        self.assertIs(pipeline.process_item(profile, None), profile)
+        pipeline.close_spider(None)
+        conn = sqlite3.connect(os.path.join(self.tmp_dir.name, "news.sqlite3"))
+        self.assertEqual(
+            conn.execute("SELECT description FROM author").fetchall(),
+            [("description",)],
+        )
+        conn.close()
+
+    def test_sqlite_sink_adds_new_columns(self):
+        conn = sqlite3.connect(os.path.join(self.tmp_dir.name, "news.sqlite3"))
+        conn.execute(
+            "CREATE TABLE news (oid, aid, title, content, sid1, sid2, sid3, url, "
+            "upload_time, edited_time, press, PRIMARY KEY (oid, aid))"
+        )
+        conn.commit()
+        conn.close()
+        self.run_pipeline(SqliteSink, 10).close_spider(None)
+        conn = sqlite3.connect(os.path.join(self.tmp_dir.name, "news.sqlite3"))
+        self.assertEqual(
+            conn.execute(
+                "SELECT COUNT(*) FROM news WHERE cluster_id IS NULL"
+            ).fetchone()[0],
+            3,
+        )
+        conn.close()
@@ -0,0 +1,111 @@
+import os
+import sqlite3
+import tempfile
+import unittest
+from datetime import datetime, timedelta
+from typing import List
+from unittest import mock
+
+from scrapy import Request
+from scrapy.http import HtmlResponse, Response
+from scrapy.utils.test import get_crawler
+
+from src.items import News
+from src.refresh import RefreshSchedule
+from src.seen import SeenArticleIndex
+from src.spiders import RefreshSpider
+
+FIXTURE_DIR: str = os.path.join(os.path.dirname(__file__), "fixtures")
+ARTICLE_URL: str = "https://n.news.naver.com/mnews/article/056/0010963679"
+
+
+class TestRefreshSchedule(unittest.TestCase):
+    def test_is_due(self):
+        schedule: RefreshSchedule = RefreshSchedule()
+        now: datetime = datetime(2021, 1, 2, 12, 0, 0)
+        uploaded: datetime = now - timedelta(minutes=30)
+        self.assertTrue(schedule.is_due(uploaded, None, now))
+        self.assertFalse(schedule.is_due(uploaded, now - timedelta(minutes=5), now))
+        self.assertTrue(schedule.is_due(uploaded, now - timedelta(minutes=10), now))
+
+        uploaded = now - timedelta(hours=30)
+        self.assertFalse(schedule.is_due(uploaded, now - timedelta(hours=2), now))
+        self.assertTrue(schedule.is_due(uploaded, now - timedelta(hours=13), now))
+        self.assertFalse(schedule.is_due(now - timedelta(days=4), None, now))
+
+    def test_priority(self):
+        schedule: RefreshSchedule = RefreshSchedule()
+        now: datetime = datetime(2021, 1, 2, 12, 0, 0)
+        self.assertGreater(
+            schedule.get_priority(now - timedelta(minutes=1), now),
+            schedule.get_priority(now - timedelta(hours=10), now),
+        )
+
+
+class TestRefreshSpider(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmp_dir: tempfile.TemporaryDirectory = tempfile.TemporaryDirectory()
+        self.index_path: str = os.path.join(self.tmp_dir.name, "seen.sqlite3")
+        with open(os.path.join(FIXTURE_DIR, "article_056_0010963679.html"), "rb") as f:
+            self.body: bytes = f.read()
+        crawler = get_crawler(RefreshSpider, {"SEEN_INDEX_PATH": self.index_path})
+        self.spider: RefreshSpider = RefreshSpider.from_crawler(crawler)
+        self.item: News = self.spider.extract_article_item(
+            HtmlResponse(url=ARTICLE_URL, body=self.body, encoding="utf-8")
+        )
+
+    def tearDown(self) -> None:
+        self.spider.closed("finished")
+        self.tmp_dir.cleanup()
+
+    def get_requests(self, now: datetime) -> List[Request]:
+        with mock.patch("src.spiders.get_now_dt", return_value=now):
+            return list(self.spider.start_requests())
+
+    def test_refresh(self):
+        index: SeenArticleIndex = SeenArticleIndex(self.index_path)
+        with mock.patch(
+            "src.utils.get_now_dt", return_value=datetime(2021, 1, 1, 21, 30, 0)
+        ):
+            index.add_item(self.item, etag='"abc"')
+        index.close()
+
+        requests: List[Request] = self.get_requests(datetime(2021, 1, 1, 22, 0, 0))
+        self.assertEqual(len(requests), 1)
+        self.assertEqual(requests[0].headers.get("If-None-Match"), b'"abc"')
+        self.assertEqual(self.get_requests(datetime(2021, 1, 10)), [])
+
+        request: Request = requests[0]
+        not_modified: Response = Response(ARTICLE_URL, status=304, request=request)
+        self.assertEqual(list(self.spider.parse_refresh(not_modified)), [])
+        unchanged: HtmlResponse = HtmlResponse(
+            ARTICLE_URL, body=self.body, encoding="utf-8", request=request
+        )
+        self.assertEqual(list(self.spider.parse_refresh(unchanged)), [])
+        changed: HtmlResponse = unchanged.replace(
+            body=self.body.replace("의료진".encode(), "고령층".encode())
+        )
+        items: List[News] = list(self.spider.parse_refresh(changed))
+        self.assertEqual(len(items), 1)
+        self.assertIn("고령층", items[0].content)
+        self.assertEqual(self.spider.crawler.stats.get_value("refresh/changed"), 1)
+        self.assertEqual(self.spider.crawler.stats.get_value("refresh/unchanged"), 1)
+
+    def test_migrate_old_index(self):
+        conn: sqlite3.Connection = sqlite3.connect(self.index_path)
+        conn.execute(
+            "CREATE TABLE seen_article (oid TEXT NOT NULL, aid TEXT NOT NULL, "
+            "upload_time TEXT, edited_time TEXT, scraped_at TEXT NOT NULL, "
+            "PRIMARY KEY (oid, aid)) WITHOUT ROWID"
+        )
+        conn.execute(
+            "INSERT INTO seen_article VALUES ('056', '0010963679', "
+            "'2021-01-01 21:25:01', '2021-01-01 22:19:26', '2021-01-01 23:00:00')"
+        )
+        conn.commit()
+        conn.close()
+        index: SeenArticleIndex = SeenArticleIndex(self.index_path)
+        self.assertIsNone(index.get("056", "0010963679").url)
+        index.add_item(self.item)
+        self.assertEqual(index.get("056", "0010963679").url, ARTICLE_URL)
+        index.close()
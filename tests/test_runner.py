@@ -0,0 +1,140 @@
+import asyncio
+import unittest
+from types import SimpleNamespace
+from typing import List, Type
+from unittest import mock
+
+from scrapy import Request
+from scrapy.exceptions import DontCloseSpider
+from scrapy.settings import Settings
+from scrapy.utils.test import get_crawler
+
+from src.runner import (
+    ArticleRegistry,
+    SharedPoolDownloadHandler,
+    get_combined_settings,
+)
+from src.spiders import NewsSpider, LSDSpider, EntSpider
+
+
+class TestArticleRegistry(unittest.TestCase):
+    def setUp(self) -> None:
+        self.registry: ArticleRegistry = ArticleRegistry()
+        self.news: NewsSpider = self.open_spider(NewsSpider)
+        self.lsd: LSDSpider = self.open_spider(LSDSpider)
+        self.ent: EntSpider = self.open_spider(EntSpider)
+
+    def open_spider(self, spider_cls: Type[NewsSpider]) -> NewsSpider:
+        crawler = get_crawler(spider_cls)
+        crawler.engine = mock.Mock(running=True, _slot=SimpleNamespace(closing=None))
+        self.registry.attach(crawler)
+        spider: NewsSpider = spider_cls.from_crawler(crawler)
+        self.registry.spider_opened(spider)
+        return spider
+
+    def get_crawled(self, spider: NewsSpider) -> List[Request]:
+        return [call[0][0] for call in spider.crawler.engine.crawl.call_args_list]
+
+    def test_dedup_and_route(self):
+        link: str = (
+            "https://news.naver.com/main/read.naver?mode=LS2D&mid=sec&sid1=106"
+            "&oid=056&aid=0010963679"
+        )
+        # 연예 기사는 EntSpider 가 entertain 주소로 요청합니다.
+        self.assertIsNone(self.news.make_article_request(link))
+        (request,) = self.get_crawled(self.ent)
+        self.assertEqual(
+            request.url, "https://n.news.naver.com/entertain/article/056/0010963679"
+        )
+        self.assertEqual(request.meta["oaid"], ("056", "0010963679"))
+        self.assertEqual(request.callback, self.ent.parse_article)
+
+        # 다른 spider 에서 다시 나온 같은 기사는 버립니다.
+        self.assertIsNone(
+            self.lsd.make_article_request(
+                "https://news.naver.com/main/read.naver?oid=056&aid=0010963679", "106"
+            )
+        )
+        self.assertEqual(len(self.get_crawled(self.ent)), 1)
+        self.assertEqual(
+            self.lsd.crawler.stats.get_value("combined/duplicate_articles"), 1
+        )
+
+        # 담당 spider 가 자신이면 직접 요청합니다.
+        request = self.lsd.make_article_request(
+            self.lsd.convert_url(
+                "https://news.naver.com/main/read.naver?oid=056&aid=0000000002"
+            ),
+            "100",
+        )
+        self.assertEqual(
+            request.url, "https://n.news.naver.com/mnews/article/056/0000000002"
+        )
+
+    def test_keep_open_until_all_idle(self):
+        with self.assertRaises(DontCloseSpider):
+            self.registry.spider_idle(self.news)
+        with self.assertRaises(DontCloseSpider):
+            self.registry.spider_idle(self.lsd)
+        # 기사를 넘겨받은 spider 는 다시 수집 중으로 봅니다.
+        self.news.make_article_request(
+            "https://news.naver.com/main/read.naver?sid1=100&oid=056&aid=0000000001"
+        )
+        with self.assertRaises(DontCloseSpider):
+            self.registry.spider_idle(self.ent)
+        self.registry.spider_idle(self.lsd)
+
+    def test_keep_open_while_spider_has_pending_work(self):
+        # 다음 tail 확인을 기다리는 spider 는 idle 이어도 수집 중으로 봅니다.
+        self.lsd.tail_calls = {"100": mock.Mock()}
+        for spider in (self.news, self.ent, self.lsd):
+            with self.assertRaises(DontCloseSpider):
+                self.registry.spider_idle(spider)
+        self.assertEqual(self.registry.active, {self.lsd.crawler})
+
+        self.lsd.tail_calls = {}
+        self.registry.spider_idle(self.lsd)
+
+    def test_closing_owner(self):
+        # 종료 중인 spider 에게는 기사를 넘기지 않고 직접 요청합니다.
+        self.ent.crawler.engine._slot.closing = mock.Mock()
+        request: Request = self.news.make_article_request(
+            "https://news.naver.com/main/read.naver?sid1=106&oid=056&aid=0000000001"
+        )
+        self.assertEqual(request.meta["oaid"], ("056", "0000000001"))
+        self.assertFalse(self.get_crawled(self.ent))
+
+    def test_spider_closed(self):
+        self.registry.spider_closed(self.ent)
+        self.assertNotIn("entertain", self.registry.owners)
+        request: Request = self.news.make_article_request(
+            "https://news.naver.com/main/read.naver?sid1=106&oid=056&aid=0000000001"
+        )
+        self.assertEqual(request.meta["oaid"], ("056", "0000000001"))
+
+
+class TestCombinedSettings(unittest.TestCase):
+    def test_get_combined_settings(self):
+        settings: Settings = get_combined_settings(Settings(), "output/%(name)s.jsonl")
+        self.assertEqual(
+            settings.getdict("DOWNLOAD_HANDLERS")["https"],
+            "src.runner.SharedPoolDownloadHandler",
+        )
+        self.assertEqual(
+            settings.getdict("FEEDS"), {"output/%(name)s.jsonl": {"format": "jsonl"}}
+        )
+
+
+class TestSharedPoolDownloadHandler(unittest.TestCase):
+    def test_close_shared_pool(self):
+        self.assertTrue(asyncio.iscoroutinefunction(SharedPoolDownloadHandler.close))
+        handler: SharedPoolDownloadHandler = SharedPoolDownloadHandler.__new__(
+            SharedPoolDownloadHandler
+        )
+        pool: mock.Mock = mock.Mock()
+        with mock.patch.multiple(SharedPoolDownloadHandler, pool=pool, users=2):
+            # 다른 handler 가 사용 중이면 연결 풀을 닫지 않습니다.
+            asyncio.run(handler.close())
+            self.assertEqual(SharedPoolDownloadHandler.users, 1)
+            self.assertIs(SharedPoolDownloadHandler.pool, pool)
+        pool.closeCachedConnections.assert_not_called()
@@ -0,0 +1,192 @@
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+from concurrent.futures import ProcessPoolExecutor
+from typing import List
+from unittest import mock
+
+from src.search import (
+    SearchIndex,
+    Segment,
+    PostingsBuilder,
+    decode_postings,
+    fcntl,
+    parse_query,
+    tokenize,
+)
+
+ROOT_DIR: str = os.path.dirname(os.path.dirname(__file__))
+
+
+def add_segments(path: str, worker: int, count: int) -> None:
+    # 여러 프로세스가 같은 색인에 동시에 segment 를 추가합니다.
+    with SearchIndex(path, segment_size=1, merge_factor=1000) as index:
+        for aid in range(count):
+            index.add("001", f"{worker}-{aid}", "대통령", "경제")
+
+
+class TestTokenize(unittest.TestCase):
+    def test_tokenize(self):
+        self.assertEqual(
+            tokenize("코로나19 백신, COVID 김"),
+            [("코로", 0), ("로나", 1), ("19", 2), ("백신", 3), ("covid", 4), ("김", 5)],
+        )
+        self.assertEqual(
+            parse_query('경제 "대통령 선거"'), [["경제"], ["대통", "통령", "선거"]]
+        )
+
+    def test_postings_roundtrip(self):
+        builder: PostingsBuilder = PostingsBuilder()
+        builder.add(3, [0, 200, 100000])
+        builder.add(1000, [5])
+        self.assertEqual(
+            decode_postings(bytes(builder.buffer), builder.df),
+            [(3, [0, 200, 100000]), (1000, [5])],
+        )
+
+
+class TestSearchIndex(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmp_dir: tempfile.TemporaryDirectory = tempfile.TemporaryDirectory()
+        self.path: str = os.path.join(self.tmp_dir.name, "search_index")
+
+    def tearDown(self) -> None:
+        self.tmp_dir.cleanup()
+
+    def add_documents(self, index: SearchIndex) -> None:
+        index.add(
+            "056",
+            "0000000001",
+            "대통령 선거 결과",
+            "경제 전망이 밝다",
+            "2021-01-01 09:00:00",
+            "100",
+            "KBS",
+        )
+        index.add(
+            "001",
+            "0000000002",
+            "선거 대통령",
+            "경제 위기",
+            "2021-01-02 09:00:00",
+            "101",
+            "연합뉴스",
+        )
+        index.add(
+            "001",
+            "0000000003",
+            "스포츠",
+            "대통령배 야구 대회",
+            "2021-01-03 09:00:00",
+            "107",
+            "연합뉴스",
+        )
+
+    def test_search(self):
+        with SearchIndex(self.path, segment_size=2) as index:
+            self.add_documents(index)
+        with SearchIndex(self.path) as index:
+            self.assertEqual(len(index.segments), 2)
+            self.assertEqual(
+                index.search("대통령"),
+                [("001", "0000000003"), ("001", "0000000002"), ("056", "0000000001")],
+            )
+            self.assertEqual(index.search('"대통령 선거"'), [("056", "0000000001")])
+            self.assertEqual(
+                index.search("대통령 경제", press="연합뉴스"), [("001", "0000000002")]
+            )
+            self.assertEqual(
+                index.search("대통령", since="20210102", until="20210102"),
+                [("001", "0000000002")],
+            )
+            self.assertEqual(
+                index.search("대통령", sid1="107", limit=1), [("001", "0000000003")]
+            )
+            self.assertEqual(index.search("없는 단어"), [])
+            # 제목과 본문에 걸친 구문은 찾지 않습니다.
+            self.assertEqual(index.search('"결과 경제"'), [])
+
+    def test_single_char_query(self):
+        with SearchIndex(self.path, segment_size=2) as index:
+            self.add_documents(index)
+            index.add("001", "0000000004", "북 미 회담", "북한 관련 소식", "2021-01-04")
+        with SearchIndex(self.path) as index:
+            # 한 글자 검색어는 그 글자로 시작하거나 끝나는 bigram 과 한 글자 단어를 찾습니다.
+            self.assertEqual(index.search("북"), [("001", "0000000004")])
+            self.assertEqual(index.search("한"), [("001", "0000000004")])
+            self.assertEqual(
+                index.search("통"),
+                [("001", "0000000003"), ("001", "0000000002"), ("056", "0000000001")],
+            )
+            self.assertEqual(index.search("통 결과"), [("056", "0000000001")])
+            self.assertEqual(index.search('"북 미"'), [("001", "0000000004")])
+            self.assertEqual(index.search("꽃"), [])
+
+    @unittest.skipIf(fcntl is None, "fcntl is not available")
+    def test_refresh_holds_manifest_lock(self):
+        with SearchIndex(self.path, segment_size=1) as index:
+            self.add_documents(index)
+
+        def open_segment(path: str) -> Segment:
+            # 다른 프로세스가 manifest 를 바꾸지 못하는 동안 segment 를 열어야 합니다.
+            with open(os.path.join(self.path, "segments.lock"), "a") as lock_file:
+                with self.assertRaises(BlockingIOError):
+                    fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            return Segment(path)
+
+        with mock.patch("src.search.Segment", side_effect=open_segment) as segment_cls:
+            with SearchIndex(self.path) as index:
+                self.assertEqual(len(index.search("대통령")), 3)
+        self.assertEqual(segment_cls.call_count, 3)
+
+    def test_merge(self):
+        with SearchIndex(self.path, segment_size=1, merge_factor=2) as index:
+            self.add_documents(index)
+            # 1 개짜리 segment 두 개가 합쳐진 뒤 세 번째 segment 가 남습니다.
+            self.assertEqual(sorted(map(len, index.segments.values())), [1, 2])
+            index.optimize()
+            self.assertEqual(len(index.segments), 1)
+            self.assertEqual(len(index.search("대통령")), 3)
+        self.assertEqual(
+            len([name for name in os.listdir(self.path) if name.startswith("seg-")]),
+            1,
+        )
+
+    def test_concurrent_manifest_updates(self):
+        with ProcessPoolExecutor(max_workers=4) as executor:
+            list(executor.map(add_segments, [self.path] * 4, range(4), [10] * 4))
+        with SearchIndex(self.path) as index:
+            self.assertEqual(len(index.segments), 40)
+            self.assertEqual(len(index.search("대통령")), 40)
+
+    def test_merge_conflict(self):
+        with SearchIndex(self.path, segment_size=1, merge_factor=100) as index:
+            self.add_documents(index)
+            names: List[str] = list(index.segments)
+            # 다른 프로세스가 먼저 합친 segment 는 다시 합치지 않습니다.
+            self.assertTrue(index.update_manifest(["other"], names[:2]))
+            self.assertFalse(index.update_manifest(["stale"], names[:2]))
+            self.assertEqual(index.read_manifest(), [names[2], "other"])
+
+    def test_cli(self):
+        with SearchIndex(self.path) as index:
+            self.add_documents(index)
+        output: str = subprocess.run(
+            [
+                sys.executable,
+                "-m",
+                "src.search",
+                "query",
+                self.path,
+                "경제",
+                "--sid1",
+                "100",
+            ],
+            cwd=ROOT_DIR,
+            capture_output=True,
+            check=True,
+            text=True,
+        ).stdout
+        self.assertEqual(output.splitlines(), ["056\t0000000001"])
@@ -1,12 +1,37 @@
+import asyncio
+import os
 import unittest
 from typing import List
+from unittest import mock
 
-from scrapy.http import Response
+from scrapy import Request
+from scrapy.http import Response, HtmlResponse
+from scrapy.utils.test import get_crawler
+from twisted.python.failure import Failure
 
-from src.items import News
-from src.spiders import NewsSpider, EntSpider, SportSpider
+from src.items import News, Headline
+from src.spiders import NewsSpider, LSDSpider, EntSpider, SportSpider
 from src.utils import get_scrapy_res_from_url
 
+FIXTURE_DIR: str = os.path.join(os.path.dirname(__file__), "fixtures")
+# 목록 / 기사 테스트는 기본적으로 직접 작성한 합성 페이지(synthetic_cassette/README.md)를 사용합니다.
+# NAVER_NEWS_LIVE=1 이면 실제 네이버 뉴스에, NAVER_NEWS_CASSETTE 를 지정하면 저장한 응답에 요청합니다.
+SYNTHETIC_CASSETTE_DIR: str = os.path.join(FIXTURE_DIR, "synthetic_cassette")
+
+
+def get_fixture_res(name: str, url: str) -> HtmlResponse:
+    with open(os.path.join(FIXTURE_DIR, name), "rb") as f:
+        return HtmlResponse(url=url, body=f.read(), encoding="utf-8")
+
+
+def get_page_res(url: str) -> Response:
+    if os.environ.get("NAVER_NEWS_LIVE") == "1" or os.environ.get(
+        "NAVER_NEWS_CASSETTE"
+    ):
+        return get_scrapy_res_from_url(url)
+    with mock.patch.dict(os.environ, {"NAVER_NEWS_CASSETTE": SYNTHETIC_CASSETTE_DIR}):
+        return get_scrapy_res_from_url(url)
+
 
 class TestSpider(unittest.TestCase):
     def setUp(self) -> None:
@@ -14,8 +39,181 @@ class TestSpider(unittest.TestCase):
         self.ent_spider: EntSpider = EntSpider()
         self.sport_spider: SportSpider = SportSpider()
 
+    def test_multi_date_and_sid_args(self):
+        news_spider: NewsSpider = NewsSpider(start_date="20210101", end_date="20210103")
+        self.assertEqual(news_spider.dates, ["20210101", "20210102", "20210103"])
+        self.assertEqual(news_spider.sids, [None])
+
+        lsd_spider: LSDSpider = LSDSpider(date="20210101", sid="100,101")
+        self.assertEqual(lsd_spider.dates, ["20210101"])
+        self.assertEqual(lsd_spider.sids, ["100", "101"])
+        self.assertIn("sid1=100", lsd_spider.fmt_list_url("20210101"))
+        self.assertIn("sid1=101", lsd_spider.fmt_list_url("20210101", sid="101"))
+
+    def test_extract_last_page(self):
+        list_res: HtmlResponse = HtmlResponse(
+            url=self.news_spider.fmt_list_url(date="20210101", page=10000),
+            body=(
+                '<div class="paging"><a href="?page=1">1</a>'
+                '<a href="?page=2">2</a><strong>3</strong></div>'
+            ).encode(),
+        )
+        self.assertEqual(self.news_spider.extract_last_page(list_res), 3)
+        list_res = HtmlResponse(
+            url=self.news_spider.fmt_list_url(date="20210101"),
+            body=b'<div class="paging"><a href="?page=2">2</a></div>',
+        )
+        self.assertEqual(self.news_spider.extract_last_page(list_res), 2)
+        list_res = HtmlResponse(
+            url=self.news_spider.fmt_list_url(date="20210101"), body=b"<div></div>"
+        )
+        self.assertEqual(self.news_spider.extract_last_page(list_res), 1)
+
+    def test_headline_only(self):
+        spider: LSDSpider = LSDSpider.from_crawler(
+            get_crawler(LSDSpider), date="20210101", headline_only="true"
+        )
+        (probe,) = list(spider.start_requests())
+        body: str = (
+            '<div class="list_body"><ul class="type02">'
+            '<li><a href="https://news.naver.com/main/read.naver?oid=056&amp;'
+            'aid=0000000001"><strong>제목</strong> 1</a>'
+            '<span class="writing">KBS</span>'
+            '<span class="date">2021.01.01. 오후 11:59</span></li>'
+            '<li><a href="https://news.naver.com/main/read.naver?oid=001&amp;'
+            'aid=0000000002">제목 2</a><span class="writing">연합뉴스</span>'
+            '<span class="date">1분전</span></li>'
+            "</ul></div>"
+        )
+        response: HtmlResponse = HtmlResponse(
+            url=probe.url, body=body, encoding="utf-8", request=probe
+        )
+        output: List = list(spider.parse_list_probe(response))
+        headlines: List[Headline] = [
+            item for item in output if isinstance(item, Headline)
+        ]
+        self.assertEqual(
+            headlines[0],
+            Headline(
+                oid="056",
+                aid="0000000001",
+                title="제목 1",
+                press="KBS",
+                url="https://n.news.naver.com/mnews/article/056/0000000001",
+                date="20210101",
+                list_time="2021-01-01 23:59:00",
+                sid1="100",
+            ),
+        )
+        self.assertEqual(headlines[1].list_time, "1분전")
+        # 표본 비율이 0 이면 기사는 요청하지 않습니다.
+        self.assertFalse(
+            [
+                item
+                for item in output
+                if isinstance(item, Request) and "oaid" in item.meta
+            ]
+        )
+
+        spider.headline_predicate = lambda headline: headline.press == "KBS"
+        output = list(spider.parse_list_probe(response))
+        self.assertEqual(
+            [item.meta["oaid"] for item in output if isinstance(item, Request)],
+            [("056", "0000000001")],
+        )
+
+    def test_unit_waits_for_articles(self):
+        spider: LSDSpider = LSDSpider.from_crawler(
+            get_crawler(LSDSpider, {"FRONTIER_MAX_ACTIVE_UNITS": 1}),
+            start_date="20210101",
+            end_date="20210102",
+        )
+        (probe,) = list(spider.start_requests())
+        list_res: HtmlResponse = HtmlResponse(
+            url=probe.url,
+            body=(
+                '<div class="list_body"><ul class="type02"><li><a href="'
+                'https://news.naver.com/main/read.naver?oid=056&amp;aid=0010963679">'
+                "제목</a></li></ul></div>"
+            ).encode(),
+            request=probe,
+        )
+        (article_req,) = list(spider.parse_list_probe(list_res))
+        # 목록은 끝났지만 기사가 처리되기 전에는 다음 날짜를 시작하지 않습니다.
+        self.assertEqual(article_req.meta["list_unit"], ("20210101", "100"))
+        self.assertEqual(list(spider.frontier.active), [("20210101", "100")])
+
+        with open(os.path.join(FIXTURE_DIR, "article_056_0010963679.html"), "rb") as f:
+            article_res: HtmlResponse = HtmlResponse(
+                url=article_req.url, body=f.read(), request=article_req
+            )
+        news_item, next_probe = list(spider.parse_article(article_res))
+        self.assertEqual(news_item.aid, "0010963679")
+        self.assertEqual(next_probe.meta["unit"], ("20210102", "100"))
+
+        # 실패한 기사 요청도 처리된 것으로 봅니다.
+        (article_req,) = list(
+            spider.parse_list_probe(
+                list_res.replace(url=next_probe.url, request=next_probe)
+            )
+        )
+        failure: Failure = Failure(ValueError())
+        failure.request = article_req
+        self.assertEqual(list(spider.errback_article(failure)), [])
+        self.assertTrue(spider.frontier.done)
+
+    def test_fast_extractor(self):
+        article_res: HtmlResponse = get_fixture_res(
+            "article_056_0010963679.html",
+            "https://n.news.naver.com/mnews/article/056/0010963679?sid=100",
+        )
+        fast_spider: NewsSpider = NewsSpider(extractor="fast")
+        news_item: News = fast_spider.extract_article_item_fast(article_res)
+        self.assertEqual(news_item, self.news_spider.extract_article_item(article_res))
+        self.assertEqual(news_item.title, '"백신 접종" 정부 발표 & 향후 일정')
+        self.assertEqual(news_item.press, "KBS")
+        self.assertEqual(
+            news_item.content.split("\n"),
+            [
+                "정부가 1일 백신 접종 계획을 발표했습니다.",
+                "접종은 2월부터 시작되며 <우선 대상>은 의료진입니다.",
+                "KBS 뉴스 김기자입니다.",
+            ],
+        )
+        self.assertEqual(
+            [author.id for author in news_item.authors], ["71060", "71477"]
+        )
+
+    def test_fast_extractor_fallback(self):
+        article_res: HtmlResponse = get_fixture_res(
+            "article_056_0010963679.html",
+            "https://n.news.naver.com/mnews/article/056/0010963679",
+        )
+        # 본문 컨테이너가 닫히지 않으면 fast 추출은 실패하고 selector 로 대체되어야 합니다.
+        broken_res: HtmlResponse = article_res.replace(
+            body=article_res.body.split(b"KBS \xeb\x89\xb4\xec\x8a\xa4")[0]
+        )
+        fast_spider: NewsSpider = NewsSpider(extractor="fast")
+        self.assertIsNone(fast_spider.extract_article_item_fast(broken_res))
+        self.assertEqual(fast_spider.extract_article_item(broken_res).aid, "0010963679")
+
+    def test_parse_article_offload(self):
+        article_res: HtmlResponse = get_fixture_res(
+            "article_056_0010963679.html",
+            "https://n.news.naver.com/mnews/article/056/0010963679",
+        )
+        pool_spider: NewsSpider = NewsSpider(parse_workers=1)
+        try:
+            items: List[News] = asyncio.run(
+                pool_spider.parse_article_offload(article_res)
+            )
+        finally:
+            pool_spider.closed("finished")
+        self.assertEqual(items, [self.news_spider.extract_article_item(article_res)])
+        self.assertIsNone(pool_spider.parse_pool)
+
     def test_news_extract_list(self):
-        list_res: Response = get_scrapy_res_from_url(
+        list_res: Response = get_page_res(
             self.news_spider.fmt_list_url(date="20210101")
         )
         self.assertEqual(list_res.status, 200)
@@ -25,7 +223,7 @@ class TestSpider(unittest.TestCase):
         )
 
     def test_news_extract_article1(self):
-        article_res: Response = get_scrapy_res_from_url(
+        article_res: Response = get_page_res(
             "https://n.news.naver.com/mnews/article/015/0004476873"
         )
         news_item: News = self.news_spider.extract_article_item(article_res)
@@ -45,7 +243,7 @@ class TestSpider(unittest.TestCase):
         self.assertEqual(news_item.authors[0].id, "74440")
 
     def test_news_extract_article2(self):
-        article_res: Response = get_scrapy_res_from_url(
+        article_res: Response = get_page_res(
             "https://n.news.naver.com/mnews/article/015/0004476873"
         )
         news_item: News = self.news_spider.extract_article_item(article_res)
@@ -65,7 +263,7 @@ class TestSpider(unittest.TestCase):
         self.assertEqual(news_item.authors[0].id, "74440")
 
     def test_news_extract_multi_authors(self):
-        article_res: Response = get_scrapy_res_from_url(
+        article_res: Response = get_page_res(
             "https://n.news.naver.com/mnews/article/056/0010963679"
         )
         news_item: News = self.news_spider.extract_article_item(article_res)
@@ -87,7 +285,7 @@ class TestSpider(unittest.TestCase):
         self.assertEqual(news_item.authors[1].id, "71477")
 
     def test_ent_news_extract_list(self):
-        list_res: Response = get_scrapy_res_from_url(
+        list_res: Response = get_page_res(
             self.ent_spider.fmt_list_url(date="20210101", page=1)
         )
         self.assertEqual(list_res.status, 200)
@@ -108,12 +306,12 @@ class TestSpider(unittest.TestCase):
         )
 
     def test_ent_news_extract_article(self):
-        list_res: Response = get_scrapy_res_from_url(
+        list_res: Response = get_page_res(
             self.ent_spider.fmt_list_url(date="20210101", page=1)
         )
         list_links: List[str] = self.ent_spider.extract_article_links(list_res)
         news_item: News = self.ent_spider.extract_article_item(
-            get_scrapy_res_from_url(list_links[0])
+            get_page_res(list_links[0])
         )
         self.assertEqual(list_res.status, 200)
         self.assertEqual(news_item.oid, "108")
@@ -131,7 +329,7 @@ class TestSpider(unittest.TestCase):
         self.assertEqual(news_item.authors[0].id, "44044")
 
     def test_sport_news_extract_list(self):
-        list_res: Response = get_scrapy_res_from_url(
+        list_res: Response = get_page_res(
             self.sport_spider.fmt_list_url(date="20210101")
         )
         list_links: List[str] = self.sport_spider.extract_article_links(list_res)
@@ -146,12 +344,12 @@ class TestSpider(unittest.TestCase):
         )
 
     def test_sport_news_extract_article(self):
-        list_res: Response = get_scrapy_res_from_url(
+        list_res: Response = get_page_res(
             self.sport_spider.fmt_list_url(date="20210101")
         )
         list_links: List[str] = self.sport_spider.extract_article_links(list_res)
         news_item: News = self.sport_spider.extract_article_item(
-            get_scrapy_res_from_url(list_links[0])
+            get_page_res(list_links[0])
         )
         self.assertEqual(list_res.status, 200)
         self.assertEqual(news_item.oid, "139")
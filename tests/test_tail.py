@@ -0,0 +1,93 @@
+import unittest
+from typing import List
+from unittest import mock
+
+from scrapy import Request
+from scrapy.exceptions import DontCloseSpider
+from scrapy.http import HtmlResponse
+from scrapy.utils.test import get_crawler
+
+from src.spiders import LSDSpider
+from src.tail import TailState
+
+
+def make_list_body(*aids: str) -> str:
+    return (
+        '<div class="list_body"><ul class="type02">'
+        + "".join(
+            f'<li><a href="https://news.naver.com/main/read.naver?oid=056&amp;'
+            f'aid={aid}">{aid}</a></li>'
+            for aid in aids
+        )
+        + "</ul></div>"
+    )
+
+
+class TestTailState(unittest.TestCase):
+    def test_find_new(self):
+        state: TailState = TailState("100")
+        state.add([("056", "3"), ("056", "2")])
+        self.assertEqual(
+            state.find_new([("056", "5"), ("056", "4"), ("056", "3"), ("056", "1")]),
+            ([("056", "5"), ("056", "4")], True),
+        )
+        self.assertEqual(state.find_new([("056", "6"), None]), ([("056", "6")], False))
+
+    def test_adaptive_interval(self):
+        state: TailState = TailState("100", min_interval=10, max_interval=40)
+        state.add([("056", "1")])
+        self.assertEqual(state.finish_poll(), 10)
+        self.assertEqual(state.finish_poll(), 20)
+        self.assertEqual(state.finish_poll(), 40)
+        self.assertEqual(state.finish_poll(), 40)
+        state.add([("056", "2")])
+        self.assertEqual(state.finish_poll(), 20)
+        self.assertEqual(state.finish_poll(overflowed=True), 10)
+
+    def test_max_seen(self):
+        state: TailState = TailState("100", max_seen=2)
+        state.add([("056", "1"), ("056", "2"), ("056", "3")])
+        self.assertNotIn(("056", "1"), state)
+        self.assertIn(("056", "3"), state)
+
+
+class TestTailSpider(unittest.TestCase):
+    def setUp(self) -> None:
+        self.crawler = get_crawler(LSDSpider, {"TAIL_ENABLED": True})
+        self.spider: LSDSpider = LSDSpider.from_crawler(self.crawler, sid="100")
+        self.call_later = mock.patch("twisted.internet.reactor.callLater").start()
+        self.addCleanup(mock.patch.stopall)
+
+    def fetch(self, request: Request, *aids: str) -> List[Request]:
+        response: HtmlResponse = HtmlResponse(
+            url=request.url,
+            body=make_list_body(*aids),
+            encoding="utf-8",
+            request=request,
+        )
+        return list(self.spider.parse_tail(response))
+
+    def test_poll_until_seen_article(self):
+        (request,) = list(self.spider.start_requests())
+        self.assertTrue(request.dont_filter)
+        # 첫 확인은 첫 페이지만 수집합니다.
+        requests: List[Request] = self.fetch(request, "3", "2")
+        self.assertEqual(
+            [r.meta["oaid"] for r in requests], [("056", "3"), ("056", "2")]
+        )
+        self.assertEqual(self.call_later.call_args[0][0], 30)
+        with self.assertRaises(DontCloseSpider):
+            self.spider.spider_idle(self.spider)
+
+        # 첫 페이지가 모두 새 기사이면 다음 페이지로 넘어갑니다.
+        request = self.spider.make_tail_request("100")
+        requests = self.fetch(request, "6", "5")
+        self.assertEqual(requests[-1].meta["page"], 2)
+        requests = self.fetch(requests[-1], "4", "3", "2")
+        self.assertEqual([r.meta["oaid"] for r in requests], [("056", "4")])
+        self.assertEqual(self.call_later.call_args[0][0], 30)
+        self.assertEqual(self.crawler.stats.get_value("tail/new_articles"), 5)
+
+        # 새 기사가 없으면 확인 간격을 늘립니다.
+        self.assertEqual(self.fetch(request, "6", "5"), [])
+        self.assertEqual(self.call_later.call_args[0][0], 60)
@@ -8,6 +8,13 @@ from src.utils import (
     strftime_util,
     strip_and_filter_str_list,
     js_object_to_json,
+    get_date_range,
+    split_str,
+    get_oaid_from_article_link,
+    normalize_dt_str,
+    parse_article_link,
+    format_article_url,
+    ArticleKey,
 )
 
 
@@ -34,6 +41,55 @@ class TestUtils(unittest.TestCase):
             ("014", "0004557309"),
         )
 
+    def test_get_oaid_from_article_link(self):
+        self.assertEqual(
+            get_oaid_from_article_link(
+                "https://news.naver.com/main/read.naver?mode=LSD&mid=sec&sid1=100"
+                "&oid=056&aid=0010963679"
+            ),
+            ("056", "0010963679"),
+        )
+        self.assertEqual(
+            get_oaid_from_article_link(
+                "https://n.news.naver.com/mnews/article/015/0004476873?sid=103"
+            ),
+            ("015", "0004476873"),
+        )
+        self.assertIsNone(
+            get_oaid_from_article_link("https://news.naver.com/main/list.naver")
+        )
+
+    def test_parse_article_link(self):
+        key: ArticleKey = parse_article_link(
+            "https://n.news.naver.com/entertain/article/056/0010963679#comment"
+        )
+        self.assertEqual(key, ArticleKey("056", "0010963679", "entertain"))
+        self.assertEqual(
+            parse_article_link("https://n.news.naver.com/article/056/0010963679"),
+            ArticleKey("056", "0010963679", None),
+        )
+        self.assertEqual(
+            format_article_url(key, "sports"),
+            "https://n.news.naver.com/sports/article/056/0010963679",
+        )
+        self.assertEqual(
+            format_article_url(
+                parse_article_link(
+                    "https://news.naver.com/main/read.naver?oid=056&aid=0010963679"
+                )
+            ),
+            "https://n.news.naver.com/mnews/article/056/0010963679",
+        )
+        self.assertIsNone(
+            parse_article_link(
+                "https://news.naver.com/main/list.naver?mode=LSD&sid1=100&page=1"
+            )
+        )
+
+    def test_normalize_dt_str(self):
+        self.assertEqual(normalize_dt_str("20210101"), "2021-01-01 00:00:00")
+        self.assertEqual(normalize_dt_str("2021-01-01 12:00:00"), "2021-01-01 12:00:00")
+
     def test_strptime_util(self):
         self.assertEqual(
             strptime_util("2021-01-01 00:00:00", "%Y-%m-%d %H:%M:%S"),
@@ -60,6 +116,18 @@ class TestUtils(unittest.TestCase):
             ["abc", "def", "ghi"],
         )
 
+    def test_get_date_range(self):
+        self.assertEqual(
+            get_date_range("20201230", "20210102"),
+            ["20201230", "20201231", "20210101", "20210102"],
+        )
+        self.assertEqual(get_date_range("20210101", "20210101"), ["20210101"])
+        with self.assertRaises(ValueError):
+            get_date_range("20210102", "20210101")
+
+    def test_split_str(self):
+        self.assertEqual(split_str("100, 101,,102"), ["100", "101", "102"])
+
     def test_json_object_to_json(self):
         self.assertEqual(
             js_object_to_json(
@@ -96,3 +164,25 @@ class TestUtils(unittest.TestCase):
                 "title": "",
             },
         )
+
+    def test_json_object_to_json_strings(self):
+        self.assertEqual(
+            js_object_to_json(
+                '{ url: "https://n.news.naver.com/a:b", name: \'it\\\'s "q"\', '
+                "list: [1, 2.5,], empty: null, }"
+            ),
+            {
+                "url": "https://n.news.naver.com/a:b",
+                "name": 'it\'s "q"',
+                "list": [1, 2.5],
+                "empty": None,
+            },
+        )
+
+    def test_json_object_to_json_cache(self):
+        office: str = '{ officeId: "056", name: "KBS" }'
+        self.assertIs(
+            js_object_to_json(office, cache=True),
+            js_object_to_json(office, cache=True),
+        )
+        self.assertIsNot(js_object_to_json(office), js_object_to_json(office))